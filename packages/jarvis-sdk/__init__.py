@@ -17,11 +17,60 @@ Usage:
         task.complete({"result": "success"}, summary="완료")
 
     # 예외 발생 시 자동으로 task.blocked() 호출
+
+    # asyncio 환경
+    from jarvis_sdk import AsyncJarvisTask
+
+    async with AsyncJarvisTask("my_task", worker_id="haedong") as task:
+        await task.start("작업 시작")
+        await task.complete({"result": "success"})
 """
 
-from .task import JarvisTask
-from .client import JarvisClient
-from .config import JarvisConfig
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .task import JarvisTask, TaskResult
+    from .client import JarvisClient, get_client
+    from .config import JarvisConfig
+    from .async_client import AsyncJarvisClient
+    from .async_task import AsyncJarvisTask
+    from .subscriber import JarvisSubscriber
 
 __version__ = "1.0.0"
-__all__ = ["JarvisTask", "JarvisClient", "JarvisConfig"]
+__all__ = [
+    "JarvisTask",
+    "TaskResult",
+    "JarvisClient",
+    "JarvisConfig",
+    "AsyncJarvisTask",
+    "AsyncJarvisClient",
+    "JarvisSubscriber",
+    "get_client",
+]
+
+# 공개 이름 → 정의된 모듈. 처음 접근할 때 import하므로 import jarvis_sdk는
+# 하위 모듈(urllib / asyncio / sqlite3 등)을 불러오지 않습니다 (PEP 562).
+_EXPORTS = {
+    "JarvisTask": ".task",
+    "TaskResult": ".task",
+    "JarvisClient": ".client",
+    "get_client": ".client",
+    "JarvisConfig": ".config",
+    "AsyncJarvisClient": ".async_client",
+    "AsyncJarvisTask": ".async_task",
+    "JarvisSubscriber": ".subscriber",
+}
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # 다음 접근부터는 일반 속성
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
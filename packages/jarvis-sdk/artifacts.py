@@ -0,0 +1,157 @@
+"""
+JARVIS Artifact Store - 큰 결과물을 이벤트 밖에 저장하고 digest로 참조
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    from .config import JarvisConfig
+    from .serialization import dumps
+except ImportError:
+    from config import JarvisConfig
+    from serialization import dumps
+
+
+class ArtifactStore:
+    """
+    content-addressed artifact 저장소 인터페이스
+
+    같은 내용은 같은 digest("sha256:<hex>")로 한 번만 저장됩니다.
+    """
+
+    def put(self, data: bytes, media_type: str = "application/octet-stream") -> Dict[str, Any]:
+        """
+        저장 후 참조 반환 (이미 있으면 쓰지 않음)
+
+        Returns:
+            {"digest": "sha256:..", "size": n, "media_type": "..", "uri": ".."}
+        """
+        raise NotImplementedError
+
+    def get(self, digest: str) -> bytes:
+        """digest로 내용 읽기"""
+        raise NotImplementedError
+
+    def exists(self, digest: str) -> bool:
+        """저장 여부"""
+        raise NotImplementedError
+
+
+class LocalArtifactStore(ArtifactStore):
+    """
+    로컬 디렉토리 artifact 저장소
+
+    Structure:
+        artifacts/
+        └── sha256/ab/abcdef...   # digest 앞 2글자로 디렉토리 분산
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        """내용 digest (hashlib은 첫 저장 시 import)"""
+        import hashlib
+
+        return "sha256:" + hashlib.sha256(data).hexdigest()
+
+    def put(self, data: bytes, media_type: str = "application/octet-stream") -> Dict[str, Any]:
+        digest = self.digest(data)
+        path = self._path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 임시 파일에 쓴 뒤 rename (동시 저장 / 중단 시에도 손상된 artifact 없음)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        return {
+            "digest": digest,
+            "size": len(data),
+            "media_type": media_type,
+            "uri": path.resolve().as_uri(),
+        }
+
+    def get(self, digest: str) -> bytes:
+        return self._path(digest).read_bytes()
+
+    def exists(self, digest: str) -> bool:
+        return self._path(digest).exists()
+
+    def _path(self, digest: str) -> Path:
+        """digest → 파일 경로"""
+        algorithm, _, value = digest.partition(":")
+        if not value:
+            raise ValueError(f"Invalid artifact digest: {digest}")
+        return self.root / algorithm / value[:2] / value
+
+
+def create_artifact_store(config: JarvisConfig) -> ArtifactStore:
+    """config.artifact_backend에 맞는 artifact 저장소 생성"""
+    if config.artifact_backend == "local":
+        return LocalArtifactStore(config.artifact_path)
+    raise ValueError(f"Unknown artifact_backend: {config.artifact_backend}")
+
+
+def encode_artifact(value: Any) -> Tuple[bytes, str]:
+    """값 → (저장할 bytes, media_type)"""
+    if isinstance(value, bytes):
+        return value, "application/octet-stream"
+    if isinstance(value, str):
+        return value.encode("utf-8"), "text/plain; charset=utf-8"
+    return dumps(value), "application/json"
+
+
+def store_artifacts(
+    store: ArtifactStore,
+    artifacts: List[Union[bytes, str, Path, Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """
+    TaskResult.artifacts 항목 저장
+
+    Args:
+        artifacts: bytes (내용), str / Path (파일 경로), dict (이미 저장된 참조)
+
+    Returns:
+        참조 목록
+    """
+    refs = []
+    for item in artifacts:
+        if isinstance(item, dict):
+            refs.append(item)
+        elif isinstance(item, bytes):
+            refs.append(store.put(item))
+        else:
+            path = Path(item)
+            ref = store.put(path.read_bytes())
+            ref["name"] = path.name
+            refs.append(ref)
+    return refs
+
+
+def spill_large_values(
+    data: Dict[str, Any],
+    store: ArtifactStore,
+    threshold_bytes: int
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    직렬화 크기가 threshold_bytes 이상인 최상위 값을 artifact로 저장하고 참조로 대체
+
+    Returns:
+        (대체된 data 사본, 저장한 artifact 참조 목록). 원본 data는 수정하지 않음
+    """
+    spilled = {}
+    refs = []
+    for key, value in data.items():
+        blob, media_type = encode_artifact(value)
+        if len(blob) < threshold_bytes:
+            spilled[key] = value
+            continue
+        ref = store.put(blob, media_type)
+        ref["name"] = key
+        refs.append(ref)
+        spilled[key] = {"artifact": ref["digest"], "size": ref["size"]}
+    return spilled, refs
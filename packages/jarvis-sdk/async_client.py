@@ -0,0 +1,383 @@
+"""
+JARVIS Async API Client - asyncio 기반 이벤트 전송
+"""
+
+import asyncio
+import io
+import json
+import ssl
+import time
+import urllib.error
+from email.message import Message
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    from .config import JarvisConfig, get_config
+    from .client import JarvisClient, JarvisEvent, JarvisAPIError, get_client
+    from .breaker import CircuitBreaker
+    from .connection import urlopen_request, uses_proxy
+except ImportError:
+    from config import JarvisConfig, get_config
+    from client import JarvisClient, JarvisEvent, JarvisAPIError, get_client
+    from breaker import CircuitBreaker
+    from connection import urlopen_request, uses_proxy
+
+# (scheme, host, port)
+_PoolKey = Tuple[str, str, int]
+_Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class AsyncConnectionPool:
+    """
+    asyncio 스트림 기반 최소 HTTP/1.1 keep-alive 연결 풀
+
+    Content-Length / chunked 응답을 지원하며, 서버가 닫은 idle 연결은
+    새 연결로 1회 재시도합니다.
+    """
+
+    def __init__(self, max_idle_per_host: int = 8):
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[_PoolKey, List[_Connection]] = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30
+    ) -> Tuple[int, str, Message, bytes]:
+        """
+        HTTP 요청 전송
+
+        Returns:
+            (status, reason, headers, body)
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = parts.hostname or ""
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, host, port)
+
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        lines.append(f"Content-Length: {len(body)}")
+        raw = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+        while True:
+            (reader, writer), reused = await self._acquire(key, timeout)
+            try:
+                writer.write(raw)
+                await writer.drain()
+                status, reason, response_headers, data, will_close = await asyncio.wait_for(
+                    self._read_response(reader), timeout
+                )
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused:
+                    # 서버가 닫은 keep-alive 연결 → 새 연결로 재시도
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+
+            if will_close:
+                writer.close()
+            else:
+                self._release(key, (reader, writer))
+            return status, reason, response_headers, data
+
+    async def close(self) -> None:
+        """모든 idle 연결 종료"""
+        idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for _, writer in conns:
+                writer.close()
+
+    async def _acquire(self, key: _PoolKey, timeout: float) -> Tuple[_Connection, bool]:
+        """idle 연결을 꺼내거나 새로 생성. (연결, 재사용 여부) 반환"""
+        conns = self._idle.get(key)
+        while conns:
+            reader, writer = conns.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return (reader, writer), True
+            writer.close()
+
+        scheme, host, port = key
+        ssl_context = None
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            ssl_context = self._ssl_context
+
+        connection = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=ssl_context), timeout
+        )
+        return connection, False
+
+    def _release(self, key: _PoolKey, connection: _Connection) -> None:
+        """연결을 idle 목록으로 반환 (한도 초과 시 종료)"""
+        conns = self._idle.setdefault(key, [])
+        if len(conns) < self.max_idle_per_host:
+            conns.append(connection)
+        else:
+            connection[1].close()
+
+    @staticmethod
+    async def _read_response(
+        reader: asyncio.StreamReader
+    ) -> Tuple[int, str, Message, bytes, bool]:
+        """HTTP 응답 파싱. (status, reason, headers, body, 연결 종료 여부) 반환"""
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by server")
+
+        version, _, rest = status_line.decode("latin-1").rstrip("\r\n").partition(" ")
+        code, _, reason = rest.partition(" ")
+
+        headers = Message()
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip()] = value.strip()
+
+        connection = headers.get("Connection", "").lower()
+        if version == "HTTP/1.0":
+            will_close = connection != "keep-alive"
+        else:
+            will_close = connection == "close"
+
+        if headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip(), 16)
+                if size == 0:
+                    # trailer 헤더 무시
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "Content-Length" in headers:
+            body = await reader.readexactly(int(headers["Content-Length"]))
+        else:
+            # 길이 정보가 없으면 EOF까지 읽으므로 재사용 불가
+            body = await reader.read()
+            will_close = True
+
+        return int(code), reason, headers, body, will_close
+
+
+class AsyncJarvisClient:
+    """
+    asyncio용 MindCollab API 클라이언트
+
+    JarvisClient와 같은 이벤트 스키마 / idempotency key / fail-open outbox를 사용하며,
+    네트워크 I/O, 백오프, outbox / 로그 파일 기록은 이벤트 루프를 블로킹하지 않습니다.
+
+    Usage:
+        async with AsyncJarvisClient() as client:
+            await client.send_event(event)
+    """
+
+    def __init__(
+        self,
+        config: Optional[JarvisConfig] = None,
+        strict: bool = False,
+        max_in_flight: Optional[int] = None
+    ):
+        """
+        Args:
+            config: JarvisConfig 인스턴스
+            strict: True면 4xx 에러에서 예외 발생, False(기본)면 outbox 저장 후 계속
+            max_in_flight: 동시 요청 수 상한 (기본: config.async_max_in_flight)
+        """
+        self.config = config or get_config()
+        self.strict = strict
+        self.max_in_flight = max_in_flight or self.config.async_max_in_flight
+
+        # outbox / 로그 / idempotency key는 같은 설정의 공유 동기 클라이언트와 공유
+        self._sync: JarvisClient = get_client(self.config, strict=strict)
+        self._pool = AsyncConnectionPool()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncJarvisClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        await self.close()
+        return False
+
+    async def close(self) -> None:
+        """연결 풀 종료"""
+        await self._pool.close()
+
+    @property
+    def metrics(self):
+        """메트릭 레지스트리 (동기 클라이언트와 공유)"""
+        return self._sync.metrics
+
+    def generate_idempotency_key(
+        self,
+        worker_id: str,
+        task_id: str,
+        event_type: str,
+        sequence: Optional[int] = None,
+        run_id: Optional[str] = None
+    ) -> str:
+        """Idempotency Key 생성 (JarvisClient와 동일)"""
+        return self._sync.generate_idempotency_key(worker_id, task_id, event_type, sequence, run_id)
+
+    async def send_event(self, event: JarvisEvent) -> Dict[str, Any]:
+        """
+        이벤트 전송 (재시도 + Outbox fallback)
+
+        Returns:
+            JarvisClient.send_event와 동일
+        """
+        started = time.perf_counter()
+        result = await self._send_with_retry(event)
+        self.metrics.record_delivery(event, result, started)
+        return result
+
+    async def _send_with_retry(self, event: JarvisEvent) -> Dict[str, Any]:
+        """재시도 루프 (서킷 open / 재시도 소진 시 outbox)"""
+        acked = self._sync._lookup_ack(event)
+        if acked is not None:
+            await self._log_event(event, "deduped", acked)
+            return acked
+
+        last_error = None
+        breaker = self._sync.breaker
+        circuit_open = False
+
+        # 재시도 루프
+        for attempt in range(self.config.max_retries):
+            if attempt:
+                self.metrics.retries.inc(event.event_type)
+            if not breaker.allow_request():
+                # 서킷 open → 네트워크 시도 없이 바로 outbox
+                circuit_open = True
+                break
+
+            try:
+                result = await self._send_request(event)
+                breaker.record_success()
+                self._sync._remember_ack(event, result)
+                await self._log_event(event, "sent", result)
+                return result
+
+            except urllib.error.HTTPError as e:
+                if e.code < 500:
+                    # 4xx 에러는 재시도 안함
+                    breaker.record_success()
+                    error_body = e.read().decode('utf-8', errors='replace')
+                    await self._log_event(event, "client_error", {"code": e.code, "body": error_body})
+                    if self.strict:
+                        raise JarvisAPIError(f"API error {e.code}: {error_body}")
+                    outbox_path = await self._save_to_outbox(event, f"HTTP {e.code}: {error_body}")
+                    await self._log_event(event, "outboxed_4xx", {"code": e.code, "path": str(outbox_path)})
+                    return {"status": "outboxed", "path": str(outbox_path), "error_code": e.code}
+                breaker.record_failure()
+                last_error = e
+
+            except Exception as e:
+                breaker.record_failure()
+                last_error = e
+
+            except BaseException:
+                # 취소(CancelledError / wait_for timeout / 종료) → 결과 없음, half-open probe 슬롯 반환
+                breaker.release_probe()
+                raise
+
+            # 백오프 (이벤트 루프 블로킹 없음, 서킷이 열렸으면 바로 outbox)
+            if attempt < self.config.max_retries - 1:
+                if breaker.state == CircuitBreaker.OPEN:
+                    circuit_open = True
+                    break
+                backoff = self.config.retry_backoff_base * (2 ** attempt)
+                await asyncio.sleep(backoff)
+
+        if circuit_open:
+            error = f"circuit open (last error: {last_error})" if last_error else "circuit open"
+            outbox_path = await self._save_to_outbox(event, error)
+            await self._log_event(event, "outboxed_circuit_open", {"error": error, "path": str(outbox_path)})
+            return {"status": "outboxed", "path": str(outbox_path), "reason": "circuit_open"}
+
+        # 모든 재시도 실패 → Outbox 저장
+        outbox_path = await self._save_to_outbox(event, str(last_error))
+        await self._log_event(event, "outboxed", {"error": str(last_error), "path": str(outbox_path)})
+
+        return {"status": "outboxed", "path": str(outbox_path)}
+
+    async def _send_request(self, event: JarvisEvent) -> Dict[str, Any]:
+        """HTTP 요청 전송 (동시 요청 수 제한)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        url = f"{self.config.api_base_url}/jarvis/events"
+        data = await self._encode_event(event)
+        request_body, headers, compressed = self._sync._request_body(data, event)
+
+        async with self._semaphore:
+            status, reason, response_headers, body = await self._request(url, request_body, headers)
+            if compressed and status == 415:
+                # 서버가 gzip 미지원 → 이후 압축 없이 전송
+                # (압축 전제로 남겨둔 큰 payload는 다시 인코딩하며 축약)
+                self._sync._gzip_supported = False
+                request_body, headers, _ = self._sync._request_body(await self._encode_event(event))
+                status, reason, response_headers, body = await self._request(url, request_body, headers)
+
+        if status >= 400:
+            raise urllib.error.HTTPError(url, status, reason, response_headers, io.BytesIO(body))
+        return json.loads(body.decode('utf-8'))
+
+    async def _request(self, url: str, body: bytes, headers: Dict[str, str]):
+        """POST 요청 1회 (요청 수 / 전송 바이트 기록, 프록시 대상 host는 executor에서 urlopen)"""
+        self.metrics.bytes_sent.inc(amount=len(body))
+        try:
+            if uses_proxy(url):
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(
+                    None, urlopen_request, "POST", url, body, headers, self.config.timeout_seconds
+                )
+            else:
+                response = await self._pool.request(
+                    "POST", url, body=body, headers=headers, timeout=self.config.timeout_seconds
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.metrics.requests.inc("error")
+            raise
+        self.metrics.requests.inc(str(response[0]))
+        return response
+
+    async def _encode_event(self, event: JarvisEvent) -> bytes:
+        """이벤트 JSON 인코딩 (JarvisClient._encode_event와 동일, truncated 로그는 _log_event로)"""
+        truncated = self._sync._fit_payload(event)
+        if truncated is not None:
+            await self._log_event(event, "truncated", truncated)
+        return event.encode()
+
+    async def _log_event(self, event: JarvisEvent, action: str, details: Dict[str, Any]) -> None:
+        """이벤트 로깅 (버퍼 추가만 이벤트 루프에서, 파일 flush / 로테이션은 executor에서)"""
+        sink = self._sync._log_sink
+        if sink.append(self._sync._log_line(event, action, details)):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, sink.flush)
+
+    async def _save_to_outbox(self, event: JarvisEvent, error: str):
+        """Outbox 저장 (파일 I/O는 executor에서 실행)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._sync._save_to_outbox, event, error)
@@ -0,0 +1,161 @@
+"""
+JARVIS Async Task - asyncio Context Manager for IPC Events
+"""
+
+import asyncio
+import traceback
+from typing import Dict, Any, List, Optional, Union
+
+try:
+    from .async_client import AsyncJarvisClient
+    from .config import JarvisConfig
+    from .task import TaskResult, _TaskBase
+except ImportError:
+    from async_client import AsyncJarvisClient
+    from config import JarvisConfig
+    from task import TaskResult, _TaskBase
+
+
+class AsyncJarvisTask(_TaskBase):
+    """
+    asyncio용 JARVIS 태스크 - async Context Manager 지원
+
+    JarvisTask와 같은 이벤트를 보내지만 모든 전송 메서드가 코루틴입니다.
+
+    Usage:
+        async with AsyncJarvisTask("my_task", node_id="N148", worker_id="haedong") as task:
+            await task.start("작업 시작")
+            await task.log("진행 중...", level="info")
+            await task.complete({"result": "ok"}, summary="완료")
+    """
+
+    def __init__(
+        self,
+        task_id: str,
+        node_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        project_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        config: Optional[JarvisConfig] = None,
+        strict: bool = False,
+        client: Optional[AsyncJarvisClient] = None,
+        run_id: Optional[str] = None,
+        trace_id: Optional[str] = None
+    ):
+        """
+        Args:
+            task_id ~ strict: JarvisTask와 동일
+            client: 공유할 AsyncJarvisClient (선택, 여러 태스크가 동시 요청 상한을 공유)
+            run_id, trace_id: JarvisTask와 동일
+        """
+        super().__init__(
+            task_id, node_id, worker_id, project_id, session_id, config, strict, run_id, trace_id
+        )
+        self._owns_client = client is None
+        self.client = client or AsyncJarvisClient(self.config, strict=strict)
+
+    async def __aenter__(self) -> "AsyncJarvisTask":
+        """Context manager 진입"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        """
+        Context manager 종료 (JarvisTask.__exit__와 동일한 규칙)
+        - 예외 발생 시: blocked() 자동 호출 (실패해도 원래 예외 전파)
+        - 정상 종료 + complete 미호출 시: 경고 로그
+        """
+        try:
+            if exc_type is not None:
+                try:
+                    error_details = "".join(traceback.format_exception(exc_type, exc_val, exc_tb))
+                    await self.blocked(
+                        reason=str(exc_val),
+                        blocker_type="error",
+                        error_details=error_details
+                    )
+                except Exception:
+                    pass
+                return False
+
+            if self._started and not self._completed:
+                try:
+                    await self.flush()
+                    await self.log(
+                        "Task exited without calling complete() or blocked()",
+                        level="warning"
+                    )
+                except Exception:
+                    pass
+
+            return False
+        finally:
+            if self._owns_client:
+                await self.client.close()
+
+    async def start(self, description: str) -> Dict[str, Any]:
+        """태스크 시작 이벤트 전송"""
+        if self._started:
+            await self.log("start() called multiple times", level="warning")
+            return {"status": "skipped", "reason": "already_started"}
+
+        return await self.client.send_event(self._build_started(description))
+
+    async def complete(
+        self,
+        result: Union[Dict[str, Any], TaskResult],
+        summary: Optional[str] = None,
+        status: str = "success"
+    ) -> Dict[str, Any]:
+        """태스크 완료 이벤트 전송 (artifact 저장은 executor에서 실행)"""
+        if self._completed:
+            await self.log("complete() called multiple times", level="warning")
+            return {"status": "skipped", "reason": "already_completed"}
+
+        await self.flush()
+        loop = asyncio.get_running_loop()
+        event = await loop.run_in_executor(None, self._build_completed, result, summary, status)
+        return await self.client.send_event(event)
+
+    async def blocked(
+        self,
+        reason: str,
+        blocker_type: str = "error",
+        error_details: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """태스크 블로커 이벤트 전송"""
+        if self._completed:
+            await self.log("blocked() called after complete()", level="warning")
+            return {"status": "skipped", "reason": "already_completed"}
+
+        await self.flush()
+        return await self.client.send_event(
+            self._build_blocked(reason, blocker_type, error_details)
+        )
+
+    async def log(
+        self,
+        message: str,
+        level: str = "info",
+        context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """로그 이벤트 전송 (JarvisTask.log와 같은 빈도 제한)"""
+        event = self._coalesce_log(message, level, context)
+        if event is None:
+            return {"status": "coalesced"}
+        return await self.client.send_event(event)
+
+    async def progress(
+        self,
+        current: float,
+        total: Optional[float] = None,
+        message: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """진행률 전송 (JarvisTask.progress와 동일)"""
+        event = self._coalesce_progress(current, total, message)
+        if event is None:
+            return {"status": "coalesced"}
+        return await self.client.send_event(event)
+
+    async def flush(self) -> List[Dict[str, Any]]:
+        """보류 중인 progress / log 즉시 전송"""
+        return [await self.client.send_event(event) for event in self._take_pending()]
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+JARVIS SDK - Connection Pool Benchmark
+======================================
+
+로컬 HTTP 스텁에 이벤트를 순차 전송하여 urlopen(요청마다 새 연결)과
+keep-alive 연결 풀의 이벤트당 지연 시간을 비교합니다.
+
+Usage:
+    python3 benchmarks/bench_connection_pool.py [--events 500]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add package directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import JarvisConfig  # noqa: E402
+from client import JarvisClient, JarvisEvent  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+def run(client: JarvisClient, events: int) -> list:
+    """이벤트 전송 후 이벤트별 지연 시간(ms) 반환"""
+    latencies = []
+    for i in range(events):
+        event = JarvisEvent(
+            event_type="task_log",
+            task_id="bench",
+            idempotency_key=f"bench:bench:task_log:{i}",
+            worker_id="bench",
+            payload={"level": "info", "message": f"progress {i}"},
+        )
+        started = time.perf_counter()
+        client.send_event(event)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=500)
+    args = parser.parse_args()
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        print(f"Sending {args.events} events to local stub\n")
+        print(f"  {'mode':<12} {'mean':>9} {'p50':>9} {'p95':>9}")
+        for keep_alive in (False, True):
+            config = JarvisConfig(
+                api_base_url=server.api_url,
+                api_key="bench",
+                keep_alive=keep_alive,
+                outbox_path=Path(tmp) / "outbox",
+                log_path=Path(tmp) / "logs",
+            )
+            latencies = sorted(run(JarvisClient(config), args.events))
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            mode = "keep-alive" if keep_alive else "urlopen"
+            print(
+                f"  {mode:<12} {statistics.mean(latencies):>7.3f}ms "
+                f"{statistics.median(latencies):>7.3f}ms {p95:>7.3f}ms"
+            )
+
+if __name__ == "__main__":
+    main()
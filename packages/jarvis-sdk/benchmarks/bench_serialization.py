@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+JARVIS SDK - Event Serialization Benchmark
+==========================================
+
+이벤트 하나가 전송 실패 후 outbox에 저장되기까지의 직렬화 비용을 비교합니다.
+
+- legacy: dataclasses.asdict (payload deep copy) + None 필터 + json.dumps + encode를
+  배치 크기 계산 / 전송 / outbox 저장에서 각각 수행
+- cached: JarvisEvent.encode() 한 번 후 캐시된 bytes 재사용
+
+Usage:
+    python3 benchmarks/bench_serialization.py [--events 20000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Add package directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from client import JarvisEvent  # noqa: E402
+from serialization import JSON_BACKEND  # noqa: E402
+
+
+@dataclass
+class LegacyEvent:
+    """이전 dataclass 기반 JarvisEvent"""
+    event_type: str
+    task_id: str
+    idempotency_key: str
+    worker_id: str
+    payload: Dict[str, Any]
+    node_id: Optional[str] = None
+    project_id: Optional[str] = None
+    session_id: Optional[str] = None
+    summary: Optional[str] = None
+    sdk_version: str = "1.0.0"
+    trace_id: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        return {k: v for k, v in data.items() if v is not None}
+
+
+def _payload(i: int) -> Dict[str, Any]:
+    """task_completed 수준의 중첩 payload"""
+    return {
+        "result": {
+            "status": "success",
+            "data": {"processed": i, "items": [{"id": n, "name": f"항목 {n}"} for n in range(10)]},
+        },
+        "duration_seconds": 12.5,
+        "completed_at": "2025-01-01T00:00:00",
+    }
+
+
+def bench_legacy(events: int) -> float:
+    """이벤트당 평균 시간 (µs)"""
+    started = time.perf_counter()
+    for i in range(events):
+        event = LegacyEvent("task_completed", "bench", f"bench:{i}", "bench", _payload(i))
+        len(json.dumps(event.to_dict()).encode("utf-8"))           # 배치 크기 계산
+        json.dumps(event.to_dict()).encode("utf-8")                # 전송
+        json.dumps({"event": event.to_dict()}, ensure_ascii=False)  # outbox 저장
+    return (time.perf_counter() - started) / events * 1e6
+
+
+def bench_cached(events: int) -> float:
+    """이벤트당 평균 시간 (µs)"""
+    started = time.perf_counter()
+    for i in range(events):
+        event = JarvisEvent("task_completed", "bench", f"bench:{i}", "bench", _payload(i))
+        len(event.encode())   # 배치 크기 계산
+        event.encode()        # 전송
+        event.encode()        # outbox 저장
+    return (time.perf_counter() - started) / events * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+
+    # warm-up
+    bench_legacy(min(1000, args.events))
+    bench_cached(min(1000, args.events))
+
+    legacy = bench_legacy(args.events)
+    cached = bench_cached(args.events)
+
+    print(f"Serializing {args.events} events (JSON backend: {JSON_BACKEND})\n")
+    print(f"  {'mode':<8} {'per event':>12}")
+    print(f"  {'legacy':<8} {legacy:>9.2f}µs")
+    print(f"  {'cached':<8} {cached:>9.2f}µs")
+    print(f"\n  speedup: {legacy / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
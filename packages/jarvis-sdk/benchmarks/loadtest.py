@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+JARVIS SDK - Load Test
+======================
+
+JarvisTask 생명주기(start → log × N → complete)를 동시에 여러 개 실행하여
+처리량, 호출 지연 시간 분포, outbox 증가량을 측정합니다.
+
+기본은 프로세스 내 stub 서버를 대상으로 하며, --subprocess로 stub을 별도 프로세스에서
+실행하거나 --api-url로 다른 서버를 지정할 수 있습니다.
+
+Usage:
+    python3 benchmarks/loadtest.py --tasks 200 --concurrency 20 --logs 5
+    python3 benchmarks/loadtest.py --error-rate 0.2 --drop-rate 0.05 --latency-ms 10
+    python3 benchmarks/loadtest.py --async-delivery --batch-max-events 20 --json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add package directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import JarvisConfig  # noqa: E402
+from client import JarvisClient  # noqa: E402
+from task import JarvisTask  # noqa: E402
+from stub_server import StubServer, start_subprocess  # noqa: E402
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """정렬된 값의 백분위수"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(len(values) * percent / 100)) - 1))
+    return values[index]
+
+
+def run_load(config: JarvisConfig, tasks: int, concurrency: int, logs: int) -> Dict[str, Any]:
+    """
+    태스크 생명주기를 동시에 실행하고 결과 집계
+
+    Returns:
+        {"events", "seconds", "throughput", "latency_ms": {...}, "statuses": {...}, "outbox": {...}}
+    """
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    lock = threading.Lock()
+    client = JarvisClient(config)
+    outbox_before = client.outbox.count()
+
+    def timed(call, *args, **kwargs):
+        started = time.perf_counter()
+        result = call(*args, **kwargs)
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+            status = result.get("status", "unknown")
+            statuses[status] = statuses.get(status, 0) + 1
+
+    def lifecycle(index: int):
+        task = JarvisTask(f"load_{index}", worker_id="loadtest", config=config)
+        timed(task.start, "load test")
+        for i in range(logs):
+            timed(task.log, f"step {i}")
+        timed(task.complete, {"index": index})
+        task.client.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lifecycle, range(tasks)))
+    seconds = time.perf_counter() - started
+
+    latencies.sort()
+    outbox_after = client.outbox.count()
+    return {
+        "tasks": tasks,
+        "concurrency": concurrency,
+        "events": len(latencies),
+        "seconds": round(seconds, 3),
+        "throughput": round(len(latencies) / seconds, 1),
+        "latency_ms": {
+            "mean": round(sum(latencies) / max(len(latencies), 1), 3),
+            "p50": round(_percentile(latencies, 50), 3),
+            "p95": round(_percentile(latencies, 95), 3),
+            "p99": round(_percentile(latencies, 99), 3),
+            "max": round(latencies[-1] if latencies else 0.0, 3),
+        },
+        "statuses": statuses,
+        "outbox": {"before": outbox_before, "after": outbox_after, "growth": outbox_after - outbox_before},
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--logs", type=int, default=5, help="태스크당 log() 호출 수")
+    parser.add_argument("--api-url", default=None, help="stub 대신 사용할 API 주소")
+    parser.add_argument("--subprocess", action="store_true", help="stub을 별도 프로세스로 실행")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--client-error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--async-delivery", action="store_true")
+    parser.add_argument("--batch-max-events", type=int, default=1)
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    stub_options = dict(
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        client_error_rate=args.client_error_rate,
+        drop_rate=args.drop_rate,
+        seed=args.seed,
+    )
+    server = process = None
+    if args.api_url:
+        api_url = args.api_url
+    elif args.subprocess:
+        process, api_url = start_subprocess(**stub_options)
+    else:
+        server = StubServer(
+            latency=args.latency_ms / 1000,
+            error_rate=args.error_rate,
+            client_error_rate=args.client_error_rate,
+            drop_rate=args.drop_rate,
+            seed=args.seed,
+        ).start()
+        api_url = server.api_url
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            config = JarvisConfig(
+                api_base_url=api_url,
+                api_key="loadtest",
+                retry_backoff_base=0.01,
+                max_retries=args.max_retries,
+                async_delivery=args.async_delivery,
+                batch_max_events=args.batch_max_events,
+                breaker_enabled=False,
+                outbox_path=Path(tmp) / "outbox",
+                log_path=Path(tmp) / "logs",
+                artifact_path=Path(tmp) / "artifacts",
+            )
+            report = run_load(config, args.tasks, args.concurrency, args.logs)
+            if server is not None:
+                report["server"] = server.stats()
+    finally:
+        if server is not None:
+            server.stop()
+        if process is not None:
+            process.terminate()
+            _, stderr = process.communicate()
+            report["server"] = json.loads(stderr)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    latency = report["latency_ms"]
+    print(f"{report['tasks']} tasks × {args.logs + 2} events, concurrency {report['concurrency']}\n")
+    print(f"  throughput   {report['throughput']:>10.1f} events/s ({report['events']} in {report['seconds']}s)")
+    print(f"  latency      mean {latency['mean']:.2f}ms  p50 {latency['p50']:.2f}ms  "
+          f"p95 {latency['p95']:.2f}ms  p99 {latency['p99']:.2f}ms  max {latency['max']:.2f}ms")
+    print(f"  statuses     {report['statuses']}")
+    print(f"  outbox       +{report['outbox']['growth']} (now {report['outbox']['after']})")
+    if "server" in report:
+        print(f"  server       {report['server']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+JARVIS SDK - Benchmark Suite
+============================
+
+SDK hot path의 이벤트(호출)당 비용을 측정하여 JSON으로 저장하고,
+이전 결과(baseline)와 비교해 느려진 항목을 표시합니다.
+
+- event.to_dict / event.encode: 이벤트 dict 변환 / 직렬화
+- idempotency_key: generate_idempotency_key
+- log_event: 전송 로그 기록 (_log_event)
+- resource_profile: 태스크 자원 사용량 측정 start + stop (resource_profile=True 비용)
+- save_to_outbox: outbox 저장 (_save_to_outbox)
+- retry_outbox.scan_<N>: pending N건 outbox 스캔 (서킷 open → 전송 없이 스캔 비용만)
+- send_event.e2e: 로컬 stub 서버 대상 send_event
+
+Usage:
+    python3 benchmarks/suite.py --output bench.json
+    python3 benchmarks/suite.py --baseline bench.json --threshold 0.2
+    python3 benchmarks/suite.py --quick --only event,outbox
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Add package directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import JarvisConfig  # noqa: E402
+from client import JarvisClient, JarvisEvent  # noqa: E402
+from breaker import CircuitBreaker  # noqa: E402
+from serialization import JSON_BACKEND  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+from resources import ResourceProfile  # noqa: E402
+
+DEFAULT_SCAN_SIZES = (1000, 10000, 100000)
+QUICK_SCAN_SIZES = (1000,)
+
+
+def _event(i: int) -> JarvisEvent:
+    """task_log 수준 이벤트"""
+    return JarvisEvent(
+        event_type="task_log",
+        task_id=f"bench_{i % 100}",
+        idempotency_key=f"bench:bench_{i % 100}:task_log:{i}",
+        worker_id="bench",
+        payload={"level": "info", "message": f"progress {i}", "data": {"step": i, "items": list(range(10))}},
+    )
+
+
+def _config(tmp: str, **overrides) -> JarvisConfig:
+    """임시 디렉토리 + 연결 불가 API 설정"""
+    options = dict(
+        api_base_url="http://127.0.0.1:9/api",
+        api_key="bench",
+        timeout_seconds=1,
+        max_retries=1,
+        retry_backoff_base=0.0,
+        breaker_enabled=False,
+        outbox_path=Path(tmp) / "outbox",
+        log_path=Path(tmp) / "logs",
+        artifact_path=Path(tmp) / "artifacts",
+    )
+    options.update(overrides)
+    return JarvisConfig(**options)
+
+
+def measure(fn: Callable[[int], Any], number: int, repeat: int = 5) -> Dict[str, Any]:
+    """
+    fn(i)를 number번 호출하는 라운드를 repeat번 실행
+
+    Returns:
+        호출당 시간 (µs): {"unit", "median", "min", "mean", "stdev", "rounds", "number"}
+    """
+    rounds = []
+    offset = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for i in range(offset, offset + number):
+            fn(i)
+        rounds.append((time.perf_counter() - started) / number * 1e6)
+        offset += number
+    return {
+        "unit": "us",
+        "median": round(statistics.median(rounds), 3),
+        "min": round(min(rounds), 3),
+        "mean": round(statistics.mean(rounds), 3),
+        "stdev": round(statistics.stdev(rounds), 3) if len(rounds) > 1 else 0.0,
+        "rounds": repeat,
+        "number": number,
+    }
+
+
+def bench_event(quick: bool) -> Dict[str, Dict[str, Any]]:
+    """JarvisEvent.to_dict / encode"""
+    number = 2000 if quick else 20000
+
+    def encode(i):
+        _event(i).encode()
+
+    return {
+        "event.to_dict": measure(lambda i: _event(i).to_dict(), number),
+        "event.encode": measure(encode, number),
+    }
+
+
+def bench_idempotency_key(quick: bool) -> Dict[str, Dict[str, Any]]:
+    """generate_idempotency_key"""
+    with tempfile.TemporaryDirectory() as tmp:
+        client = JarvisClient(_config(tmp))
+        number = 5000 if quick else 50000
+        result = measure(
+            lambda i: client.generate_idempotency_key("bench", "task", "task_log", i), number
+        )
+        client.close()
+    return {"idempotency_key": result}
+
+
+def bench_log_event(quick: bool) -> Dict[str, Dict[str, Any]]:
+    """_log_event (버퍼링된 로그 sink 포함, 마지막 flush까지)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        client = JarvisClient(_config(tmp))
+        events = [_event(i) for i in range(100)]
+        details = {"result": {"status": "created", "event_id": "evt_1"}}
+        result = measure(
+            lambda i: client._log_event(events[i % 100], "sent", details), 2000 if quick else 20000
+        )
+        client.close()
+    return {"log_event": result}
+
+
+def bench_resources(quick: bool) -> Dict[str, Dict[str, Any]]:
+    """ResourceProfile start + stop (getrusage / /proc/self/io 2회씩)"""
+    def profile(i):
+        profile = ResourceProfile()
+        profile.start()
+        profile.stop()
+
+    return {"resource_profile": measure(profile, 1000 if quick else 10000)}
+
+
+def bench_outbox(quick: bool, backend: str, scan_sizes) -> Dict[str, Dict[str, Any]]:
+    """_save_to_outbox / retry_outbox 스캔"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        client = JarvisClient(_config(tmp, outbox_backend=backend))
+        results["save_to_outbox"] = measure(
+            lambda i: client._save_to_outbox(_event(i), "bench"), 200 if quick else 1000
+        )
+        client.close()
+
+    for size in scan_sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            client = JarvisClient(_config(tmp, outbox_backend=backend))
+            for i in range(size):
+                client.outbox.add(_event(i).to_dict(), "bench")
+            client.outbox.sync()
+
+            # 서킷 open: 태스크별 첫 이벤트만 deferred 처리 → 네트워크 없이 스캔 비용만 측정
+            client.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=3600)
+            client.breaker.record_failure()
+
+            stats = measure(lambda i: client.retry_outbox(), 1, repeat=3)
+            stats["entries"] = size
+            results[f"retry_outbox.scan_{size}"] = stats
+            client.close()
+    return results
+
+
+def bench_send_event(quick: bool) -> Dict[str, Dict[str, Any]]:
+    """로컬 stub 서버 대상 send_event (keep-alive)"""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        client = JarvisClient(_config(tmp, api_base_url=server.api_url))
+        result = measure(lambda i: client.send_event(_event(i)), 100 if quick else 500)
+        client.close()
+    return {"send_event.e2e": result}
+
+
+SUITES = {
+    "event": bench_event,
+    "idempotency": bench_idempotency_key,
+    "log": bench_log_event,
+    "resources": bench_resources,
+    "outbox": bench_outbox,
+    "send": bench_send_event,
+}
+
+
+def run_suite(
+    only: Optional[List[str]] = None,
+    quick: bool = False,
+    backend: str = "file",
+    scan_sizes=None
+) -> Dict[str, Any]:
+    """
+    벤치마크 실행
+
+    Args:
+        only: 실행할 suite 이름 목록 (None이면 전체)
+        quick: 반복 / 스캔 크기를 줄인 빠른 실행
+        backend: outbox 백엔드 (file / segment / sqlite)
+        scan_sizes: retry_outbox 스캔 크기 목록
+
+    Returns:
+        {"meta": {...}, "results": {name: stats}}
+    """
+    if scan_sizes is None:
+        scan_sizes = QUICK_SCAN_SIZES if quick else DEFAULT_SCAN_SIZES
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, suite in SUITES.items():
+        if only and name not in only:
+            continue
+        if name == "outbox":
+            results.update(suite(quick, backend, scan_sizes))
+        else:
+            results.update(suite(quick))
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_backend": JSON_BACKEND,
+            "outbox_backend": backend,
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.2
+) -> List[Dict[str, Any]]:
+    """
+    baseline 대비 변화율 계산 (median 기준)
+
+    Args:
+        threshold: 이 비율 이상 느려지면 regression (0.2 = 20%)
+
+    Returns:
+        항목별 {"name", "baseline", "current", "change", "regression"} (양쪽에 있는 항목만)
+    """
+    rows = []
+    for name, stats in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None or not base.get("median"):
+            continue
+        change = stats["median"] / base["median"] - 1
+        rows.append({
+            "name": name,
+            "baseline": base["median"],
+            "current": stats["median"],
+            "change": round(change, 4),
+            "regression": change > threshold,
+        })
+    return rows
+
+
+def _format_us(value: float) -> str:
+    """µs 값을 읽기 쉬운 단위로"""
+    if value >= 1e6:
+        return f"{value / 1e6:.2f}s"
+    if value >= 1e3:
+        return f"{value / 1e3:.2f}ms"
+    return f"{value:.2f}µs"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", type=Path, default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="regression 판정 비율 (기본 0.2 = 20%%)")
+    parser.add_argument("--only", default=None, help=f"실행할 suite (쉼표 구분): {','.join(SUITES)}")
+    parser.add_argument("--quick", action="store_true", help="반복 / 스캔 크기를 줄여 빠르게 실행")
+    parser.add_argument("--backend", default="file", choices=["file", "segment", "sqlite"])
+    parser.add_argument("--scan-sizes", default=None, help="retry_outbox 스캔 크기 (쉼표 구분)")
+    args = parser.parse_args(argv)
+
+    only = args.only.split(",") if args.only else None
+    scan_sizes = [int(n) for n in args.scan_sizes.split(",")] if args.scan_sizes else None
+    report = run_suite(only=only, quick=args.quick, backend=args.backend, scan_sizes=scan_sizes)
+
+    print(f"JARVIS SDK benchmarks (JSON backend: {JSON_BACKEND}, outbox: {args.backend})\n")
+    print(f"  {'case':<28} {'median':>10} {'min':>10}")
+    for name, stats in report["results"].items():
+        print(f"  {name:<28} {_format_us(stats['median']):>10} {_format_us(stats['min']):>10}")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\n  saved: {args.output}")
+
+    if args.baseline is None:
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    rows = compare(baseline, report, args.threshold)
+    print(f"\nCompared with {args.baseline} (threshold +{args.threshold:.0%})\n")
+    for key in ("json_backend", "outbox_backend", "quick", "python"):
+        if baseline.get("meta", {}).get(key) != report["meta"][key]:
+            print(f"  ⚠️  {key} differs from baseline: "
+                  f"{baseline.get('meta', {}).get(key)} → {report['meta'][key]}")
+    for row in rows:
+        flag = "  ❌ regression" if row["regression"] else ""
+        print(
+            f"  {row['name']:<28} {_format_us(row['baseline']):>10} → "
+            f"{_format_us(row['current']):>10} {row['change']:>+8.1%}{flag}"
+        )
+    regressions = [row["name"] for row in rows if row["regression"]]
+    if regressions:
+        print(f"\n  {len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("\n  no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
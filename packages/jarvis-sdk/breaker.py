@@ -0,0 +1,144 @@
+"""
+JARVIS Circuit Breaker - API 장애 시 네트워크 시도 생략
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Any, List, Optional
+
+
+class CircuitBreaker:
+    """
+    closed / open / half-open 서킷 브레이커 (thread-safe)
+
+    - closed: 정상. 연속 실패가 failure_threshold에 도달하면 open
+    - open: 요청 차단 (호출자는 바로 outbox 저장). reset_timeout 후 half-open
+    - half-open: probe 요청 1개만 허용. 성공하면 closed, 실패하면 다시 open
+      (결과 없이 끝난 probe는 release_probe(), 그것도 없으면 reset_timeout 후 만료되어 새 probe 허용)
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: open으로 전환되는 연속 실패 횟수
+            reset_timeout: open 유지 시간 (초), 이후 half-open probe 허용
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+
+        self._transitions: Dict[str, int] = {}
+        self._rejected = 0
+        self._last_change: Optional[float] = None
+        self._listeners: List[Callable[[str, str], None]] = []
+
+    @property
+    def state(self) -> str:
+        """현재 상태 (open 유지 시간이 지났으면 half_open)"""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """요청 허용 여부 (half-open에서는 probe 1개만 허용)"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and (
+                not self._probe_in_flight
+                # 결과가 기록되지 않은 probe (취소 / 스레드 종료 등)는 reset_timeout 후 만료
+                or time.monotonic() - self._probe_started >= self.reset_timeout
+            ):
+                self._probe_in_flight = True
+                self._probe_started = time.monotonic()
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """요청 성공 (API 응답 수신) 기록"""
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            if self._state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        """요청 실패 (연결 오류 / timeout / 5xx) 기록"""
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._transition(self.OPEN)
+
+    def release_probe(self) -> None:
+        """결과 없이 끝난 요청 (취소 등) - half-open probe 슬롯만 반환하고 상태는 유지"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def add_listener(self, callback: Callable[[str, str], None]) -> None:
+        """상태 변경 콜백 등록 (old_state, new_state)"""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def metrics(self) -> Dict[str, Any]:
+        """상태 / 전환 횟수 / 차단 횟수"""
+        with self._lock:
+            self._maybe_half_open()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "rejected": self._rejected,
+                "transitions": dict(self._transitions),
+                "last_state_change": self._last_change,
+            }
+
+    def _maybe_half_open(self) -> None:
+        """open 유지 시간이 지나면 half-open 전환 (lock 보유 상태에서 호출)"""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._transition(self.HALF_OPEN)
+
+    def _transition(self, new_state: str) -> None:
+        """상태 전환 기록 + 콜백 호출 (lock 보유 상태에서 호출)"""
+        old_state, self._state = self._state, new_state
+        key = f"{old_state}->{new_state}"
+        self._transitions[key] = self._transitions.get(key, 0) + 1
+        self._last_change = time.time()
+        for callback in self._listeners:
+            try:
+                callback(old_state, new_state)
+            except Exception:
+                pass
+
+
+# endpoint(api_base_url)별 공유 breaker
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(
+    endpoint: str,
+    failure_threshold: int = 5,
+    reset_timeout: float = 30.0
+) -> CircuitBreaker:
+    """endpoint별 프로세스 공유 breaker 가져오기 (최초 호출 시 생성)"""
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(failure_threshold, reset_timeout)
+            _breakers[endpoint] = breaker
+        return breaker
@@ -2,41 +2,136 @@
 JARVIS API Client
 """
 
+import dataclasses
+import gzip
+import io
 import json
+import random
 import time
-import hashlib
-from pathlib import Path
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
-import urllib.request
-import urllib.error
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+# urllib / concurrent.futures는 실제로 전송 / 병렬 재전송할 때 import (import jarvis_sdk 비용 절감)
 
 try:
     from .config import JarvisConfig, get_config
+    from .logsink import JsonlLogSink, get_log_sink
+    from .sender import BackgroundSender
+    from .connection import get_pool, uses_proxy
+    from .ratelimit import TokenBucket
+    from .outbox import OutboxEntry, OutboxStore, FileOutbox, create_outbox, migrate_outbox
+    from .breaker import CircuitBreaker, get_breaker
+    from .serialization import dumps
+    from .payload import fit_payload
+    from .metrics import ClientMetrics
+    from .ids import ulid
+    from .dedupe import AckedKeys, get_acked_keys
 except ImportError:
     from config import JarvisConfig, get_config
+    from logsink import JsonlLogSink, get_log_sink
+    from sender import BackgroundSender
+    from connection import get_pool, uses_proxy
+    from ratelimit import TokenBucket
+    from outbox import OutboxEntry, OutboxStore, FileOutbox, create_outbox, migrate_outbox
+    from breaker import CircuitBreaker, get_breaker
+    from serialization import dumps
+    from payload import fit_payload
+    from metrics import ClientMetrics
+    from ids import ulid
+    from dedupe import AckedKeys, get_acked_keys
+
+
+def _http_error() -> type:
+    """urllib.error.HTTPError (except 절은 예외가 났을 때만 평가되므로 첫 오류 시 import)"""
+    import urllib.error
+    return urllib.error.HTTPError
 
 
-@dataclass
 class JarvisEvent:
-    """JARVIS 이벤트 데이터"""
-    event_type: str
-    task_id: str
-    idempotency_key: str
-    worker_id: str
-    payload: Dict[str, Any]
-    node_id: Optional[str] = None
-    project_id: Optional[str] = None
-    session_id: Optional[str] = None
-    summary: Optional[str] = None
-    sdk_version: str = "1.0.0"
-    trace_id: Optional[str] = None
+    """
+    JARVIS 이벤트 데이터
+
+    __slots__ 기반 (이벤트당 메모리/생성 비용 절감). encode() 결과를 캐시하므로
+    전송 / 배치 크기 계산 / outbox 저장에서 직렬화는 한 번만 일어납니다.
+    gzip 압축본도 캐시해 크기 확인 / 재시도 / 배치 크기 계산에서 다시 압축하지 않습니다.
+    생성 후에는 필드와 payload를 수정하지 않는다고 가정합니다.
+    """
+
+    __slots__ = (
+        "event_type", "task_id", "idempotency_key", "worker_id", "payload",
+        "node_id", "project_id", "session_id", "summary", "sdk_version", "trace_id",
+        "_encoded", "_gzipped",
+    )
+
+    # 직렬화 대상 필드 (순서 = JSON key 순서)
+    FIELDS = __slots__[:-2]
+
+    def __init__(
+        self,
+        event_type: str,
+        task_id: str,
+        idempotency_key: str,
+        worker_id: str,
+        payload: Dict[str, Any],
+        node_id: Optional[str] = None,
+        project_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        summary: Optional[str] = None,
+        sdk_version: str = "1.0.0",
+        trace_id: Optional[str] = None
+    ):
+        self.event_type = event_type
+        self.task_id = task_id
+        self.idempotency_key = idempotency_key
+        self.worker_id = worker_id
+        self.payload = payload
+        self.node_id = node_id
+        self.project_id = project_id
+        self.session_id = session_id
+        self.summary = summary
+        self.sdk_version = sdk_version
+        self.trace_id = trace_id
+        self._encoded: Optional[bytes] = None
+        self._gzipped: Optional[bytes] = None  # encode() 결과의 gzip 압축본
 
     def to_dict(self) -> Dict[str, Any]:
-        """딕셔너리 변환 (None 값 제외)"""
-        data = asdict(self)
-        return {k: v for k, v in data.items() if v is not None}
+        """딕셔너리 변환 (None 값 제외, payload는 복사하지 않음)"""
+        data = {}
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        return data
+
+    def encode(self) -> bytes:
+        """compact JSON bytes (최초 호출 시 직렬화 후 캐시)"""
+        if self._encoded is None:
+            self._encoded = dumps(self.to_dict())
+        return self._encoded
+
+    def encode_gzip(self) -> bytes:
+        """encode() 결과의 gzip 압축본 (최초 호출 시 압축 후 캐시)"""
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.encode(), mtime=0)
+        return self._gzipped
+
+    def _invalidate(self) -> None:
+        """payload 변경 후 캐시된 bytes 폐기"""
+        self._encoded = None
+        self._gzipped = None
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.FIELDS)
+
+    __hash__ = None  # payload(dict)를 포함하므로 hash 불가 (기존 dataclass와 동일)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"JarvisEvent({fields})"
 
 
 class JarvisClient:
@@ -50,27 +145,80 @@ class JarvisClient:
         """
         self.config = config or get_config()
         self.strict = strict
-        self._ensure_directories()
-
-    def _ensure_directories(self):
-        """필요한 디렉토리 생성"""
-        self.config.outbox_path.mkdir(parents=True, exist_ok=True)
-        (self.config.outbox_path / "pending").mkdir(exist_ok=True)
-        (self.config.outbox_path / "failed").mkdir(exist_ok=True)
-        self.config.log_path.mkdir(parents=True, exist_ok=True)
+        self.metrics = ClientMetrics(self)  # metrics.to_prometheus() / metrics.snapshot()
+        self._sender: Optional[BackgroundSender] = None
+        self._sender_lock = threading.Lock()
+        self.outbox: OutboxStore = create_outbox(self.config)
+        self._drainer = None  # OutboxDrainer (start_drainer()로 시작)
+        self.breaker = self._create_breaker()
+        # 최근 전송 완료된 key (endpoint별 공유, 재전송 / 여러 drainer의 중복 POST 방지)
+        self.acked_keys: AckedKeys = get_acked_keys(
+            self.config.api_base_url, self.config.ack_cache_size
+        )
+        self._log_sink = self._create_log_sink()
+        self._gzip_supported = True  # 서버가 415로 gzip을 거부하면 False
+        self._relay = self._create_relay()
+        # outbox / 로그 디렉토리는 첫 기록 시 생성 (클라이언트 생성 시 mkdir 없음)
+
+    def _create_breaker(self) -> CircuitBreaker:
+        """API endpoint별 공유 서킷 브레이커 (비활성화 시 항상 통과하는 개별 인스턴스)"""
+        if not self.config.breaker_enabled:
+            return CircuitBreaker(failure_threshold=float("inf"))
+        return get_breaker(
+            self.config.api_base_url,
+            failure_threshold=self.config.breaker_failure_threshold,
+            reset_timeout=self.config.breaker_reset_timeout,
+        )
+
+    def _create_relay(self):
+        """relay_socket이 설정되어 있으면 RelayClient 생성"""
+        if not self.config.relay_socket:
+            return None
+        # python -m jarvis_sdk.relay 실행 시 중복 import 경고를 피하기 위해 지연 import
+        try:
+            from .relay import RelayClient
+        except ImportError:
+            from relay import RelayClient
+        return RelayClient(
+            self.config.relay_socket,
+            timeout=self.config.relay_timeout,
+            retry_interval=self.config.relay_retry_interval,
+        )
+
+    def _create_log_sink(self) -> JsonlLogSink:
+        """로그 디렉토리별 공유 버퍼링 sink"""
+        max_file_mb = self.config.log_max_file_mb
+        return get_log_sink(
+            self.config.log_path,
+            buffer_size=self.config.log_buffer_size_kb * 1024,
+            flush_interval=self.config.log_flush_interval,
+            max_bytes=int(max_file_mb * 1024 * 1024) if max_file_mb else None,
+            background=self.config.log_background_writer,
+        )
 
     def generate_idempotency_key(
         self,
         worker_id: str,
         task_id: str,
         event_type: str,
-        sequence: Optional[int] = None
+        sequence: Optional[int] = None,
+        run_id: Optional[str] = None
     ) -> str:
-        """Idempotency Key 생성"""
-        timestamp = int(time.time())
+        """
+        Idempotency Key 생성
+
+        Args:
+            run_id: 태스크 실행 ID. 주면 같은 (run_id, event_type, sequence)에 항상 같은 key
+                (재시작한 프로세스의 재전송도 서버에서 중복 제거), 없으면 호출마다 새 ULID
+
+        Returns:
+            "{worker_id}:{task_id}:{event_type}:{run_id 또는 ULID}[:{sequence}]"
+            (같은 worker/task 안에서는 생성 시각 순으로 정렬됨)
+        """
+        key = f"{worker_id}:{task_id}:{event_type}:{run_id or ulid()}"
         if sequence is not None:
-            return f"{worker_id}:{task_id}:{event_type}:{timestamp}:{sequence}"
-        return f"{worker_id}:{task_id}:{event_type}:{timestamp}"
+            return f"{key}:{sequence}"
+        return key
 
     def send_event(self, event: JarvisEvent) -> Dict[str, Any]:
         """
@@ -79,20 +227,175 @@ class JarvisClient:
         Returns:
             {"status": "created", "event_id": "..."} 또는
             {"status": "duplicate", "event_id": "..."} 또는
-            {"status": "outboxed", "path": "..."} (실패 시)
+            {"status": "outboxed", "path": "..."} (실패 시) 또는
+            {"status": "queued", "idempotency_key": "..."} (async_delivery 모드) 또는
+            {"status": "relayed", "idempotency_key": "..."} (로컬 relay가 수락)
+        """
+        started = time.perf_counter()
+        mode = "sync"
+        result = None
+        if self._relay is not None:
+            result = self._submit_to_relay(event)
+            mode = "relay"
+        if result is None:
+            if self.config.async_delivery:
+                result = self._get_sender().submit(event)
+                mode = "queue"
+            else:
+                result = self._deliver(event)
+                mode = "sync"
+        self.metrics.caller_blocked.observe(time.perf_counter() - started, mode)
+        return result
+
+    def send_best_effort(self, event: JarvisEvent, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        재시도 / outbox 없이 1회만 전송 (heartbeat처럼 유실돼도 다음 이벤트가 대신하는 이벤트용)
+
+        relay가 설정되어 있으면 relay로 넘기고, 서킷이 open이면 시도하지 않습니다.
+        짧은 timeout으로 실패해도 서킷 실패 횟수에는 넣지 않습니다.
+
+        Args:
+            timeout: 요청 timeout (초, 기본 config.timeout_seconds)
+
+        Returns:
+            send_event와 같은 응답, 실패 시 {"status": "dropped", "error": "..."}
+        """
+        started = time.perf_counter()
+        result = self._submit_to_relay(event) if self._relay is not None else None
+        if result is None:
+            result = self._deliver_once(event, timeout)
+        self.metrics.record_delivery(event, result, started)
+        return result
+
+    def _deliver_once(self, event: JarvisEvent, timeout: Optional[float]) -> Dict[str, Any]:
+        """send_best_effort의 직접 전송 (1회)"""
+        if not self.breaker.allow_request():
+            error = "circuit open"
+        else:
+            try:
+                result = self._send_request(event, timeout)
+            except Exception as e:
+                self.breaker.release_probe()
+                error = str(e)
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            else:
+                self.breaker.record_success()
+                self._remember_ack(event, result)
+                self._log_event(event, "sent", result)
+                return result
+        self._log_event(event, "dropped", {"error": error})
+        return {"status": "dropped", "error": error}
+
+    def _submit_to_relay(self, event: JarvisEvent) -> Optional[Dict[str, Any]]:
+        """relay에 이벤트 전달 (relay가 없거나 거부하면 None → 직접 전송)"""
+        if not self._relay.submit(self._encode_event(event)):
+            return None
+        self._log_event(event, "relayed", {"socket": self._relay.socket_path})
+        self.metrics.events.inc(event.event_type, "relayed")
+        return {"status": "relayed", "idempotency_key": event.idempotency_key}
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        async_delivery 모드에서 큐에 쌓인 이벤트가 모두 처리될 때까지 대기 (로그 버퍼도 기록)
+
+        Returns:
+            True면 모두 처리 완료, False면 timeout
+        """
+        if self._sender is None:
+            self._log_sink.flush()
+            return True
+        done = self._sender.flush(timeout)
+        self._log_sink.flush()
+        return done
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        큐 drain 후 종료 (못 보낸 이벤트는 outbox 저장), drainer 정지, 로그 flush
+
+        공유 클라이언트(get_client)도 닫은 뒤 계속 사용할 수 있도록, 다음 비동기 전송 때
+        sender를 새로 만듭니다.
+        """
+        with self._sender_lock:
+            sender, self._sender = self._sender, None
+        if sender is not None:
+            sender.close(
+                self.config.flush_timeout_seconds if timeout is None else timeout
+            )
+        if self._drainer is not None:
+            self._drainer.stop(timeout)
+            self._drainer = None
+        if self._relay is not None:
+            self._relay.close()
+        # 공유 sink이므로 닫지 않고 버퍼만 기록
+        self._log_sink.flush()
+
+    def start_drainer(self, **kwargs):
         """
+        백그라운드 outbox drainer 시작 (이미 실행 중이면 그대로 반환)
+
+        Args:
+            **kwargs: OutboxDrainer 옵션 (workers, rate_limit, poll_interval, probe_interval)
+
+        Returns:
+            OutboxDrainer
+        """
+        # python -m jarvis_sdk.drain 실행 시 중복 import 경고를 피하기 위해 지연 import
+        try:
+            from .drain import OutboxDrainer
+        except ImportError:
+            from drain import OutboxDrainer
+
+        if self._drainer is None:
+            self._drainer = OutboxDrainer(self, **kwargs)
+        return self._drainer.start()
+
+    def _get_sender(self) -> BackgroundSender:
+        """BackgroundSender 생성 (최초 1회)"""
+        with self._sender_lock:
+            if self._sender is None:
+                self._sender = BackgroundSender(self, max_size=self.config.queue_max_size)
+            return self._sender
+
+    def _deliver(self, event: JarvisEvent) -> Dict[str, Any]:
+        """동기 전송 (결과 / 소요 시간을 메트릭에 기록)"""
+        started = time.perf_counter()
+        result = self._deliver_with_retry(event)
+        self.metrics.record_delivery(event, result, started)
+        return result
+
+    def _deliver_with_retry(self, event: JarvisEvent) -> Dict[str, Any]:
+        """동기 전송 (재시도 + Outbox fallback, 서킷 open 시 바로 outbox)"""
+        acked = self._acked_result(event)
+        if acked is not None:
+            return acked
+
         last_error = None
+        circuit_open = False
 
         # 재시도 루프
         for attempt in range(self.config.max_retries):
+            if attempt:
+                self.metrics.retries.inc(event.event_type)
+            if not self.breaker.allow_request():
+                # 서킷 open → 네트워크 시도 없이 바로 outbox
+                circuit_open = True
+                break
+
             try:
                 result = self._send_request(event)
+                self.breaker.record_success()
+                self._remember_ack(event, result)
                 self._log_event(event, "sent", result)
+                if self._drainer is not None:
+                    self._drainer.notify_success()
                 return result
 
-            except urllib.error.HTTPError as e:
+            except _http_error() as e:
                 if e.code < 500:
-                    # 4xx 에러는 재시도 안함
+                    # 4xx 에러는 재시도 안함 (API는 응답했으므로 breaker에는 성공)
+                    self.breaker.record_success()
                     error_body = e.read().decode('utf-8', errors='replace')
                     self._log_event(event, "client_error", {"code": e.code, "body": error_body})
                     if self.strict:
@@ -103,107 +406,509 @@ class JarvisClient:
                         outbox_path = self._save_to_outbox(event, f"HTTP {e.code}: {error_body}")
                         self._log_event(event, "outboxed_4xx", {"code": e.code, "path": str(outbox_path)})
                         return {"status": "outboxed", "path": str(outbox_path), "error_code": e.code}
+                self.breaker.record_failure()
                 last_error = e
 
             except Exception as e:
+                self.breaker.record_failure()
                 last_error = e
 
-            # 백오프
+            except BaseException:
+                # KeyboardInterrupt 등 → 결과 없음, half-open probe 슬롯 반환
+                self.breaker.release_probe()
+                raise
+
+            # 백오프 (서킷이 열렸으면 기다리지 않고 바로 outbox)
             if attempt < self.config.max_retries - 1:
+                if self.breaker.state == CircuitBreaker.OPEN:
+                    circuit_open = True
+                    break
                 backoff = self.config.retry_backoff_base * (2 ** attempt)
                 time.sleep(backoff)
 
+        if circuit_open:
+            error = f"circuit open (last error: {last_error})" if last_error else "circuit open"
+            outbox_path = self._save_to_outbox(event, error)
+            self._log_event(event, "outboxed_circuit_open", {"error": error, "path": str(outbox_path)})
+            return {"status": "outboxed", "path": str(outbox_path), "reason": "circuit_open"}
+
         # 모든 재시도 실패 → Outbox 저장
         outbox_path = self._save_to_outbox(event, str(last_error))
         self._log_event(event, "outboxed", {"error": str(last_error), "path": str(outbox_path)})
 
         return {"status": "outboxed", "path": str(outbox_path)}
 
-    def _send_request(self, event: JarvisEvent) -> Dict[str, Any]:
-        """HTTP 요청 전송"""
-        url = f"{self.config.api_base_url}/jarvis/events"
-        data = json.dumps(event.to_dict()).encode('utf-8')
+    def send_batch(self, events: List[JarvisEvent]) -> List[Dict[str, Any]]:
+        """
+        여러 이벤트를 한 번의 요청으로 전송 (재시도 + Outbox fallback)
+
+        서버가 배치를 거부하면(4xx) 개별 전송으로 fallback합니다.
+
+        Returns:
+            이벤트 순서대로 send_event와 같은 형식의 결과 리스트
+        """
+        if len(events) == 1:
+            return [self._deliver(events[0])]
+
+        acked = [self._acked_result(event) for event in events]
+        if any(result is not None for result in acked):
+            # 이미 전송 완료된 이벤트는 빼고 전송
+            remaining = [event for event, result in zip(events, acked) if result is None]
+            sent = iter(self.send_batch(remaining) if remaining else [])
+            return [result if result is not None else next(sent) for result in acked]
+
+        started = time.perf_counter()
+        last_error = None
+        action = "outboxed"
+
+        for attempt in range(self.config.max_retries):
+            if attempt:
+                for event in events:
+                    self.metrics.retries.inc(event.event_type)
+            if not self.breaker.allow_request():
+                action = "outboxed_circuit_open"
+                break
 
+            try:
+                response = self._send_batch_request(events)
+                self.breaker.record_success()
+                if self._drainer is not None:
+                    self._drainer.notify_success()
+                return self._map_batch_results(events, response, started)
+
+            except _http_error() as e:
+                if e.code < 500:
+                    # 배치 엔드포인트 미지원/거부 → 이벤트별 전송
+                    self.breaker.record_success()
+                    error_body = e.read().decode('utf-8', errors='replace')
+                    for event in events:
+                        self._log_event(event, "batch_rejected", {"code": e.code, "body": error_body})
+                    return [self._deliver(event) for event in events]
+                self.breaker.record_failure()
+                last_error = e
+
+            except Exception as e:
+                self.breaker.record_failure()
+                last_error = e
+
+            except BaseException:
+                # KeyboardInterrupt 등 → 결과 없음, half-open probe 슬롯 반환
+                self.breaker.release_probe()
+                raise
+
+            # 백오프 (서킷이 열렸으면 기다리지 않고 바로 outbox)
+            if attempt < self.config.max_retries - 1:
+                if self.breaker.state == CircuitBreaker.OPEN:
+                    action = "outboxed_circuit_open"
+                    break
+                backoff = self.config.retry_backoff_base * (2 ** attempt)
+                time.sleep(backoff)
+
+        # 모든 재시도 실패 → 이벤트별 Outbox 저장
+        error = str(last_error) if last_error else "circuit open"
+        results = []
+        for event in events:
+            outbox_path = self._save_to_outbox(event, error)
+            self._log_event(event, action, {"error": error, "path": str(outbox_path)})
+            results.append({"status": "outboxed", "path": str(outbox_path)})
+            self.metrics.record_delivery(event, results[-1], started)
+        return results
+
+    def _map_batch_results(
+        self,
+        events: List[JarvisEvent],
+        response: Dict[str, Any],
+        started: float
+    ) -> List[Dict[str, Any]]:
+        """배치 응답을 이벤트별 결과로 매핑 (응답에 없거나 실패한 이벤트는 개별 재전송)"""
+        by_key = {
+            item.get("idempotency_key"): item
+            for item in response.get("results", [])
+        }
+
+        results = []
+        for event in events:
+            result = by_key.get(event.idempotency_key)
+            if result is not None and result.get("status") in ("created", "duplicate"):
+                self._remember_ack(event, result)
+                self._log_event(event, "sent_batch", result)
+                self.metrics.record_delivery(event, result, started)
+                results.append(result)
+            else:
+                results.append(self._deliver(event))
+        return results
+
+    def _acked_result(self, event: JarvisEvent) -> Optional[Dict[str, Any]]:
+        """최근 전송 완료된 이벤트면 POST 없이 돌려줄 결과 (아니면 None)"""
+        result = self._lookup_ack(event)
+        if result is not None:
+            self._log_event(event, "deduped", result)
+        return result
+
+    def _lookup_ack(self, event: JarvisEvent) -> Optional[Dict[str, Any]]:
+        """_acked_result에서 로그 기록만 뺀 조회 (메모리만 사용)"""
+        result = self.acked_keys.get(event.idempotency_key)
+        if result is not None:
+            self.metrics.deduped.inc()
+        return result
+
+    def _remember_ack(self, event: JarvisEvent, result: Dict[str, Any]) -> None:
+        """서버가 수락한 key 기록"""
+        if result.get("status") in ("created", "duplicate"):
+            self.acked_keys.add(event.idempotency_key, result.get("event_id"))
+
+    def _encode_event(self, event: JarvisEvent) -> bytes:
+        """이벤트 JSON 인코딩 (크기 제한 적용, 이벤트에 캐시된 bytes 재사용)"""
+        truncated = self._fit_payload(event)
+        if truncated is not None:
+            self._log_event(event, "truncated", truncated)
+        return event.encode()
+
+    def _fit_payload(self, event: JarvisEvent) -> Optional[Dict[str, int]]:
+        """
+        payload_max_size_kb 초과 이벤트의 payload를 축약 (이벤트를 직접 수정)
+
+        실제로 gzip 전송될 크기(gzip_threshold_kb 이상, 서버가 gzip 지원)이고 압축 후 상한 이내면
+        그대로 두고, 아니면 traceback 앞/뒤 보존 등 결정적 규칙으로 줄인 뒤 payload["truncated"] 마커를 붙입니다.
+
+        Returns:
+            축약했으면 truncated 로그 details ({"original_bytes", "bytes"}), 아니면 None
+        """
+        max_bytes = self.config.payload_max_size_kb * 1024
+        data = event.encode()
+        if len(data) <= max_bytes:
+            return None
+        min_bytes = self._gzip_min_bytes()
+        if (
+            min_bytes is not None
+            and len(data) >= min_bytes
+            and len(event.encode_gzip()) <= max_bytes
+        ):
+            return None
+
+        base = event.to_dict()
+        event.payload = fit_payload(
+            event.payload, max_bytes, lambda payload: len(dumps({**base, "payload": payload}))
+        )
+        event._invalidate()
+        return {"original_bytes": len(data), "bytes": len(event.encode())}
+
+    def _gzip_min_bytes(self) -> Optional[int]:
+        """gzip 압축 기준 크기 (압축 비활성화 시 None)"""
+        if self.config.gzip_threshold_kb is None or not self._gzip_supported:
+            return None
+        return int(self.config.gzip_threshold_kb * 1024)
+
+    def _request_body(self, data: bytes, event: Optional[JarvisEvent] = None):
+        """
+        요청 body + 헤더 (gzip_threshold_kb 이상이면 gzip)
+
+        Args:
+            data: JSON body
+            event: data가 이 이벤트의 encode() 결과면 캐시된 gzip 압축본 사용
+
+        Returns:
+            (body, headers, compressed)
+        """
         headers = {
             "Content-Type": "application/json",
             "X-Jarvis-API-Key": self.config.api_key or "",
         }
+        min_bytes = self._gzip_min_bytes()
+        if min_bytes is not None and len(data) >= min_bytes:
+            headers["Content-Encoding"] = "gzip"
+            if event is not None:
+                return event.encode_gzip(), headers, True
+            return gzip.compress(data, mtime=0), headers, True
+        return data, headers, False
+
+    def _send_batch_request(self, events: List[JarvisEvent]) -> Dict[str, Any]:
+        """배치 HTTP 요청 전송"""
+        url = f"{self.config.api_base_url}/jarvis/events/batch"
+        return self._post(
+            url, lambda: b'{"events":[' + b",".join(self._encode_event(e) for e in events) + b"]}"
+        )
+
+    def _send_request(self, event: JarvisEvent, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """HTTP 요청 전송"""
+        url = f"{self.config.api_base_url}/jarvis/events"
+        return self._post(url, lambda: self._encode_event(event), event, timeout)
+
+    def _post(
+        self,
+        url: str,
+        encode: Callable[[], bytes],
+        event: Optional[JarvisEvent] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        JSON POST 요청 (gzip을 415로 거부하면 이후 압축 없이 전송)
+
+        Args:
+            encode: 요청 body 생성 함수. 415 후 다시 호출해 압축 전제로 남겨둔 큰 payload를 축약
+            event: 단건 전송이면 해당 이벤트 (캐시된 gzip 압축본 재사용)
+            timeout: 요청 timeout (초, 기본 config.timeout_seconds)
+        """
+        body, headers, compressed = self._request_body(encode(), event)
+        try:
+            return self._post_body(url, body, headers, timeout)
+        except _http_error() as e:
+            if not (compressed and e.code == 415):
+                raise
+            self._gzip_supported = False
+            body, headers, _ = self._request_body(encode())
+            return self._post_body(url, body, headers, timeout)
+
+    def _post_body(
+        self, url: str, data: bytes, headers: Dict[str, str], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """POST 요청 전송 + JSON 응답 파싱 (요청 수 / 전송 바이트 기록)"""
+        self.metrics.bytes_sent.inc(amount=len(data))
+        try:
+            result = self._post_body_request(url, data, headers, timeout)
+        except _http_error() as e:
+            self.metrics.requests.inc(str(e.code))
+            raise
+        except Exception:
+            self.metrics.requests.inc("error")
+            raise
+        self.metrics.requests.inc("200")
+        return result
+
+    def _post_body_request(
+        self, url: str, data: bytes, headers: Dict[str, str], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """POST 요청 전송 + JSON 응답 파싱 (프록시 대상 host는 keep-alive 풀 대신 urlopen)"""
+        timeout = timeout or self.config.timeout_seconds
+        if self.config.keep_alive and not uses_proxy(url):
+            status, reason, response_headers, body = get_pool().request(
+                "POST", url, body=data, headers=headers, timeout=timeout
+            )
+            if status >= 400:
+                # urlopen과 동일한 예외로 변환 (재시도/4xx 처리 공유)
+                raise _http_error()(url, status, reason, response_headers, io.BytesIO(body))
+            return json.loads(body.decode('utf-8'))
+
+        import urllib.request
 
         request = urllib.request.Request(url, data=data, headers=headers, method="POST")
 
-        with urllib.request.urlopen(request, timeout=self.config.timeout_seconds) as response:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
             return json.loads(response.read().decode('utf-8'))
 
-    def _save_to_outbox(self, event: JarvisEvent, error: str) -> Path:
-        """Outbox에 이벤트 저장"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        filename = f"{timestamp}_{event.idempotency_key.replace(':', '_')}.json"
-        filepath = self.config.outbox_path / "pending" / filename
-
-        outbox_data = {
-            "event": event.to_dict(),
-            "error": error,
-            "created_at": datetime.now().isoformat(),
-            "_retry_count": 0
-        }
-
-        filepath.write_text(json.dumps(outbox_data, ensure_ascii=False, indent=2))
-        return filepath
+    def _save_to_outbox(self, event: JarvisEvent, error: str) -> str:
+        """Outbox에 이벤트 저장. 저장 위치 반환"""
+        encoded = self._encode_event(event)
+        self.metrics.outbox_writes.inc()
+        return self.outbox.add(event.to_dict(), error, encoded=encoded)
 
     def _log_event(self, event: JarvisEvent, action: str, details: Dict[str, Any]):
         """이벤트 로깅"""
+        self._log_sink.write(self._log_line(event, action, details))
+
+    def _log_line(self, event: JarvisEvent, action: str, details: Dict[str, Any]) -> bytes:
+        """로그 한 줄 (JSON)"""
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now().isoformat(),  # 날짜별 파일 선택은 sink가 담당
             "action": action,
             "event_type": event.event_type,
             "task_id": event.task_id,
             "idempotency_key": event.idempotency_key,
             "details": details
         }
+        return dumps(log_entry)
 
-        log_file = self.config.log_path / f"jarvis_sdk_{datetime.now().strftime('%Y%m%d')}.jsonl"
-        with open(log_file, "a") as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+    def retry_outbox(
+        self,
+        workers: int = 1,
+        rate_limit: Optional[float] = None,
+        progress: Optional[Callable[[Dict[str, int]], None]] = None,
+        force: bool = False
+    ) -> Dict[str, int]:
+        """
+        Outbox에 있는 이벤트 재전송
 
-    def retry_outbox(self) -> Dict[str, int]:
-        """Outbox에 있는 이벤트 재전송"""
-        pending_dir = self.config.outbox_path / "pending"
-        failed_dir = self.config.outbox_path / "failed"
+        이벤트를 태스크별로 묶어 생성 순서대로 보내고(task_started → task_completed),
+        서로 다른 태스크는 workers개 스레드에서 병렬로 재전송합니다.
+        앞선 이벤트가 실패하면 같은 태스크의 나머지 이벤트는 다음 재시도로 미룹니다.
+        실패한 이벤트는 지수 백오프 + jitter로 다음 재전송 시각(next_attempt_at)이 예약되며,
+        예약 시각이 지난 이벤트만 재전송합니다.
 
-        stats = {"success": 0, "failed": 0, "skipped": 0}
+        Args:
+            workers: 병렬 재전송 스레드 수
+            rate_limit: 초당 최대 요청 수 (None이면 제한 없음)
+            progress: 이벤트 하나를 처리할 때마다 호출 (현재 stats 사본 전달)
+            force: True면 예약 시각을 무시하고 모든 대기 이벤트 재전송 (연결 복구 직후 등)
 
-        for filepath in pending_dir.glob("*.json"):
-            try:
-                data = json.loads(filepath.read_text())
-                retry_count = data.get("_retry_count", 0)
+        Returns:
+            {"success": n, "failed": n, "skipped": n, "deferred": n, "total": n}
+        """
+        self._migrate_legacy_outbox()
+        due_before = None if force else time.time()
+        groups = self._group_outbox_entries(self.outbox.pending(due_before=due_before))
+
+        stats = {"success": 0, "failed": 0, "skipped": 0, "deferred": 0}
+        stats["total"] = sum(len(entries) for entries in groups)
+        stats_lock = threading.Lock()
+        limiter = TokenBucket(rate_limit) if rate_limit else None
+
+        def record(outcome: str, count: int = 1):
+            self.metrics.outbox_replays.inc(outcome, amount=count)
+            with stats_lock:
+                stats[outcome] += count
+                snapshot = dict(stats)
+            if progress is not None:
+                progress(snapshot)
+
+        def replay_group(entries: List[OutboxEntry]):
+            for index, entry in enumerate(entries):
+                outcome = self._replay_outbox_entry(entry, limiter)
+                record(outcome)
+                if outcome in ("failed", "deferred") and index + 1 < len(entries):
+                    # 순서 보장: 앞선 이벤트 실패 시 같은 태스크의 나머지는 보류
+                    record("deferred", len(entries) - index - 1)
+                    return
+
+        if workers <= 1 or len(groups) <= 1:
+            for entries in groups:
+                replay_group(entries)
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jarvis-replay") as pool:
+                list(pool.map(replay_group, groups))
+
+        self.outbox.compact()
+        return stats
 
-                if retry_count >= self.config.max_retries:
-                    # 최대 재시도 초과 → failed로 이동
-                    failed_path = failed_dir / filepath.name
-                    filepath.rename(failed_path)
-                    stats["skipped"] += 1
-                    continue
+    def _migrate_legacy_outbox(self) -> None:
+        """다른 백엔드 사용 시 남아있는 파일 포맷(pending/*.json) 이벤트를 이전"""
+        if isinstance(self.outbox, FileOutbox):
+            return
+        legacy = FileOutbox(self.config.outbox_path)
+        if legacy.pending_dir.exists() and legacy.count():
+            migrate_outbox(legacy, self.outbox)
+
+    def _group_outbox_entries(self, entries: List[OutboxEntry]) -> List[List[OutboxEntry]]:
+        """outbox 이벤트를 task_id별로 묶기 (생성 순서 유지)"""
+        groups: Dict[str, List[OutboxEntry]] = {}
+        for entry in entries:
+            groups.setdefault(entry.task_id, []).append(entry)
+        return list(groups.values())
+
+    def _replay_outbox_entry(self, entry: OutboxEntry, limiter: Optional[TokenBucket]) -> str:
+        """
+        outbox 이벤트 1건 재전송
 
-                event = JarvisEvent(**data["event"])
+        Returns:
+            "success", "failed", "skipped" (최대 재시도 초과 → failed로 이동),
+            "deferred" (서킷 open이거나 다른 drainer / 프로세스가 선점해 시도하지 않음)
+        """
+        max_retries = self.config.outbox_max_retries
+        if max_retries is None:
+            max_retries = self.config.max_retries
+
+        if entry.retry_count >= max_retries:
+            # 최대 재시도 초과 → failed로 이동 (선점한 drainer 하나만 이동)
+            if not self.outbox.claim(entry, self.config.outbox_lease_seconds):
+                return "deferred"
+            self.outbox.dead_letter(entry)
+            return "skipped"
+
+        event = JarvisEvent(**entry.event)
+        if self._acked_result(event) is not None:
+            # 이미 전송 완료 (ack 전에 중단된 경우 등) → POST 없이 제거
+            self.outbox.ack(entry)
+            return "success"
+
+        if limiter is not None:
+            limiter.acquire()
+
+        if not self.outbox.claim(entry, self.config.outbox_lease_seconds):
+            # 다른 drainer / 프로세스가 전송 중
+            return "deferred"
+
+        if not self.breaker.allow_request():
+            # 서킷 open → 시도하지 않고 다음 재전송으로 미룸 (retry_count 유지)
+            self.outbox.release(entry)
+            return "deferred"
+
+        try:
+            try:
                 result = self._send_request(event)
-
-                if result.get("status") in ("created", "duplicate"):
-                    filepath.unlink()  # 성공 시 삭제
-                    stats["success"] += 1
+            except _http_error() as e:
+                if e.code < 500:
+                    self.breaker.record_success()
                 else:
-                    raise Exception(f"Unexpected response: {result}")
-
-            except Exception as e:
-                # 재시도 카운트 증가
-                data["_retry_count"] = data.get("_retry_count", 0) + 1
-                data["last_error"] = str(e)
-                data["last_retry"] = datetime.now().isoformat()
-                filepath.write_text(json.dumps(data, ensure_ascii=False, indent=2))
-                stats["failed"] += 1
-
-        return stats
+                    self.breaker.record_failure()
+                raise
+            except Exception:
+                self.breaker.record_failure()
+                raise
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            self.breaker.record_success()
+
+            if result.get("status") in ("created", "duplicate"):
+                self._remember_ack(event, result)
+                self.outbox.ack(entry)  # 성공 시 삭제
+                return "success"
+            raise Exception(f"Unexpected response: {result}")
+
+        except Exception as e:
+            # 재시도 카운트 증가 + 다음 재전송 시각 예약
+            self.outbox.record_failure(
+                entry, str(e), next_attempt_at=time.time() + self._outbox_backoff(entry.retry_count)
+            )
+            return "failed"
+
+    def _outbox_backoff(self, retry_count: int) -> float:
+        """outbox 재전송 대기 시간 (지수 백오프, 상한, equal jitter)"""
+        delay = min(
+            self.config.outbox_backoff_max,
+            self.config.outbox_backoff_base * (2 ** retry_count)
+        )
+        return delay / 2 + random.uniform(0, delay / 2)
 
 
 class JarvisAPIError(Exception):
     """JARVIS API 오류"""
     pass
+
+
+# 설정 값별 공유 클라이언트 (JarvisTask가 태스크마다 새로 만들지 않도록)
+# 요청마다 config를 새로 만드는 호출자가 있어도 무한히 쌓이지 않도록 최근 사용한 것만 보관 (LRU)
+MAX_SHARED_CLIENTS = 32
+_clients: "OrderedDict[Tuple[Any, ...], JarvisClient]" = OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def get_client(config: Optional[JarvisConfig] = None, strict: bool = False) -> JarvisClient:
+    """
+    설정별 프로세스 공유 JarvisClient 반환 (없으면 생성)
+
+    필드 값이 같은 JarvisConfig와 strict 조합이면 같은 클라이언트를 돌려주므로
+    연결 / 비동기 큐 / 서킷 / outbox 상태가 태스크 사이에 유지됩니다.
+    공유 클라이언트는 등록 시점 config의 사본을 사용합니다 (이후 원본을 바꿔도 영향 없음).
+    최근 사용한 MAX_SHARED_CLIENTS개 설정까지만 보관하며, 밀려난 클라이언트는 닫지 않으므로
+    이미 받아간 태스크는 그대로 사용하고 참조가 사라지면 정리됩니다.
+
+    Args:
+        config: JarvisConfig (None이면 전역 설정)
+        strict: True면 4xx 에러에서 예외 발생
+
+    Returns:
+        공유 JarvisClient
+    """
+    config = config or get_config()
+    key = (strict,) + tuple(getattr(config, f.name) for f in dataclasses.fields(config))
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = JarvisClient(dataclasses.replace(config), strict=strict)
+            while len(_clients) > MAX_SHARED_CLIENTS:
+                _clients.popitem(last=False)
+        else:
+            _clients.move_to_end(key)
+        return client
@@ -26,10 +26,39 @@ class JarvisConfig:
     # 타임아웃
     timeout_seconds: int = 30
 
+    # 로컬 relay (python -m jarvis_sdk.relay) UNIX 소켓 경로. 설정 시 이벤트를 relay에 넘기고,
+    # relay가 없거나 응답하지 않으면 직접 전송
+    relay_socket: Optional[str] = field(
+        default_factory=lambda: os.environ.get("JARVIS_RELAY_SOCKET")
+    )
+    relay_timeout: float = 1.0
+    relay_retry_interval: float = 5.0
+
+    # 서킷 브레이커 (API 장애 시 재시도 없이 바로 outbox)
+    breaker_enabled: bool = True
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+
+    # 연결 설정 (True면 호스트별 keep-alive 연결 재사용)
+    keep_alive: bool = True
+
     # 재시도 설정
     max_retries: int = 3
     retry_backoff_base: float = 1.0  # 1초, 2초, 4초
 
+    # 비동기 전송 설정 (True면 send_event가 큐에 넣고 즉시 반환)
+    async_delivery: bool = False
+    queue_max_size: int = 1000
+    flush_timeout_seconds: float = 5.0  # 종료 시 drain 대기 시간
+
+    # 배치 전송 설정 (async_delivery 모드, 1이면 배치 안함)
+    # 배치 크기는 payload_max_size_kb 이내로 제한
+    batch_max_events: int = 1
+    batch_linger_ms: int = 50
+
+    # AsyncJarvisClient 동시 요청 수 상한
+    async_max_in_flight: int = 16
+
     # Outbox 설정
     outbox_path: Path = field(
         default_factory=lambda: Path(
@@ -37,6 +66,40 @@ class JarvisConfig:
         )
     )
 
+    # Outbox 백엔드: "file" (이벤트당 JSON 파일, 기본) | "segment" (append-only 세그먼트 로그)
+    #               | "sqlite" (WAL, 여러 프로세스 공유 가능)
+    outbox_backend: str = "file"
+    outbox_segment_max_bytes: int = 4 * 1024 * 1024
+    outbox_fsync_batch: int = 64
+    outbox_fsync_interval: float = 1.0
+
+    # Outbox 재전송 스케줄 (지수 백오프 + jitter)
+    outbox_max_retries: Optional[int] = None  # None이면 max_retries 사용
+    outbox_backoff_base: float = 5.0
+    outbox_backoff_max: float = 600.0
+    outbox_lease_seconds: float = 120.0  # 재전송 선점 유지 시간 (넘으면 다른 drainer가 가져감)
+
+    # 최근 전송 완료된 idempotency key 수 (이미 보낸 이벤트는 POST 생략, 0이면 사용 안 함)
+    ack_cache_size: int = 10000
+
+    # Artifact 저장소 (complete() 결과 중 큰 값은 여기 저장하고 digest만 전송)
+    artifact_path: Path = field(
+        default_factory=lambda: Path(
+            os.environ.get("JARVIS_ARTIFACT_PATH", ".jarvis/artifacts")
+        )
+    )
+    artifact_backend: str = "local"
+    artifact_threshold_kb: Optional[float] = 8.0  # None이면 자동 저장 안 함
+
+    # PM 측 구독 (JarvisSubscriber): 받은 이벤트를 append할 inbox (cursor는 <inbox>.cursor에 저장)
+    inbox_path: Path = field(
+        default_factory=lambda: Path(
+            os.environ.get("JARVIS_INBOX_PATH", ".jarvis/inbox.jsonl")
+        )
+    )
+    subscribe_batch_size: int = 100      # 요청당 최대 이벤트 수 (inbox에 한 번에 append하는 단위)
+    subscribe_poll_timeout: float = 25.0  # long-poll 대기 시간 (초, 새 이벤트가 오면 즉시 응답)
+
     # 로그 설정
     log_path: Path = field(
         default_factory=lambda: Path(
@@ -44,8 +107,32 @@ class JarvisConfig:
         )
     )
 
-    # Payload 제한
+    # 태스크 progress / log 전송 빈도 제한 (초당 이벤트 수, 초과분은 최신 값만 보류)
+    progress_rate_limit: float = 1.0
+    log_rate_limit: Optional[float] = None  # None이면 info/debug 로그도 매번 전송
+
+    # task.span() 요약 크기 (task_completed / task_blocked payload.spans)
+    span_max_records: int = 20   # 개별 span 기록 수 (소요 시간 상위)
+    span_max_paths: int = 50     # 경로별 집계 수
+
+    # 태스크 자원 사용량 (start() ~ complete()/blocked() 구간 CPU / RSS / context switch / I/O → payload.resources)
+    resource_profile: bool = False
+    resource_sample_interval: Optional[float] = None  # 현재 RSS 샘플링 주기 (초, None이면 샘플링 스레드 없음)
+
+    # 장시간 태스크 heartbeat (task_heartbeat 이벤트, None이면 사용 안 함 - task.start_heartbeat()로 태스크별 시작 가능)
+    heartbeat_interval: Optional[float] = None   # 기본 주기 (초, progress가 멈추면 이 주기로 복귀)
+    heartbeat_max_interval: float = 300.0        # progress가 꾸준할 때 늘어나는 주기 상한 (초)
+    heartbeat_timeout: float = 2.0               # heartbeat 1회 전송 timeout (초, 재시도 / outbox 없음)
+
+    # 로그 버퍼링 / 로테이션
+    log_buffer_size_kb: int = 64           # 버퍼가 이 크기를 넘으면 flush
+    log_flush_interval: float = 1.0        # 마지막 flush 후 이 시간(초)이 지나면 flush
+    log_max_file_mb: Optional[float] = None  # 파일당 최대 크기 (None이면 날짜 단위로만 로테이션)
+    log_background_writer: bool = False    # True면 파일 기록을 writer 스레드가 담당
+
+    # Payload 제한 (전송되는 이벤트 크기 상한, 넘으면 gzip → 그래도 크면 결정적으로 축약)
     payload_max_size_kb: int = 10
+    gzip_threshold_kb: Optional[float] = None  # 이 크기 이상인 요청 body는 gzip (None이면 압축 안 함)
 
     # 스키마 버전
     schema_version: str = "1.0"
@@ -57,6 +144,10 @@ class JarvisConfig:
             self.outbox_path = Path(self.outbox_path)
         if isinstance(self.log_path, str):
             self.log_path = Path(self.log_path)
+        if isinstance(self.artifact_path, str):
+            self.artifact_path = Path(self.artifact_path)
+        if isinstance(self.inbox_path, str):
+            self.inbox_path = Path(self.inbox_path)
 
     def validate(self) -> bool:
         """설정 유효성 검사"""
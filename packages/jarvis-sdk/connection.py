@@ -0,0 +1,194 @@
+"""
+JARVIS Connection Pool - keep-alive HTTP 연결 재사용
+"""
+
+import functools
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# http.client(ssl 포함) / urllib은 첫 요청 시 import (import jarvis_sdk 비용 절감)
+
+# (scheme, host, port)
+PoolKey = Tuple[str, str, int]
+
+
+class ConnectionPool:
+    """
+    호스트별 keep-alive HTTP(S) 연결 풀 (thread-safe, 표준 라이브러리만 사용)
+
+    - 요청이 끝난 연결은 idle 목록으로 반환되어 다음 요청에서 재사용
+    - 서버가 idle 연결을 닫은 경우 새 연결로 1회 재시도
+      (이벤트는 idempotency key로 dedupe되므로 재전송해도 안전)
+    """
+
+    def __init__(self, max_idle_per_host: int = 4):
+        """
+        Args:
+            max_idle_per_host: 호스트별로 보관할 최대 idle 연결 수
+        """
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[PoolKey, List["http.client.HTTPConnection"]] = {}
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30
+    ) -> Tuple[int, str, "http.client.HTTPMessage", bytes]:
+        """
+        HTTP 요청 전송
+
+        Returns:
+            (status, reason, headers, body)
+        """
+        import http.client
+        from urllib.parse import urlsplit
+
+        parts = urlsplit(url)
+        key = self._key(parts.scheme, parts.hostname or "", parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        while True:
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                response = conn.getresponse()
+                data = response.read()
+            except (ConnectionError, http.client.HTTPException):
+                conn.close()
+                if reused:
+                    # 서버가 닫은 keep-alive 연결 → 새 연결로 재시도
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return response.status, response.reason, response.msg, data
+
+    def close(self) -> None:
+        """모든 idle 연결 종료"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def idle_count(self) -> int:
+        """현재 idle 연결 수"""
+        with self._lock:
+            return sum(len(conns) for conns in self._idle.values())
+
+    @staticmethod
+    def _key(scheme: str, host: str, port: Optional[int]) -> PoolKey:
+        """풀 키 생성"""
+        scheme = scheme.lower()
+        if port is None:
+            port = 443 if scheme == "https" else 80
+        return scheme, host, port
+
+    def _acquire(
+        self,
+        key: PoolKey,
+        timeout: float
+    ) -> Tuple["http.client.HTTPConnection", bool]:
+        """idle 연결을 꺼내거나 새로 생성. (연결, 재사용 여부) 반환"""
+        with self._lock:
+            conns = self._idle.get(key)
+            conn = conns.pop() if conns else None
+
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+
+        import http.client
+
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout), False
+        return http.client.HTTPConnection(host, port, timeout=timeout), False
+
+    def _release(self, key: PoolKey, conn: "http.client.HTTPConnection") -> None:
+        """연결을 idle 목록으로 반환 (한도 초과 시 종료)"""
+        with self._lock:
+            conns = self._idle.setdefault(key, [])
+            if len(conns) < self.max_idle_per_host:
+                conns.append(conn)
+                return
+        conn.close()
+
+
+# 프로세스 전역 공유 풀
+_shared_pool: Optional[ConnectionPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """프로세스 전역 연결 풀 가져오기"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = ConnectionPool()
+        return _shared_pool
+
+
+def uses_proxy(url: str) -> bool:
+    """
+    url이 urllib 프록시 설정(HTTP_PROXY / HTTPS_PROXY, NO_PROXY 예외, macOS / Windows 시스템 설정) 대상인지
+
+    keep-alive 풀은 프록시를 거치지 않으므로, True인 요청은 urlopen으로 보냅니다.
+    결과는 scheme + host별로 캐시됩니다 (실행 중 프록시 설정을 바꾸면 clear_proxy_cache()).
+    """
+    from urllib.parse import urlsplit
+
+    parts = urlsplit(url)
+    return _host_uses_proxy(parts.scheme.lower(), parts.netloc)
+
+
+@functools.lru_cache(maxsize=64)
+def _host_uses_proxy(scheme: str, netloc: str) -> bool:
+    import urllib.request
+
+    if scheme not in urllib.request.getproxies():
+        return False
+    return not urllib.request.proxy_bypass(netloc)
+
+
+def clear_proxy_cache() -> None:
+    """uses_proxy 캐시 초기화 (프록시 환경변수 변경 후)"""
+    _host_uses_proxy.cache_clear()
+
+
+def urlopen_request(
+    method: str,
+    url: str,
+    body: Optional[bytes] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 30
+) -> Tuple[int, str, "http.client.HTTPMessage", bytes]:
+    """
+    urlopen(프록시 설정 적용)으로 요청 전송 - ConnectionPool.request와 같은 반환 형식
+
+    Returns:
+        (status, reason, headers, body) (4xx / 5xx도 예외 없이 반환)
+    """
+    import urllib.error
+    import urllib.request
+
+    request = urllib.request.Request(url, data=body, headers=headers or {}, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, response.reason, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.reason, e.headers, e.read()
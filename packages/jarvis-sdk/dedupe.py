@@ -0,0 +1,77 @@
+"""
+JARVIS Dedupe - 최근 전송 완료된 idempotency key LRU
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class AckedKeys:
+    """
+    서버가 수락(created / duplicate)한 idempotency key의 bounded LRU (thread-safe)
+
+    같은 이벤트를 다시 보내려 할 때(outbox 재전송, 여러 drainer, 재실행된 태스크 등)
+    POST 없이 이전 결과를 돌려주기 위해 사용합니다.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        """
+        Args:
+            maxsize: 보관할 최대 key 수 (0이면 아무것도 보관하지 않음)
+        """
+        self.maxsize = maxsize
+        self._keys: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, key: str, event_id: Optional[str] = None) -> None:
+        """전송 완료 기록"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._keys[key] = event_id
+            self._keys.move_to_end(key)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        전송 완료된 key면 서버 duplicate 응답과 같은 형식의 결과 반환
+
+        Returns:
+            {"status": "duplicate", "idempotency_key": .., "event_id": ..} 또는 None
+        """
+        with self._lock:
+            if key not in self._keys:
+                return None
+            self._keys.move_to_end(key)
+            event_id = self._keys[key]
+        return {"status": "duplicate", "idempotency_key": key, "event_id": event_id}
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._keys
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._keys)
+
+
+# API endpoint별 공유 LRU (같은 프로세스의 클라이언트 / drainer가 함께 사용)
+_registry: Dict[str, AckedKeys] = {}
+_registry_lock = threading.Lock()
+
+
+def get_acked_keys(endpoint: str, maxsize: int = 10000) -> AckedKeys:
+    """
+    endpoint별 공유 AckedKeys 반환 (없으면 생성)
+
+    maxsize는 최초 생성 시에만 적용됩니다. 0이면 공유하지 않는 빈 인스턴스를 반환합니다.
+    """
+    if maxsize <= 0:
+        return AckedKeys(0)
+    with _registry_lock:
+        acked = _registry.get(endpoint)
+        if acked is None:
+            acked = _registry[endpoint] = AckedKeys(maxsize)
+        return acked
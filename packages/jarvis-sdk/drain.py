@@ -0,0 +1,195 @@
+"""
+JARVIS Outbox Drainer - 백그라운드 outbox 재전송
+
+Usage:
+    # 프로세스 내 스레드
+    client = JarvisClient()
+    client.start_drainer()
+
+    # 독립 프로세스
+    python -m jarvis_sdk.drain            # 계속 실행 (Ctrl+C로 종료)
+    python -m jarvis_sdk.drain --once     # 한 번만 재전송 후 종료
+"""
+
+import argparse
+import json
+import signal
+import socket
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+
+class OutboxDrainer:
+    """
+    outbox를 주기적으로 비우는 daemon 스레드
+
+    - 다음 재전송 예약 시각(next_attempt_at)까지 대기 후 retry_outbox() 실행
+    - 재전송이 전부 실패하면 offline 모드로 전환하고 probe_interval마다 API 연결을 확인
+    - 연결이 복구되면(probe 성공 또는 라이브 전송 성공) 예약 시각을 무시하고 즉시 전체 재전송
+    """
+
+    def __init__(
+        self,
+        client,
+        workers: int = 4,
+        rate_limit: Optional[float] = None,
+        poll_interval: float = 30.0,
+        probe_interval: float = 5.0
+    ):
+        """
+        Args:
+            client: outbox를 소유한 JarvisClient
+            workers: retry_outbox 병렬 스레드 수
+            rate_limit: 초당 최대 재전송 요청 수
+            poll_interval: 예약된 이벤트가 없을 때 outbox 확인 주기 (초)
+            probe_interval: offline 상태에서 연결 확인 주기 (초)
+        """
+        self.client = client
+        self.workers = workers
+        self.rate_limit = rate_limit
+        self.poll_interval = poll_interval
+        self.probe_interval = probe_interval
+
+        self.last_stats: Optional[Dict[str, int]] = None
+        self.offline = False
+
+        self._recovered = False
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "OutboxDrainer":
+        """drainer 스레드 시작"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="jarvis-drainer", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """drainer 스레드 종료 (진행 중인 재전송이 끝날 때까지 대기)"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self) -> None:
+        """대기 중이면 즉시 outbox 확인"""
+        self._wake.set()
+
+    def notify_success(self) -> None:
+        """라이브 전송 성공 알림 - offline 상태였다면 연결 복구로 간주"""
+        if self.offline:
+            self._recovered = True
+            self._wake.set()
+
+    def run_once(self, force: bool = False) -> Dict[str, int]:
+        """retry_outbox 1회 실행"""
+        self.last_stats = self.client.retry_outbox(
+            workers=self.workers, rate_limit=self.rate_limit, force=force
+        )
+        return self.last_stats
+
+    def _run(self) -> None:
+        """drain 루프"""
+        # offline 구간에서 강제 재전송을 이미 해봤는지 (API는 닿지만 계속 실패하는 경우
+        # probe_interval마다 백오프를 무시하고 재전송하지 않도록)
+        forced_in_outage = False
+
+        while not self._stop.is_set():
+            if self.offline and not self._recovered:
+                if not self._probe():
+                    forced_in_outage = False
+                    self._wait(self.probe_interval)
+                    continue
+
+            # 연결 복구 직후에는 예약 시각 무시하고 전부 재전송
+            force = self._recovered or (self.offline and not forced_in_outage)
+            self._recovered = False
+
+            try:
+                stats = self.run_once(force=force)
+            except Exception:
+                self._wait(self.poll_interval)
+                continue
+
+            # 전부 실패했거나 서킷 open으로 전부 보류된 경우
+            self.offline = bool(stats["failed"] or stats["deferred"]) and not stats["success"]
+            forced_in_outage = self.offline and (force or forced_in_outage)
+            if self.offline:
+                self._wait(self.probe_interval)
+                continue
+
+            next_due = self.client.outbox.next_due()
+            if next_due is None:
+                delay = self.poll_interval
+            else:
+                delay = min(max(next_due - time.time(), 0.0), self.poll_interval)
+            self._wait(delay)
+
+    def _wait(self, timeout: float) -> None:
+        """timeout 또는 wake()까지 대기"""
+        self._wake.wait(timeout)
+        self._wake.clear()
+
+    def _probe(self) -> bool:
+        """API 호스트 TCP 연결 확인"""
+        parts = urlsplit(self.client.config.api_base_url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        timeout = min(5.0, self.client.config.timeout_seconds)
+        try:
+            socket.create_connection((parts.hostname, port), timeout=timeout).close()
+            return True
+        except OSError:
+            return False
+
+
+def main(argv=None) -> int:
+    """python -m jarvis_sdk.drain 진입점"""
+    try:
+        from .client import JarvisClient
+    except ImportError:
+        from client import JarvisClient
+
+    parser = argparse.ArgumentParser(description="JARVIS outbox drainer")
+    parser.add_argument("--once", action="store_true", help="한 번만 재전송 후 종료")
+    parser.add_argument("--force", action="store_true", help="예약 시각 무시하고 전체 재전송 (--once와 함께)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--poll-interval", type=float, default=30.0)
+    parser.add_argument("--probe-interval", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    client = JarvisClient()
+    drainer = OutboxDrainer(
+        client,
+        workers=args.workers,
+        rate_limit=args.rate_limit,
+        poll_interval=args.poll_interval,
+        probe_interval=args.probe_interval,
+    )
+
+    if args.once:
+        print(json.dumps(drainer.run_once(force=args.force)))
+        return 0
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+
+    drainer.start()
+    while not stopped.wait(1.0):
+        pass
+    drainer.stop()
+    if drainer.last_stats is not None:
+        print(json.dumps(drainer.last_stats))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
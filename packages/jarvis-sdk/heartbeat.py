@@ -0,0 +1,158 @@
+"""
+JARVIS Heartbeat - 장시간 태스크의 liveness 이벤트 (task_heartbeat)
+
+start() ~ complete() 사이에 주기적으로 작은 task_heartbeat 이벤트를 보내
+PM이 멈춘 Worker와 오래 걸리는 Worker를 구분할 수 있게 합니다.
+보류 중인 progress가 있으면 별도 task_log 대신 heartbeat payload에 합쳐 보냅니다.
+
+주기는 진행 상태에 따라 조정됩니다.
+- steady (마지막 heartbeat 이후 progress 값이 바뀜) / alive (progress를 보고하지 않는 태스크):
+  주기를 BACKOFF_FACTOR배씩 늘림 (max_interval까지)
+- stalled (progress 값이 그대로): 기본 주기로 복귀
+
+Usage:
+    config = JarvisConfig(heartbeat_interval=30)   # start()에서 자동 시작
+    # 또는 태스크별로
+    task.start("긴 작업")
+    task.start_heartbeat(30)
+"""
+
+import threading
+import weakref
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    from .task import JarvisTask
+
+# steady / alive일 때 주기 증가 배수
+BACKOFF_FACTOR = 2.0
+
+
+class TaskHeartbeat:
+    """
+    태스크 1개의 heartbeat daemon 스레드
+
+    이벤트 생성은 태스크 lock 안에서 짧게, 전송은 이 스레드에서 하므로 progress() / log()를 막지 않습니다.
+    heartbeat는 재시도 / outbox 없이 timeout초 안에 1회만 전송합니다 (실패하면 다음 heartbeat가 대신함).
+    stop()은 신호만 보내고 기다리지 않으며, finish()는 전송 중인 heartbeat 1건을 최대 timeout초만 기다려
+    task_completed / task_blocked가 항상 마지막 이벤트가 되게 합니다. 태스크가 GC되면 스레드도 종료됩니다.
+    """
+
+    def __init__(
+        self,
+        task: "JarvisTask",
+        interval: float,
+        max_interval: Optional[float] = None,
+        timeout: float = 2.0
+    ):
+        """
+        Args:
+            task: 대상 JarvisTask
+            interval: 기본(최소) 주기 (초, progress가 멈추면 이 주기로 복귀)
+            max_interval: 주기 상한 (초, 기본 interval과 같음 = 고정 주기)
+            timeout: heartbeat 1회 전송 timeout (초, finish()가 기다리는 최대 시간)
+        """
+        if interval <= 0:
+            raise ValueError("heartbeat interval must be positive")
+        self.base_interval = interval
+        self.max_interval = max(max_interval or interval, interval)
+        self.interval = interval  # 다음 heartbeat까지 대기 시간
+        self.timeout = timeout
+        self.stats = {"beats": 0, "steady": 0, "stalled": 0, "alive": 0, "merged_progress": 0, "errors": 0}
+
+        self._task = weakref.ref(task)
+        self._progress_seen = task._progress_version  # 마지막 heartbeat 시점의 progress 변경 횟수
+        self._stop = threading.Event()
+        self._send_lock = threading.Lock()  # 종료 확인 ~ 전송 완료 구간 (finish()가 대기)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "TaskHeartbeat":
+        """heartbeat 스레드 시작 (첫 heartbeat는 interval 후)"""
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="jarvis-heartbeat", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 0.0) -> None:
+        """
+        heartbeat 종료
+
+        Args:
+            timeout: 스레드 종료를 기다릴 시간 (초, 기본 0 = 기다리지 않음).
+                이미 만든 heartbeat를 전송 중이면 그 전송은 끝까지 진행됩니다.
+        """
+        self._stop.set()
+        thread = self._thread
+        if timeout > 0 and thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def finish(self) -> None:
+        """
+        종료 신호 후 전송 중인 heartbeat가 있으면 끝날 때까지 대기 (종료 이벤트 직전에 호출)
+
+        heartbeat 전송은 timeout초 1회뿐이므로 최대 timeout초만 기다립니다 (재시도 / 백오프 대기 없음).
+        이후의 beat()는 종료 신호를 보고 아무것도 보내지 않습니다.
+        """
+        self._stop.set()
+        if self._send_lock.acquire(timeout=self.timeout):
+            self._send_lock.release()
+
+    def beat(self) -> bool:
+        """
+        heartbeat 1회 생성 + 전송 후 다음 주기 계산
+
+        Returns:
+            계속할지 여부 (태스크가 끝났거나 GC되면 False)
+        """
+        task = self._task()
+        if task is None:
+            return False
+        with self._send_lock:
+            with task._lock:
+                if self._stop.is_set() or task._completed:
+                    return False
+                state = self._state(task)
+                self.interval = self._next_interval(state)
+                merged = task._pending_progress is not None
+                event = task._build_heartbeat(state, self.interval)
+
+            self.stats["beats"] += 1
+            self.stats[state] += 1
+            self.stats["merged_progress"] += merged
+            try:
+                result = task.client.send_best_effort(event, timeout=self.timeout)
+            except Exception:
+                # heartbeat 실패로 태스크를 방해하지 않음
+                result = {"status": "dropped"}
+            if result.get("status") == "dropped":
+                self.stats["errors"] += 1
+        return True
+
+    def _run(self) -> None:
+        """heartbeat 루프"""
+        while not self._stop.wait(self.interval):
+            if not self.beat():
+                return
+
+    def _state(self, task: "JarvisTask") -> str:
+        """마지막 heartbeat 이후 진행 상태 (steady / stalled / alive)"""
+        version = task._progress_version
+        if version == 0:
+            return "alive"
+        changed, self._progress_seen = version != self._progress_seen, version
+        return "steady" if changed else "stalled"
+
+    def _next_interval(self, state: str) -> float:
+        """진행 중이면 주기를 늘리고, 멈추면 기본 주기로 복귀"""
+        if state == "stalled":
+            return self.base_interval
+        return min(self.interval * BACKOFF_FACTOR, self.max_interval)
+
+    def snapshot(self) -> Dict[str, float]:
+        """현재 주기 + 통계"""
+        return {"interval": self.interval, **self.stats}
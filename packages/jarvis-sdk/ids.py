@@ -0,0 +1,94 @@
+"""
+JARVIS IDs - 단조 증가 ULID, 태스크 실행(run) ID, trace / span ID
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+# Crockford base32 (I, L, O, U 제외)
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_DECODE = {char: index for index, char in enumerate(_ALPHABET)}
+
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+
+_lock = threading.Lock()
+_last_ms = -1
+_last_random = 0
+
+
+def _encode(value: int, length: int) -> str:
+    """정수 → 고정 길이 base32"""
+    chars = []
+    for _ in range(length):
+        chars.append(_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def ulid() -> str:
+    """
+    단조 증가 ULID (26자, 48bit 밀리초 시각 + 80bit 난수)
+
+    같은 밀리초(또는 시계가 뒤로 간 경우)에는 직전 값의 난수부를 1 증가시키므로,
+    프로세스 내에서 생성 순서 = 문자열 정렬 순서이고 중복이 없습니다.
+    """
+    global _last_ms, _last_random
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _last_random = int.from_bytes(os.urandom(10), "big")
+        elif _last_random < _RANDOM_MAX:
+            _last_random += 1
+        else:
+            # 한 밀리초에 2^80개를 소진한 경우 (사실상 없음) → 다음 밀리초로 이동
+            _last_ms += 1
+            _last_random = int.from_bytes(os.urandom(10), "big")
+        return _encode(_last_ms, 10) + _encode(_last_random, 16)
+
+
+def ulid_time(value: str) -> float:
+    """ULID에 담긴 생성 시각 (epoch 초)"""
+    millis = 0
+    for char in value[:10].upper():
+        millis = (millis << 5) | _DECODE[char]
+    return millis / 1000
+
+
+def new_run_id() -> str:
+    """새 태스크 실행 ID"""
+    return ulid()
+
+
+def resolve_run_id(run_id: Optional[str] = None) -> str:
+    """
+    태스크 실행 ID 결정
+
+    인자 → JARVIS_RUN_ID 환경변수 → 새 ULID 순서.
+    재시작된 프로세스가 같은 run_id를 쓰면 같은 idempotency key가 만들어져
+    서버에서 중복 제거됩니다.
+    """
+    return run_id or os.environ.get("JARVIS_RUN_ID") or new_run_id()
+
+
+def new_trace_id() -> str:
+    """새 trace ID (32자 hex, W3C trace-id 형식)"""
+    return os.urandom(16).hex()
+
+
+def new_span_id() -> str:
+    """새 span ID (16자 hex, W3C span-id 형식)"""
+    return os.urandom(8).hex()
+
+
+def resolve_trace_id(trace_id: Optional[str] = None) -> str:
+    """
+    태스크 trace ID 결정
+
+    인자 → JARVIS_TRACE_ID 환경변수 → 새 ID 순서.
+    PM / 스케줄러가 상위 trace ID를 넘기면 여러 Worker의 태스크를 한 trace로 묶을 수 있습니다.
+    """
+    return trace_id or os.environ.get("JARVIS_TRACE_ID") or new_trace_id()
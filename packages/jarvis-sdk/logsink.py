@@ -0,0 +1,243 @@
+"""
+JARVIS Log Sink - 버퍼링 + 로테이션 JSONL 로그 기록
+"""
+
+import atexit
+import threading
+import time
+import weakref
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# 종료 시 flush 대상
+_live_sinks: "weakref.WeakSet[JsonlLogSink]" = weakref.WeakSet()
+
+
+class JsonlLogSink:
+    """
+    thread-safe 버퍼링 JSONL 로그 기록기
+
+    - 파일 핸들 하나를 유지하고, 버퍼가 buffer_size 바이트를 넘거나
+      flush_interval초가 지나면 한 번의 write로 기록
+    - 쓰기가 멈춰도 버퍼가 남지 않도록 첫 기록 때 flush 스레드를 띄워 flush_interval마다 기록
+    - 날짜별 파일(<prefix>_YYYYMMDD.jsonl), max_bytes를 넘으면
+      <prefix>_YYYYMMDD.1.jsonl, .2.jsonl ... 로 이어서 기록
+    - background=True면 파일 기록은 writer 스레드가 담당 (호출자는 버퍼에 추가만)
+    - 프로세스 종료 시 atexit에서 남은 버퍼 flush
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        prefix: str = "jarvis_sdk",
+        buffer_size: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        max_bytes: Optional[int] = None,
+        background: bool = False
+    ):
+        """
+        Args:
+            directory: 로그 디렉토리
+            prefix: 파일 이름 접두사
+            buffer_size: 이 크기(바이트)를 넘으면 flush
+            flush_interval: 마지막 flush 후 이 시간(초)이 지나면 flush
+            max_bytes: 파일당 최대 크기 (None이면 날짜 단위로만 로테이션)
+            background: True면 writer 스레드에서 파일 기록
+        """
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.background = background
+
+        # 버퍼 (write()에서 짧게 잡는 lock)
+        self._lock = threading.Lock()
+        self._buffer: List[bytes] = []
+        self._buffer_day: Optional[str] = None
+        self._buffered = 0
+        self._ready: List[Tuple[str, List[bytes]]] = []  # 날짜가 바뀌어 분리된 버퍼
+        self._last_flush = time.monotonic()
+        self._day = ""
+        self._day_ends = 0.0
+
+        # 파일 (flush 순서 보장용 lock)
+        self._io_lock = threading.Lock()
+        self._file = None
+        self._file_day: Optional[str] = None
+        self._file_part = 0
+        self._file_size = 0
+
+        self._closed = False
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._start_thread()
+        _live_sinks.add(self)
+
+    def write(self, line: bytes) -> None:
+        """UTF-8 JSON 한 줄 추가 (개행은 자동으로 붙음, flush 시점이면 파일 기록)"""
+        if self.append(line):
+            self.flush()
+
+    def append(self, line: bytes) -> bool:
+        """
+        버퍼에 한 줄 추가만 (파일 I/O 없음)
+
+        Returns:
+            호출자가 flush()해야 하면 True (background면 writer 스레드를 깨우고 False)
+        """
+        line += b"\n"
+        with self._lock:
+            now = time.time()
+            if now >= self._day_ends:
+                self._roll_day(now)
+            if self._buffer and self._buffer_day != self._day:
+                # 자정을 넘기면 이전 날짜 버퍼는 이전 파일로
+                self._ready.append((self._buffer_day, self._buffer))
+                self._buffer = []
+            self._buffer.append(line)
+            self._buffer_day = self._day
+            self._buffered += len(line)
+
+            due = (
+                self._buffered >= self.buffer_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+            if self._thread is None and self.flush_interval > 0 and not self._closed:
+                # 이후 쓰기가 없어도 flush_interval 뒤에 기록되도록
+                self._start_thread()
+
+        if due and self.background and not self._closed:
+            self._wake.set()
+            return False
+        return due
+
+    def flush(self) -> None:
+        """버퍼를 파일에 기록"""
+        with self._io_lock:
+            with self._lock:
+                chunks = self._ready
+                if self._buffer:
+                    chunks.append((self._buffer_day, self._buffer))
+                self._ready = []
+                self._buffer = []
+                self._buffered = 0
+                self._last_flush = time.monotonic()
+
+            for day, lines in chunks:
+                self._write_chunk(day, b"".join(lines))
+            if chunks and self._file is not None:
+                self._file.flush()
+
+    def close(self) -> None:
+        """남은 버퍼 기록 후 파일/스레드 정리"""
+        self._closed = True
+        if self._thread is not None:
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._io_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._file_day = None
+
+    def current_file(self) -> Optional[Path]:
+        """현재 기록 중인 파일 경로"""
+        if self._file_day is None:
+            return None
+        return self._path(self._file_day, self._file_part)
+
+    def _roll_day(self, now: float) -> None:
+        """날짜 문자열 갱신 (자정까지는 재계산하지 않음, lock 보유 상태에서 호출)"""
+        today = datetime.fromtimestamp(now)
+        self._day = today.strftime("%Y%m%d")
+        midnight = datetime(today.year, today.month, today.day) + timedelta(days=1)
+        self._day_ends = midnight.timestamp()
+
+    def _path(self, day: str, part: int) -> Path:
+        """날짜 + 분할 번호 → 파일 경로"""
+        if part == 0:
+            return self.directory / f"{self.prefix}_{day}.jsonl"
+        return self.directory / f"{self.prefix}_{day}.{part}.jsonl"
+
+    def _write_chunk(self, day: str, data: bytes) -> None:
+        """날짜/크기 기준 로테이션 후 기록 (io lock 보유 상태에서 호출)"""
+        if self._file_day != day:
+            self._open(day)
+        if self.max_bytes and self._file_size and self._file_size + len(data) > self.max_bytes:
+            self._open(day, self._file_part + 1)
+        self._file.write(data)
+        self._file_size += len(data)
+
+    def _open(self, day: str, part: Optional[int] = None) -> None:
+        """로그 파일 열기 (part 미지정 시 그날의 마지막 분할 파일에 이어서 기록)"""
+        if self._file is not None:
+            self._file.flush()
+            self._file.close()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if part is None:
+            part = 0
+            while self._path(day, part + 1).exists():
+                part += 1
+
+        path = self._path(day, part)
+        self._file = open(path, "ab")
+        self._file_day = day
+        self._file_part = part
+        self._file_size = self._file.tell()
+
+    def _start_thread(self) -> None:
+        """writer / flush 스레드 시작"""
+        self._thread = threading.Thread(
+            target=self._run, name="jarvis-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        """writer 스레드: flush_interval마다 또는 (background면) 버퍼가 차면 flush"""
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass
+
+
+# 로그 디렉토리별 공유 sink (여러 클라이언트가 같은 파일 핸들/버퍼 사용)
+_sinks: Dict[Path, JsonlLogSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_log_sink(directory: Path, **kwargs) -> JsonlLogSink:
+    """
+    디렉토리별 프로세스 공유 sink 가져오기 (최초 호출 시 kwargs로 생성)
+
+    Args:
+        directory: 로그 디렉토리
+        **kwargs: JsonlLogSink 옵션
+    """
+    key = Path(directory).resolve()
+    with _sinks_lock:
+        sink = _sinks.get(key)
+        if sink is None or sink._closed:
+            sink = JsonlLogSink(directory, **kwargs)
+            _sinks[key] = sink
+        return sink
+
+
+def _flush_all() -> None:
+    """atexit: 남은 로그 버퍼 기록"""
+    for sink in list(_live_sinks):
+        try:
+            sink.close()
+        except Exception:
+            pass
+
+
+atexit.register(_flush_all)
@@ -0,0 +1,319 @@
+"""
+JARVIS Metrics - 프로세스 내 메트릭 레지스트리 (Prometheus text / JSON snapshot)
+"""
+
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# 전송 지연 시간용 기본 bucket (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_Labels = Tuple[str, ...]
+
+
+class _Metric:
+    """label 값 튜플별 값을 보관하는 메트릭 공통 부분"""
+
+    TYPE = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Any]] = None
+    ):
+        """
+        Args:
+            name: 메트릭 이름
+            help: 설명
+            labelnames: label 이름 (값은 inc / set / observe에 같은 순서로 전달)
+            callback: 수집 시점에 값을 계산하는 함수 (숫자 또는 {label 값 튜플: 숫자})
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._values: Dict[_Labels, Any] = {}
+
+    def samples(self) -> List[Tuple[_Labels, Any]]:
+        """(label 값, 값) 목록"""
+        if self.callback is not None:
+            value = self.callback()
+            if isinstance(value, dict):
+                return sorted(value.items())
+            return [((), value)]
+        with self._lock:
+            return sorted((labels, self._copy(value)) for labels, value in self._values.items())
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        return value
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    TYPE = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    """현재 값"""
+
+    TYPE = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """누적 bucket 히스토그램"""
+
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # [bucket별 개수..., 합계, 전체 개수]
+                state = self._values[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        return list(value)
+
+
+class MetricsRegistry:
+    """
+    메트릭 레지스트리 (thread-safe)
+
+    Usage:
+        registry = MetricsRegistry()
+        sent = registry.counter("jarvis_events_total", "Events", ("event_type",))
+        sent.inc("task_log")
+        print(registry.to_prometheus())
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = (), callback=None) -> Counter:
+        return self._register(Counter(name, help, labelnames, callback))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = (), callback=None) -> Gauge:
+        return self._register(Gauge(name, help, labelnames, callback))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def _register(self, metric: _Metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """이름으로 메트릭 조회"""
+        return self._metrics.get(name)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        JSON 직렬화 가능한 현재 값
+
+        Returns:
+            {name: {"type", "help", "values": [{"labels": {...}, "value" | "count", "sum", "buckets"}]}}
+        """
+        result = {}
+        for metric in list(self._metrics.values()):
+            values = []
+            for labels, value in metric.samples():
+                item: Dict[str, Any] = {"labels": dict(zip(metric.labelnames, labels))}
+                if isinstance(metric, Histogram):
+                    item["count"] = value[-1]
+                    item["sum"] = value[-2]
+                    item["buckets"] = dict(zip(
+                        [_format_bound(b) for b in metric.buckets], _cumulative(value)
+                    ))
+                else:
+                    item["value"] = value
+                values.append(item)
+            result[metric.name] = {"type": metric.TYPE, "help": metric.help, "values": values}
+        return result
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (0.0.4)"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+            for labels, value in metric.samples():
+                pairs = list(zip(metric.labelnames, labels))
+                if isinstance(metric, Histogram):
+                    counts = _cumulative(value)
+                    for bound, count in zip(metric.buckets, counts):
+                        lines.append(f"{metric.name}_bucket{_format_labels(pairs + [('le', _format_bound(bound))])} {count}")
+                    lines.append(f"{metric.name}_bucket{_format_labels(pairs + [('le', '+Inf')])} {value[-1]}")
+                    lines.append(f"{metric.name}_sum{_format_labels(pairs)} {_format_value(value[-2])}")
+                    lines.append(f"{metric.name}_count{_format_labels(pairs)} {value[-1]}")
+                else:
+                    lines.append(f"{metric.name}{_format_labels(pairs)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _cumulative(state: List[Any]) -> List[int]:
+    """bucket별 개수 → 누적 개수"""
+    counts, total = [], 0
+    for count in state[:-2]:
+        total += count
+        counts.append(total)
+    return counts
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return repr(value)
+    return str(value)
+
+
+def _format_labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class ClientMetrics(MetricsRegistry):
+    """
+    JarvisClient 메트릭
+
+    전송 경로에서 직접 기록하는 메트릭과, 수집 시점에 클라이언트 상태를 읽는 메트릭
+    (outbox 깊이 / 가장 오래된 이벤트 나이 / 서킷 / 큐)으로 구성됩니다.
+    """
+
+    def __init__(self, client):
+        super().__init__()
+        client_ref = weakref.ref(client)  # 메트릭이 클라이언트 수명을 늘리지 않도록
+
+        def read(fn, default=0):
+            def callback():
+                client = client_ref()
+                return fn(client) if client is not None else default
+            return callback
+
+        self.send_duration = self.histogram(
+            "jarvis_send_duration_seconds",
+            "Time from first attempt to final result (sent or outboxed) per event",
+            ("event_type",),
+        )
+        self.events = self.counter(
+            "jarvis_events_total", "Events by final delivery status", ("event_type", "status")
+        )
+        self.retries = self.counter(
+            "jarvis_retries_total", "Retried send attempts", ("event_type",)
+        )
+        self.requests = self.counter(
+            "jarvis_requests_total", "HTTP requests by response code (error = no response)", ("code",)
+        )
+        self.bytes_sent = self.counter(
+            "jarvis_bytes_sent_total", "Request body bytes sent (after compression)"
+        )
+        self.caller_blocked = self.histogram(
+            "jarvis_caller_blocked_seconds",
+            "Time the calling thread spent inside send_event",
+            ("mode",),
+        )
+        self.outbox_writes = self.counter(
+            "jarvis_outbox_writes_total", "Events written to the outbox"
+        )
+        self.outbox_replays = self.counter(
+            "jarvis_outbox_replays_total", "Outbox replay outcomes", ("outcome",)
+        )
+        self.deduped = self.counter(
+            "jarvis_deduped_total", "Sends skipped because the key was recently acknowledged"
+        )
+        self.queue_overflow = self.counter(
+            "jarvis_queue_overflow_total", "Events outboxed because the send queue was full"
+        )
+        self.gauge(
+            "jarvis_outbox_depth", "Pending events in the outbox",
+            callback=read(lambda c: c.outbox.count()),
+        )
+        self.gauge(
+            "jarvis_outbox_oldest_age_seconds", "Age of the oldest pending outbox event",
+            callback=read(_oldest_age),
+        )
+        self.gauge(
+            "jarvis_circuit_state", "1 for the current circuit breaker state", ("state",),
+            callback=read(_circuit_states, {}),
+        )
+        self.counter(
+            "jarvis_circuit_rejected_total", "Requests skipped by the open circuit",
+            callback=read(lambda c: c.breaker.metrics()["rejected"]),
+        )
+        self.gauge(
+            "jarvis_queue_depth", "Events waiting in the async send queue (including in flight)",
+            callback=read(lambda c: c._sender.pending() if c._sender is not None else 0),
+        )
+        self.gauge(
+            "jarvis_queue_capacity", "Async send queue capacity",
+            callback=read(lambda c: c.config.queue_max_size),
+        )
+
+    def record_delivery(self, event, result: Dict[str, Any], started: float) -> None:
+        """이벤트 1건의 최종 결과 기록 (started: time.perf_counter() 기준 시작 시각)"""
+        self.send_duration.observe(time.perf_counter() - started, event.event_type)
+        self.events.inc(event.event_type, result.get("status", "unknown"))
+
+
+def _oldest_age(client) -> float:
+    """가장 오래된 outbox 이벤트 나이 (초, 없으면 0)"""
+    oldest = client.outbox.oldest_created_at()
+    if oldest is None:
+        return 0
+    return max((datetime.now() - oldest).total_seconds(), 0.0)
+
+
+def _circuit_states(client) -> Dict[_Labels, int]:
+    """상태별 0/1"""
+    current = client.breaker.state
+    return {(state,): int(state == current) for state in ("closed", "open", "half_open")}
@@ -0,0 +1,1023 @@
+"""
+JARVIS Outbox Storage - 전송 실패 이벤트 보관소
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set
+
+try:
+    from .config import JarvisConfig
+    from .serialization import json_default
+except ImportError:
+    from config import JarvisConfig
+    from serialization import json_default
+
+
+@dataclass
+class OutboxEntry:
+    """outbox에 저장된 이벤트 1건"""
+    entry_id: str  # 백엔드별 식별자 (파일명 / seq 등)
+    event: Dict[str, Any]
+    error: str
+    created_at: str
+    retry_count: int = 0
+    last_error: Optional[str] = None
+    last_retry: Optional[str] = None
+    next_attempt_at: float = 0.0  # epoch 초, 이 시각 이후 재전송 대상
+
+    @property
+    def task_id(self) -> str:
+        return self.event.get("task_id", "")
+
+
+class OutboxStore:
+    """
+    Outbox 저장소 인터페이스
+
+    pending()은 생성 순서대로 반환해야 합니다 (태스크별 전송 순서 보장).
+    due_before를 주면 next_attempt_at이 그 이전인 이벤트만 반환하되,
+    같은 태스크의 앞선 이벤트가 아직 대기 중이면 뒤 이벤트도 제외합니다.
+
+    재전송 전에는 claim()으로 이벤트를 선점합니다. 선점된 이벤트가 있는 태스크는 lease가 끝날 때까지
+    pending()에 통째로 나오지 않으므로 여러 drainer / 프로세스가 같은 이벤트를 동시에 보내거나
+    앞 이벤트가 전송 중일 때 뒤 이벤트를 먼저 보내지 않습니다.
+    선점 후에는 ack / record_failure / dead_letter / release 중 하나로 끝냅니다.
+    """
+
+    def add(
+        self,
+        event: Dict[str, Any],
+        error: str,
+        created_at: Optional[str] = None,
+        retry_count: int = 0,
+        encoded: Optional[bytes] = None
+    ) -> str:
+        """
+        이벤트 저장. 저장 위치(로그/응답용 문자열) 반환
+
+        encoded: 이미 직렬화된 event JSON (있으면 백엔드가 재직렬화 없이 사용)
+        """
+        raise NotImplementedError
+
+    def pending(self, due_before: Optional[float] = None) -> List[OutboxEntry]:
+        """재전송 대기 중인 이벤트 (생성 순서)"""
+        raise NotImplementedError
+
+    def claim(self, entry: OutboxEntry, lease_seconds: float) -> bool:
+        """
+        재전송을 위해 이벤트 선점
+
+        Returns:
+            True면 선점 성공, False면 이미 다른 쪽이 선점했거나 처리됨
+            (lease_seconds 안에 끝내지 못하면 다시 pending으로 돌아감)
+        """
+        return True
+
+    def release(self, entry: OutboxEntry) -> None:
+        """시도하지 않고 선점 해제 (상태 변경 없음)"""
+
+    def ack(self, entry: OutboxEntry) -> None:
+        """전송 성공 → 제거"""
+        raise NotImplementedError
+
+    def record_failure(
+        self,
+        entry: OutboxEntry,
+        error: str,
+        next_attempt_at: Optional[float] = None
+    ) -> None:
+        """재전송 실패 기록 (retry_count 증가, 다음 재전송 시각 설정)"""
+        raise NotImplementedError
+
+    def dead_letter(self, entry: OutboxEntry) -> None:
+        """최대 재시도 초과 → failed로 이동"""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """대기 중인 이벤트 수"""
+        return len(self.pending())
+
+    def oldest_created_at(self) -> Optional[datetime]:
+        """가장 오래된 대기 이벤트의 생성 시각 (대기 이벤트가 없으면 None)"""
+        created = [entry.created_at for entry in self.pending() if entry.created_at]
+        return datetime.fromisoformat(min(created)) if created else None
+
+    def next_due(self) -> Optional[float]:
+        """
+        다음 재전송 가능 시각 (대기 이벤트가 없으면 None)
+
+        태스크별 첫 번째 대기 이벤트의 next_attempt_at 중 최솟값
+        (뒤 이벤트는 앞 이벤트가 전송돼야 보낼 수 있으므로 제외)
+        """
+        heads: Dict[str, float] = {}
+        for entry in self.pending():
+            heads.setdefault(entry.task_id, entry.next_attempt_at)
+        return min(heads.values(), default=None)
+
+    def compact(self) -> None:
+        """저장 공간 정리 (필요한 백엔드만 구현)"""
+
+    def sync(self) -> None:
+        """버퍼링된 쓰기를 디스크에 반영 (필요한 백엔드만 구현)"""
+
+    def close(self) -> None:
+        """리소스 정리"""
+
+    @staticmethod
+    def _mark_failed(entry: OutboxEntry, error: str, next_attempt_at: Optional[float]) -> None:
+        """엔트리에 실패 정보 반영"""
+        entry.retry_count += 1
+        entry.last_error = error
+        entry.last_retry = datetime.now().isoformat()
+        entry.next_attempt_at = next_attempt_at or 0.0
+
+    @staticmethod
+    def _exclude_tasks(entries: List[OutboxEntry], busy: Set[str]) -> List[OutboxEntry]:
+        """선점 중인(lease가 남은) 이벤트가 있는 태스크는 통째로 제외"""
+        if not busy:
+            return entries
+        return [entry for entry in entries if entry.task_id not in busy]
+
+    @staticmethod
+    def _filter_due(entries: List[OutboxEntry], due_before: Optional[float]) -> List[OutboxEntry]:
+        """재전송 시각이 된 이벤트만 (앞선 이벤트가 대기 중인 태스크는 통째로 제외)"""
+        if due_before is None:
+            return entries
+        waiting = set()
+        due = []
+        for entry in entries:
+            if entry.task_id in waiting:
+                continue
+            if entry.next_attempt_at > due_before:
+                waiting.add(entry.task_id)
+                continue
+            due.append(entry)
+        return due
+
+
+_clock_lock = threading.Lock()
+_clock_last: Optional[datetime] = None
+
+
+def _monotonic_now() -> datetime:
+    """
+    프로세스 내에서 단조 증가하는 타임스탬프
+
+    파일명 정렬 순서 = 생성 순서가 되도록 같은 마이크로초면 1µs씩 밀어냄
+    """
+    global _clock_last
+    with _clock_lock:
+        now = datetime.now()
+        if _clock_last is not None and now <= _clock_last:
+            now = _clock_last + timedelta(microseconds=1)
+        _clock_last = now
+        return now
+
+
+class FileOutbox(OutboxStore):
+    """
+    이벤트 1건 = JSON 파일 1개 (기존 포맷)
+
+    outbox/pending/*.json, outbox/failed/*.json
+    outbox/inflight/*.json  - claim()으로 선점된 이벤트 (mtime = lease 만료 시각)
+
+    선점은 pending → inflight rename이므로 같은 디렉토리를 공유하는 프로세스 중
+    하나만 성공합니다. lease가 만료된 inflight 파일(전송 도중 crash 등)은
+    다음 pending() 호출 때 pending으로 돌아갑니다.
+    디렉토리는 생성 시점이 아니라 첫 기록 때 만듭니다.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.pending_dir = root / "pending"
+        self.failed_dir = root / "failed"
+        self.inflight_dir = root / "inflight"
+        self._pending_ready = False  # pending_dir 생성 여부
+
+    def add(
+        self,
+        event: Dict[str, Any],
+        error: str,
+        created_at: Optional[str] = None,
+        retry_count: int = 0,
+        encoded: Optional[bytes] = None
+    ) -> str:
+        # 사람이 읽는 indent=2 포맷을 유지하므로 encoded는 사용하지 않음
+        timestamp = _monotonic_now()
+        filename = f"{timestamp.strftime('%Y%m%d_%H%M%S_%f')}_{event['idempotency_key'].replace(':', '_')}.json"
+        filepath = self.pending_dir / filename
+        if not self._pending_ready:
+            self.pending_dir.mkdir(parents=True, exist_ok=True)
+            self._pending_ready = True
+
+        outbox_data = {
+            "event": event,
+            "error": error,
+            "created_at": created_at or timestamp.isoformat(),
+            "_retry_count": retry_count
+        }
+
+        filepath.write_text(json.dumps(outbox_data, ensure_ascii=False, indent=2, default=json_default))
+        return str(filepath)
+
+    def pending(self, due_before: Optional[float] = None) -> List[OutboxEntry]:
+        self._recover_expired()
+        entries = []
+        busy: Set[str] = set()  # inflight 이벤트가 있는 task_id
+        for filepath in sorted(self.pending_dir.glob("*.json")):
+            try:
+                data = json.loads(filepath.read_text())
+            except FileNotFoundError:
+                # 읽는 사이 다른 drainer가 선점 → 그 태스크는 제외
+                busy.update(self._inflight_tasks([self.inflight_dir / filepath.name]))
+                continue
+            except Exception:
+                # 손상된 파일은 건너뜀 (수동 확인 대상)
+                continue
+            entries.append(OutboxEntry(
+                entry_id=filepath.name,
+                event=data["event"],
+                error=data.get("error", ""),
+                created_at=data.get("created_at", ""),
+                retry_count=data.get("_retry_count", 0),
+                last_error=data.get("last_error"),
+                last_retry=data.get("last_retry"),
+                next_attempt_at=data.get("_next_attempt_at", 0.0),
+            ))
+        # pending을 읽은 뒤에 inflight를 확인 (그 사이 선점된 이벤트도 놓치지 않도록)
+        if self.inflight_dir.exists():
+            busy.update(self._inflight_tasks(self.inflight_dir.glob("*.json")))
+        return self._filter_due(self._exclude_tasks(entries, busy), due_before)
+
+    def claim(self, entry: OutboxEntry, lease_seconds: float) -> bool:
+        self.inflight_dir.mkdir(exist_ok=True)
+        target = self.inflight_dir / entry.entry_id
+        try:
+            os.rename(self.pending_dir / entry.entry_id, target)
+        except FileNotFoundError:
+            return False  # 다른 프로세스가 먼저 선점 / 처리
+        expires = time.time() + lease_seconds
+        os.utime(target, (expires, expires))
+        return True
+
+    def release(self, entry: OutboxEntry) -> None:
+        self._unclaim(entry.entry_id)
+
+    def ack(self, entry: OutboxEntry) -> None:
+        try:
+            self._locate(entry.entry_id).unlink()
+        except FileNotFoundError:
+            pass  # lease 만료 후 다른 프로세스가 가져감 (서버 idempotency로 중복 처리)
+
+    def record_failure(
+        self,
+        entry: OutboxEntry,
+        error: str,
+        next_attempt_at: Optional[float] = None
+    ) -> None:
+        self._mark_failed(entry, error, next_attempt_at)
+        data = json.dumps(self._to_file_data(entry), ensure_ascii=False, indent=2)
+        try:
+            # r+: 파일이 없으면 새로 만들지 않음 (이미 처리된 이벤트를 되살리지 않도록)
+            with open(self._locate(entry.entry_id), "r+") as f:
+                f.write(data)
+                f.truncate()
+        except FileNotFoundError:
+            return  # lease 만료 후 다른 drainer / 프로세스가 처리
+        self._unclaim(entry.entry_id)
+
+    def dead_letter(self, entry: OutboxEntry) -> None:
+        self.failed_dir.mkdir(exist_ok=True)
+        try:
+            self._locate(entry.entry_id).rename(self.failed_dir / entry.entry_id)
+        except FileNotFoundError:
+            pass  # 다른 drainer / 프로세스가 이미 처리
+
+    def count(self) -> int:
+        return sum(1 for _ in self._all_files())
+
+    def oldest_created_at(self) -> Optional[datetime]:
+        # 파일명 앞부분이 생성 시각이므로 파일을 읽지 않고 계산
+        first = min((path.name for path in self._all_files()), default=None)
+        if first is None:
+            return None
+        try:
+            return datetime.strptime(first[:22], "%Y%m%d_%H%M%S_%f")
+        except ValueError:
+            return super().oldest_created_at()
+
+    @staticmethod
+    def _to_file_data(entry: OutboxEntry) -> Dict[str, Any]:
+        """파일 포맷으로 변환"""
+        data = {
+            "event": entry.event,
+            "error": entry.error,
+            "created_at": entry.created_at,
+            "_retry_count": entry.retry_count
+        }
+        if entry.last_error is not None:
+            data["last_error"] = entry.last_error
+            data["last_retry"] = entry.last_retry
+        if entry.next_attempt_at:
+            data["_next_attempt_at"] = entry.next_attempt_at
+        return data
+
+    def _all_files(self):
+        """pending + inflight 파일 (아직 전송되지 않은 이벤트)"""
+        yield from self.pending_dir.glob("*.json")
+        if self.inflight_dir.exists():
+            yield from self.inflight_dir.glob("*.json")
+
+    def _locate(self, entry_id: str) -> Path:
+        """선점 중이면 inflight 경로, 아니면 pending 경로"""
+        inflight = self.inflight_dir / entry_id
+        return inflight if inflight.exists() else self.pending_dir / entry_id
+
+    def _unclaim(self, entry_id: str) -> None:
+        """inflight → pending (선점하지 않은 이벤트면 무시)"""
+        try:
+            os.rename(self.inflight_dir / entry_id, self.pending_dir / entry_id)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _inflight_tasks(paths) -> Set[str]:
+        """inflight 파일들의 task_id (읽는 사이 처리된 파일은 무시)"""
+        tasks = set()
+        for path in paths:
+            try:
+                tasks.add(json.loads(path.read_text())["event"].get("task_id", ""))
+            except Exception:
+                pass
+        return tasks
+
+    def _recover_expired(self) -> None:
+        """lease가 만료된 inflight 파일을 pending으로 되돌림"""
+        if not self.inflight_dir.exists():
+            return
+        now = time.time()
+        for path in self.inflight_dir.glob("*.json"):
+            try:
+                if path.stat().st_mtime <= now:
+                    os.rename(path, self.pending_dir / path.name)
+            except FileNotFoundError:
+                pass  # 다른 프로세스가 이미 처리
+
+
+class SegmentLogOutbox(OutboxStore):
+    """
+    append-only 세그먼트 로그 outbox
+
+    outbox/segments/00000001.seg  - 이벤트 레코드 JSONL ({"seq", "event", ...})
+    outbox/segments/acks.log      - 상태 변경 JSONL ({"seq", "op": ack|retry|dead})
+
+    - add()는 활성 세그먼트에 한 줄 append, fsync는 fsync_batch건 / fsync_interval초마다
+      (flush는 매번 하므로 프로세스 crash에는 안전, 전원 장애 시 마지막 배치만 위험)
+    - 재시도 실패는 파일 재작성 없이 acks.log에 한 줄 append
+    - compact()는 처리 완료된 세그먼트를 삭제하고, 살아있는 레코드가 적은 세그먼트는
+      활성 세그먼트로 옮긴 뒤 삭제, acks.log도 남은 seq만 남도록 다시 씀
+    - claim()은 메모리의 seq → lease 만료 시각 (프로세스 내 drainer / 스레드 간 선점)
+    - seq 할당이 메모리에 있으므로 경로당 인스턴스는 프로세스에 하나여야 함 (get_segment_outbox)
+    - 단일 프로세스 writer 기준 (여러 프로세스 공유는 지원하지 않음)
+    - seq는 entry_id / 위치 / 세그먼트 이름에서 8자리 0-padding (문자열 순서 = 숫자 순서)
+    """
+
+    ACK_FILE = "acks.log"
+
+    def __init__(
+        self,
+        root: Path,
+        segment_max_bytes: int = 4 * 1024 * 1024,
+        fsync_batch: int = 64,
+        fsync_interval: float = 1.0,
+        compact_live_ratio: float = 0.25
+    ):
+        """
+        Args:
+            root: outbox 루트 (세그먼트는 root/segments, dead letter는 root/failed)
+            segment_max_bytes: 세그먼트 rollover 크기
+            fsync_batch: 이 건수만큼 append되면 fsync
+            fsync_interval: 마지막 fsync 후 이 시간이 지나면 fsync (초)
+            compact_live_ratio: 살아있는 레코드 비율이 이보다 낮으면 세그먼트 재작성
+        """
+        self.root = root
+        self.segment_dir = root / "segments"
+        self.failed_dir = root / "failed"
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.compact_live_ratio = compact_live_ratio
+
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._next_seq = 1
+        self._segments: Dict[Path, Set[int]] = {}  # 세그먼트별 전체 seq
+        self._done: Set[int] = set()  # ack / dead 처리된 seq
+        self._retries: Dict[int, Dict[str, Any]] = {}  # seq → 마지막 retry 상태
+        self._claims: Dict[int, float] = {}  # seq → lease 만료 시각 (monotonic)
+
+        self._active: Optional[Path] = None
+        self._active_file = None
+        self._ack_file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    # ---- OutboxStore ----
+
+    def add(
+        self,
+        event: Dict[str, Any],
+        error: str,
+        created_at: Optional[str] = None,
+        retry_count: int = 0,
+        encoded: Optional[bytes] = None
+    ) -> str:
+        with self._lock:
+            self._load()
+            seq = self._next_seq
+            self._next_seq += 1
+
+            record = {
+                "seq": seq,
+                "event": event,
+                "error": error,
+                "created_at": created_at or datetime.now().isoformat(),
+            }
+            segment = self._append_record(record, encoded)
+            if retry_count:
+                self._append_ack({"seq": seq, "op": "retry", "retry_count": retry_count})
+            return f"{segment}#{seq:08d}"
+
+    def pending(self, due_before: Optional[float] = None) -> List[OutboxEntry]:
+        with self._lock:
+            self._load()
+            self._sync_files()
+
+            now = time.monotonic()
+            claimed = {seq for seq, expires in self._claims.items() if expires > now}
+            entries = []
+            busy: Set[str] = set()  # 선점 중인 이벤트가 있는 task_id
+            seen: Set[int] = set()
+            for segment in sorted(self._segments, key=_segment_number):
+                for record in self._read_segment(segment):
+                    seq = record["seq"]
+                    # compact 도중 중단되면 같은 seq가 두 세그먼트에 있을 수 있음
+                    if seq in self._done or seq in seen:
+                        continue
+                    seen.add(seq)
+                    if seq in claimed:
+                        busy.add(record["event"].get("task_id", ""))
+                        continue
+                    retry = self._retries.get(seq, {})
+                    entries.append(OutboxEntry(
+                        entry_id=f"{seq:08d}",
+                        event=record["event"],
+                        error=record.get("error", ""),
+                        created_at=record.get("created_at", ""),
+                        retry_count=retry.get("retry_count", 0),
+                        last_error=retry.get("error"),
+                        last_retry=retry.get("at"),
+                        next_attempt_at=retry.get("next_attempt_at", 0.0),
+                    ))
+            entries.sort(key=lambda e: int(e.entry_id))
+            return self._filter_due(self._exclude_tasks(entries, busy), due_before)
+
+    def claim(self, entry: OutboxEntry, lease_seconds: float) -> bool:
+        seq = int(entry.entry_id)
+        with self._lock:
+            now = time.monotonic()
+            if seq in self._done or self._claims.get(seq, 0.0) > now:
+                return False
+            self._claims[seq] = now + lease_seconds
+            return True
+
+    def release(self, entry: OutboxEntry) -> None:
+        with self._lock:
+            self._claims.pop(int(entry.entry_id), None)
+
+    def ack(self, entry: OutboxEntry) -> None:
+        with self._lock:
+            self._mark_done(int(entry.entry_id), "ack")
+
+    def record_failure(
+        self,
+        entry: OutboxEntry,
+        error: str,
+        next_attempt_at: Optional[float] = None
+    ) -> None:
+        self._mark_failed(entry, error, next_attempt_at)
+        with self._lock:
+            state = {
+                "seq": int(entry.entry_id),
+                "op": "retry",
+                "retry_count": entry.retry_count,
+                "error": error,
+                "at": entry.last_retry,
+                "next_attempt_at": entry.next_attempt_at,
+            }
+            self._append_ack(state)
+            self._retries[state["seq"]] = state
+            self._claims.pop(state["seq"], None)
+
+    def dead_letter(self, entry: OutboxEntry) -> None:
+        # 운영자가 확인할 수 있도록 기존과 같은 failed/*.json 포맷으로 보관
+        self.failed_dir.mkdir(parents=True, exist_ok=True)
+        key = entry.event.get("idempotency_key", "").replace(":", "_")
+        filepath = self.failed_dir / f"seg{int(entry.entry_id):08d}_{key}.json"
+        filepath.write_text(json.dumps(
+            FileOutbox._to_file_data(entry), ensure_ascii=False, indent=2
+        ))
+        with self._lock:
+            self._mark_done(int(entry.entry_id), "dead")
+
+    def count(self) -> int:
+        with self._lock:
+            self._load()
+            return sum(len(seqs - self._done) for seqs in self._segments.values())
+
+    def oldest_created_at(self) -> Optional[datetime]:
+        with self._lock:
+            self._load()
+            self._sync_files()
+            # 살아있는 레코드가 있는 첫 세그먼트만 읽음 (seq 순 = 생성 순)
+            for segment in sorted(self._segments, key=_segment_number):
+                if not self._segments[segment] - self._done:
+                    continue
+                created = [
+                    record["created_at"] for record in self._read_segment(segment)
+                    if record["seq"] not in self._done and record.get("created_at")
+                ]
+                if created:
+                    return datetime.fromisoformat(min(created))
+            return None
+
+    def compact(self) -> None:
+        with self._lock:
+            self._load()
+            for segment in sorted(self._segments, key=_segment_number):
+                seqs = self._segments[segment]
+                live = seqs - self._done
+                if segment == self._active:
+                    if live:
+                        continue
+                    # 활성 세그먼트도 모두 처리됐으면 닫고 삭제 (다음 add에서 새로 생성)
+                    self._sync_files(force=True)
+                    self._active_file.close()
+                    self._active_file = None
+                    self._active = None
+                if live and len(live) / len(seqs) >= self.compact_live_ratio:
+                    continue
+                # 살아있는 레코드를 활성 세그먼트로 옮기고 삭제
+                for record in self._read_segment(segment):
+                    if record["seq"] in live:
+                        self._append_record(record)
+                self._sync_files(force=True)
+                segment.unlink()
+                del self._segments[segment]
+                self._done -= seqs - live
+
+            self._rewrite_acks()
+
+    def sync(self) -> None:
+        """버퍼링된 append를 디스크에 fsync"""
+        with self._lock:
+            self._sync_files(force=True)
+
+    def close(self) -> None:
+        with self._lock:
+            self._sync_files(force=True)
+            for handle in (self._active_file, self._ack_file):
+                if handle is not None:
+                    handle.close()
+            self._active_file = None
+            self._ack_file = None
+            self._active = None
+
+    # ---- 내부 구현 ----
+
+    def _load(self) -> None:
+        """최초 접근 시 세그먼트 / acks 복구"""
+        if self._loaded:
+            return
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+
+        max_seq = 0
+        for segment in sorted(self.segment_dir.glob("*.seg"), key=_segment_number):
+            seqs = {record["seq"] for record in self._read_segment(segment)}
+            self._segments[segment] = seqs
+            max_seq = max([max_seq, *seqs])
+
+        ack_path = self.segment_dir / self.ACK_FILE
+        if ack_path.exists():
+            for state in self._read_jsonl(ack_path):
+                if state["op"] in ("ack", "dead"):
+                    self._done.add(state["seq"])
+                    self._retries.pop(state["seq"], None)
+                elif state["op"] == "retry":
+                    self._retries[state["seq"]] = state
+
+        self._next_seq = max_seq + 1
+        self._loaded = True
+
+    def _append_record(self, record: Dict[str, Any], encoded: Optional[bytes] = None) -> Path:
+        """활성 세그먼트에 레코드 append (필요 시 rollover, encoded가 있으면 event 재직렬화 생략)"""
+        if self._active_file is None or self._active_file.tell() >= self.segment_max_bytes:
+            self._roll_segment()
+        if encoded is None:
+            line = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=json_default)
+        else:
+            rest = {k: v for k, v in record.items() if k != "event"}
+            line = json.dumps(rest, ensure_ascii=False, separators=(",", ":"))
+            line = line[:-1] + ',"event":' + encoded.decode("utf-8") + "}"
+        self._active_file.write(line + "\n")
+        self._active_file.flush()
+        self._segments[self._active].add(record["seq"])
+        self._maybe_sync()
+        return self._active
+
+    def _roll_segment(self) -> None:
+        """새 활성 세그먼트 생성"""
+        if self._active_file is not None:
+            self._sync_files(force=True)
+            self._active_file.close()
+
+        last = max(map(_segment_number, self._segments), default=0)
+        self._active = self.segment_dir / f"{last + 1:08d}.seg"
+        self._active_file = open(self._active, "a", encoding="utf-8")
+        self._segments[self._active] = set()
+
+    def _append_ack(self, state: Dict[str, Any]) -> None:
+        """acks.log에 상태 append"""
+        if self._ack_file is None:
+            self._ack_file = open(self.segment_dir / self.ACK_FILE, "a", encoding="utf-8")
+        self._ack_file.write(json.dumps(state, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._ack_file.flush()
+        self._maybe_sync()
+
+    def _mark_done(self, seq: int, op: str) -> None:
+        """ack / dead 처리"""
+        self._load()
+        self._append_ack({"seq": seq, "op": op})
+        self._done.add(seq)
+        self._retries.pop(seq, None)
+        self._claims.pop(seq, None)
+
+    def _maybe_sync(self) -> None:
+        """fsync 배치 조건 확인"""
+        self._unsynced += 1
+        if (self._unsynced >= self.fsync_batch
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self._sync_files(force=True)
+
+    def _sync_files(self, force: bool = False) -> None:
+        """열린 파일 fsync"""
+        if not force and not self._unsynced:
+            return
+        for handle in (self._active_file, self._ack_file):
+            if handle is not None:
+                handle.flush()
+                os.fsync(handle.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _rewrite_acks(self) -> None:
+        """남아있는 세그먼트의 seq 상태만 acks.log에 다시 씀 (atomic replace)"""
+        alive = set().union(*self._segments.values()) if self._segments else set()
+        self._done &= alive
+        self._retries = {seq: state for seq, state in self._retries.items() if seq in alive}
+
+        if self._ack_file is not None:
+            self._ack_file.close()
+            self._ack_file = None
+
+        ack_path = self.segment_dir / self.ACK_FILE
+        tmp_path = ack_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for seq in sorted(self._done):
+                f.write(json.dumps({"seq": seq, "op": "ack"}, separators=(",", ":")) + "\n")
+            for state in self._retries.values():
+                f.write(json.dumps(state, ensure_ascii=False, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, ack_path)
+
+    def _read_segment(self, segment: Path) -> List[Dict[str, Any]]:
+        """세그먼트 레코드 읽기"""
+        return self._read_jsonl(segment)
+
+    @staticmethod
+    def _read_jsonl(path: Path) -> List[Dict[str, Any]]:
+        """JSONL 읽기 (crash로 잘린 마지막 줄은 무시)"""
+        records = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return records
+
+
+def _segment_number(segment: Path) -> int:
+    """세그먼트 파일 번호 (00000012.seg → 12)"""
+    return int(segment.stem)
+
+
+# 경로별 프로세스 공유 segment outbox
+_segment_outboxes: Dict[Path, SegmentLogOutbox] = {}
+_segment_outboxes_lock = threading.Lock()
+
+
+def get_segment_outbox(root: Path, **kwargs) -> SegmentLogOutbox:
+    """
+    outbox 경로별 프로세스 공유 SegmentLogOutbox 가져오기 (최초 호출 시 kwargs로 생성)
+
+    같은 경로에 인스턴스가 둘이면 각자 seq를 할당해 같은 seq가 중복되고,
+    pending()이 seq로 중복을 제거하면서 이벤트가 사라지므로 클라이언트끼리 공유합니다.
+
+    Args:
+        root: outbox 루트
+        **kwargs: SegmentLogOutbox 옵션
+    """
+    key = Path(root).resolve()
+    with _segment_outboxes_lock:
+        outbox = _segment_outboxes.get(key)
+        if outbox is None:
+            outbox = _segment_outboxes[key] = SegmentLogOutbox(root, **kwargs)
+        return outbox
+
+
+class SQLiteOutbox(OutboxStore):
+    """
+    SQLite(WAL) outbox
+
+    outbox/outbox.db 테이블 1개에 이벤트를 보관하며,
+    (status, next_attempt_at) / (task_id, id) / idempotency_key(UNIQUE) 인덱스로
+    재전송 대상만 조회하고 insert 시 중복을 제거합니다.
+    WAL + busy_timeout으로 같은 머신의 여러 프로세스가 하나의 outbox를 공유할 수 있습니다.
+    claim()은 lease_until이 지난 행만 갱신하는 조건부 UPDATE라 한 프로세스만 성공합니다.
+    태스크의 행 중 하나라도 선점 중이면 pending()은 그 태스크 전체를 제외합니다 (태스크별 순서 보장).
+    dead letter 처리된 key로 다시 add()하면 그 행을 pending으로 되살립니다.
+    """
+
+    DB_FILE = "outbox.db"
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            idempotency_key TEXT NOT NULL UNIQUE,
+            task_id TEXT NOT NULL,
+            event TEXT NOT NULL,
+            error TEXT,
+            created_at TEXT NOT NULL,
+            retry_count INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL DEFAULT 0,
+            last_error TEXT,
+            last_retry TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            lease_until REAL NOT NULL DEFAULT 0
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at)",
+        "CREATE INDEX IF NOT EXISTS idx_outbox_task ON outbox (task_id, id)",
+    )
+
+    def __init__(self, root: Path, busy_timeout: float = 30.0):
+        """
+        Args:
+            root: outbox 루트 (DB는 root/outbox.db, dead letter는 root/failed)
+            busy_timeout: 다른 프로세스가 쓰기 잠금을 가진 경우 대기 시간 (초)
+        """
+        self.root = root
+        self.db_path = root / self.DB_FILE
+        self.failed_dir = root / "failed"
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def add(
+        self,
+        event: Dict[str, Any],
+        error: str,
+        created_at: Optional[str] = None,
+        retry_count: int = 0,
+        encoded: Optional[bytes] = None
+    ) -> str:
+        conn = self._connect()
+        key = event["idempotency_key"]
+        data = encoded.decode("utf-8") if encoded is not None else json.dumps(event, ensure_ascii=False, default=json_default)
+        created_at = created_at or datetime.now().isoformat()
+        cursor = conn.execute(
+            """
+            INSERT OR IGNORE INTO outbox
+                (idempotency_key, task_id, event, error, created_at, retry_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (key, event.get("task_id", ""), data, error, created_at, retry_count),
+        )
+        if cursor.rowcount:
+            row_id = cursor.lastrowid
+        else:
+            # 같은 key가 dead letter 상태면 pending으로 되살림 (대기 중이면 중복 저장 안함)
+            conn.execute(
+                """
+                UPDATE outbox
+                SET status = 'pending', event = ?, error = ?, created_at = ?, retry_count = ?,
+                    next_attempt_at = 0, last_error = NULL, last_retry = NULL, lease_until = 0
+                WHERE idempotency_key = ? AND status = 'dead'
+                """,
+                (data, error, created_at, retry_count, key),
+            )
+            row_id = conn.execute(
+                "SELECT id FROM outbox WHERE idempotency_key = ?", (key,)
+            ).fetchone()[0]
+        return f"{self.db_path}#{row_id}"
+
+    def pending(self, due_before: Optional[float] = None) -> List[OutboxEntry]:
+        # 다른 프로세스가 선점 중인(lease가 남은) 행이 있는 태스크는 통째로 제외
+        # (앞 이벤트가 전송 중일 때 뒤 이벤트가 먼저 나가지 않도록)
+        query = """
+            SELECT * FROM outbox o WHERE status = 'pending' AND NOT EXISTS (
+                SELECT 1 FROM outbox l
+                WHERE l.task_id = o.task_id AND l.status = 'pending' AND l.lease_until > ?
+            )
+        """
+        params: tuple = (time.time(),)
+        if due_before is not None:
+            # 같은 태스크의 앞선 이벤트가 아직 대기 중이면 제외 (idx_outbox_task 사용)
+            query += """
+                AND next_attempt_at <= ?
+                AND NOT EXISTS (
+                    SELECT 1 FROM outbox p
+                    WHERE p.task_id = o.task_id AND p.id < o.id
+                      AND p.status = 'pending' AND p.next_attempt_at > ?
+                )
+            """
+            params += (due_before, due_before)
+        rows = self._connect().execute(query + " ORDER BY id", params).fetchall()
+        return [self._to_entry(row) for row in rows]
+
+    def claim(self, entry: OutboxEntry, lease_seconds: float) -> bool:
+        now = time.time()
+        cursor = self._connect().execute(
+            """
+            UPDATE outbox SET lease_until = ?
+            WHERE id = ? AND status = 'pending' AND lease_until <= ?
+            """,
+            (now + lease_seconds, int(entry.entry_id), now),
+        )
+        return cursor.rowcount == 1
+
+    def release(self, entry: OutboxEntry) -> None:
+        self._connect().execute(
+            "UPDATE outbox SET lease_until = 0 WHERE id = ?", (int(entry.entry_id),)
+        )
+
+    def ack(self, entry: OutboxEntry) -> None:
+        self._connect().execute("DELETE FROM outbox WHERE id = ?", (int(entry.entry_id),))
+
+    def record_failure(
+        self,
+        entry: OutboxEntry,
+        error: str,
+        next_attempt_at: Optional[float] = None
+    ) -> None:
+        self._mark_failed(entry, error, next_attempt_at)
+        self._connect().execute(
+            """
+            UPDATE outbox
+            SET retry_count = ?, last_error = ?, last_retry = ?, next_attempt_at = ?, lease_until = 0
+            WHERE id = ?
+            """,
+            (entry.retry_count, entry.last_error, entry.last_retry,
+             entry.next_attempt_at, int(entry.entry_id)),
+        )
+
+    def dead_letter(self, entry: OutboxEntry) -> None:
+        # 운영자가 확인할 수 있도록 기존과 같은 failed/*.json 포맷으로도 보관
+        self.failed_dir.mkdir(parents=True, exist_ok=True)
+        key = entry.event.get("idempotency_key", "").replace(":", "_")
+        filepath = self.failed_dir / f"db{int(entry.entry_id):08d}_{key}.json"
+        filepath.write_text(json.dumps(
+            FileOutbox._to_file_data(entry), ensure_ascii=False, indent=2
+        ))
+        self._connect().execute(
+            "UPDATE outbox SET status = 'dead' WHERE id = ?", (int(entry.entry_id),)
+        )
+
+    def count(self) -> int:
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM outbox WHERE status = 'pending'"
+        ).fetchone()[0]
+
+    def oldest_created_at(self) -> Optional[datetime]:
+        created = self._connect().execute(
+            "SELECT MIN(created_at) FROM outbox WHERE status = 'pending'"
+        ).fetchone()[0]
+        return datetime.fromisoformat(created) if created else None
+
+    def next_due(self) -> Optional[float]:
+        return self._connect().execute(
+            """
+            SELECT MIN(next_attempt_at) FROM outbox o
+            WHERE status = 'pending' AND NOT EXISTS (
+                SELECT 1 FROM outbox p
+                WHERE p.task_id = o.task_id AND p.id < o.id AND p.status = 'pending'
+            )
+            """
+        ).fetchone()[0]
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _connect(self) -> "sqlite3.Connection":
+        """스레드별 연결 (최초 1회 스키마 생성, sqlite3는 이때 import)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        import sqlite3
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            str(self.db_path), timeout=self.busy_timeout, isolation_level=None
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        with self._init_lock:
+            if not self._initialized:
+                for statement in self._SCHEMA:
+                    conn.execute(statement)
+                columns = {row["name"] for row in conn.execute("PRAGMA table_info(outbox)")}
+                if "lease_until" not in columns:
+                    # lease 도입 이전에 만들어진 DB (다른 프로세스가 먼저 추가했으면 무시)
+                    try:
+                        conn.execute("ALTER TABLE outbox ADD COLUMN lease_until REAL NOT NULL DEFAULT 0")
+                    except sqlite3.OperationalError:
+                        pass
+                self._initialized = True
+
+        self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _to_entry(row: "sqlite3.Row") -> OutboxEntry:
+        """DB row → OutboxEntry"""
+        return OutboxEntry(
+            entry_id=str(row["id"]),
+            event=json.loads(row["event"]),
+            error=row["error"] or "",
+            created_at=row["created_at"],
+            retry_count=row["retry_count"],
+            last_error=row["last_error"],
+            last_retry=row["last_retry"],
+            next_attempt_at=row["next_attempt_at"],
+        )
+
+
+def create_outbox(config: JarvisConfig) -> OutboxStore:
+    """config.outbox_backend에 맞는 outbox 생성"""
+    if config.outbox_backend == "file":
+        return FileOutbox(config.outbox_path)
+    if config.outbox_backend == "segment":
+        return get_segment_outbox(
+            config.outbox_path,
+            segment_max_bytes=config.outbox_segment_max_bytes,
+            fsync_batch=config.outbox_fsync_batch,
+            fsync_interval=config.outbox_fsync_interval,
+        )
+    if config.outbox_backend == "sqlite":
+        return SQLiteOutbox(config.outbox_path)
+    raise ValueError(f"Unknown outbox_backend: {config.outbox_backend}")
+
+
+def migrate_outbox(source: OutboxStore, target: OutboxStore) -> int:
+    """
+    source의 대기 이벤트를 target으로 이동 (재시도 횟수 / 생성 시각 유지)
+
+    target에 저장한 뒤 source에서 제거하므로 중간에 중단돼도 유실은 없습니다
+    (최악의 경우 양쪽에 남아 중복 전송 → 서버에서 idempotency key로 dedupe).
+
+    Returns:
+        이동한 이벤트 수
+    """
+    entries = source.pending()
+    for entry in entries:
+        target.add(entry.event, entry.error, entry.created_at, entry.retry_count)
+    target.sync()
+    for entry in entries:
+        source.ack(entry)
+    return len(entries)
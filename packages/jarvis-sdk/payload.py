@@ -0,0 +1,158 @@
+"""
+JARVIS Payload - 크기 제한을 넘는 payload의 결정적 축약
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from .serialization import dumps
+except ImportError:
+    from serialization import dumps
+
+# payload["truncated"] 마커 + 축약 표시 문자열용 여유 바이트
+_MARKER_RESERVE = 160
+
+# 문자열 축약 하한 (이보다 짧게 자르면 읽을 수 없음)
+_MIN_TEXT = 64
+
+
+def clip_text(text: str, limit: int) -> str:
+    """
+    문자열을 앞부분 + 뒷부분만 남기고 축약
+
+    traceback처럼 여러 줄인 문자열은 줄 단위로 잘라
+    첫 프레임과 마지막 예외 메시지가 그대로 남도록 합니다.
+    """
+    if len(text) <= limit:
+        return text
+
+    head_len = limit // 2
+    tail_len = limit - head_len
+    head = text[:head_len]
+    tail = text[len(text) - tail_len:]
+
+    cut = head.rfind("\n")
+    if cut >= head_len // 2:
+        head = head[:cut + 1]
+    cut = tail.find("\n")
+    if 0 <= cut < tail_len // 2:
+        tail = tail[cut + 1:]
+
+    omitted = len(text) - len(head) - len(tail)
+    return f"{head}... [{omitted} chars truncated] ...{tail}"
+
+
+def _clip(value: Any, text_limit: int, item_limit: Optional[int], depth: int = 0) -> Any:
+    """문자열 길이 / 컨테이너 항목 수 제한을 재귀 적용한 사본"""
+    if isinstance(value, str):
+        return clip_text(value, text_limit)
+
+    if isinstance(value, dict):
+        items = list(value.items())
+        clipped = {}
+        # 최상위 key(level, reason 등)는 유지
+        if item_limit is not None and depth > 0 and len(items) > item_limit:
+            clipped["..."] = f"{len(items) - item_limit} keys truncated"
+            items = items[:item_limit]
+        for key, item in items:
+            clipped[key] = _clip(item, text_limit, item_limit, depth + 1)
+        return clipped
+
+    if isinstance(value, (list, tuple)):
+        items = list(value)
+        if item_limit is not None and len(items) > item_limit:
+            head = max(item_limit // 2, 1)
+            tail = item_limit - head
+            marker = f"... [{len(items) - head - tail} items truncated] ..."
+            items = items[:head] + [marker] + (items[len(items) - tail:] if tail else [])
+        return [_clip(item, text_limit, item_limit, depth + 1) for item in items]
+
+    return value
+
+
+def _longest_text(value: Any) -> int:
+    """가장 긴 문자열 길이"""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return max((_longest_text(v) for v in value.values()), default=0)
+    if isinstance(value, (list, tuple)):
+        return max((_longest_text(v) for v in value), default=0)
+    return 0
+
+
+def _largest_container(value: Any, depth: int = 0) -> int:
+    """가장 큰 컨테이너 항목 수 (최상위 dict 제외)"""
+    size = 0
+    if isinstance(value, dict):
+        if depth > 0:
+            size = len(value)
+        children = value.values()
+    elif isinstance(value, (list, tuple)):
+        size = len(value)
+        children = value
+    else:
+        return 0
+    return max([size] + [_largest_container(v, depth + 1) for v in children])
+
+
+def _search(low: int, high: int, fits: Callable[[int], bool]) -> Optional[int]:
+    """fits(n)가 참인 [low, high] 범위의 최댓값 (없으면 None)"""
+    if not fits(low):
+        return None
+    while low < high:
+        mid = (low + high + 1) // 2
+        if fits(mid):
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def fit_payload(
+    payload: Dict[str, Any],
+    max_bytes: int,
+    measure: Callable[[Dict[str, Any]], int]
+) -> Dict[str, Any]:
+    """
+    직렬화 크기가 max_bytes 이내가 되도록 payload를 결정적으로 축약
+
+    1. 긴 문자열을 앞/뒤만 남기고 자름 (허용되는 가장 긴 길이를 이진 탐색)
+    2. 그래도 크면 리스트/중첩 dict 항목 수를 줄임
+    3. 그래도 크면 원본 JSON 미리보기만 남김
+
+    같은 입력에는 항상 같은 결과를 반환하며, 원본 payload는 수정하지 않습니다.
+
+    Args:
+        payload: 원본 payload
+        max_bytes: 이벤트 전체 직렬화 크기 상한
+        measure: payload → 이벤트 전체 직렬화 크기 (bytes)
+
+    Returns:
+        축약된 payload 사본 ("truncated" 마커 포함). 이미 작으면 원본 그대로
+    """
+    original = measure(payload)
+    if original <= max_bytes:
+        return payload
+
+    budget = max_bytes - _MARKER_RESERVE
+    marker = {"original_bytes": original, "max_bytes": max_bytes}
+
+    text_limit = _search(
+        _MIN_TEXT, max(_longest_text(payload), _MIN_TEXT),
+        lambda n: measure(_clip(payload, n, None)) <= budget
+    )
+    if text_limit is not None:
+        return {**_clip(payload, text_limit, None), "truncated": marker}
+
+    item_limit = _search(
+        1, max(_largest_container(payload), 1),
+        lambda n: measure(_clip(payload, _MIN_TEXT, n)) <= budget
+    )
+    if item_limit is not None:
+        return {**_clip(payload, _MIN_TEXT, item_limit), "truncated": marker}
+
+    # 구조를 유지할 수 없을 만큼 큼 → JSON 미리보기만 전송 (문자당 최대 4바이트로 가정)
+    preview_chars = max((budget - measure({})) // 4, 0)
+    preview = dumps(payload).decode("utf-8")
+    return {"preview": clip_text(preview, preview_chars), "truncated": marker}
@@ -0,0 +1,55 @@
+"""
+JARVIS Rate Limiter - 토큰 버킷
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    thread-safe 토큰 버킷
+
+    초당 rate개의 토큰이 채워지며, 최대 burst개까지 모아둘 수 있습니다.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate: 초당 토큰 충전 수
+            burst: 버킷 용량 (기본: 1, 즉 균등 간격)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = burst if burst is not None else 1.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """토큰이 있으면 소비하고 True, 없으면 False (블로킹 없음)"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """토큰이 생길 때까지 대기 후 소비"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def _refill(self) -> None:
+        """경과 시간만큼 토큰 충전 (lock 보유 상태에서 호출)"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
@@ -0,0 +1,295 @@
+"""
+JARVIS Relay - 머신 단위 이벤트 중계 프로세스 (UNIX 소켓)
+
+여러 Worker 프로세스의 JarvisClient가 이벤트를 로컬 relay에 넘기면,
+relay가 배치 / 중복 제거 / 연결 재사용 / 공유 outbox / 재전송을 담당합니다.
+
+Usage:
+    # relay 실행 (머신당 하나)
+    python -m jarvis_sdk.relay --socket /tmp/jarvis-relay.sock
+
+    # Worker 쪽: 환경변수만 설정하면 JarvisClient가 relay 사용
+    export JARVIS_RELAY_SOCKET=/tmp/jarvis-relay.sock
+
+relay가 없거나 응답하지 않으면 JarvisClient는 직접 전송으로 fallback합니다.
+
+Protocol:
+    client → relay: 이벤트 JSON 한 줄 (event.encode() + "\\n")
+    relay → client: 1바이트 응답 ("+" 수락 / "-" 거부)
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Set
+
+ACCEPTED = b"+"
+REJECTED = b"-"
+
+
+class RelayClient:
+    """
+    relay 소켓 연결 (JarvisClient 내부용, thread-safe)
+
+    연결 / 응답 실패 시 retry_interval 동안 relay를 사용하지 않고 직접 전송하게 합니다.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 1.0, retry_interval: float = 5.0):
+        """
+        Args:
+            socket_path: relay UNIX 소켓 경로
+            timeout: 수락 응답 대기 시간 (초)
+            retry_interval: 실패 후 relay 재시도까지 대기 시간 (초)
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        """relay 사용 가능 여부 (최근 실패 후 retry_interval 이내면 False)"""
+        return hasattr(socket, "AF_UNIX") and time.monotonic() >= self._down_until
+
+    def submit(self, data: bytes) -> bool:
+        """
+        직렬화된 이벤트 전달
+
+        Returns:
+            True면 relay가 수락, False면 호출자가 직접 전송해야 함
+        """
+        if not self.available:
+            return False
+
+        with self._lock:
+            for _ in range(2):
+                try:
+                    sock = self._connect()
+                    sock.sendall(data + b"\n")
+                    reply = sock.recv(1)
+                except OSError:
+                    reply = b""
+
+                if reply == ACCEPTED:
+                    return True
+                self._disconnect()
+                if reply == REJECTED:
+                    return False
+                # 연결이 끊긴 경우(relay 재시작 등) 새 연결로 한 번 더 시도
+
+            self._down_until = time.monotonic() + self.retry_interval
+            return False
+
+    def close(self) -> None:
+        """소켓 닫기"""
+        with self._lock:
+            self._disconnect()
+
+    def _connect(self) -> socket.socket:
+        """연결 (lock 보유 상태에서 호출)"""
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+        return self._sock
+
+    def _disconnect(self) -> None:
+        """연결 정리 (lock 보유 상태에서 호출)"""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+
+class _RelayHandler(socketserver.StreamRequestHandler):
+    """Worker 연결 하나: 이벤트 줄 단위 수신 → 큐 전달 → 응답"""
+
+    def setup(self):
+        super().setup()
+        with self.server.relay._lock:
+            self.server.relay._connections.add(self.request)
+
+    def finish(self):
+        with self.server.relay._lock:
+            self.server.relay._connections.discard(self.request)
+        super().finish()
+
+    def handle(self):
+        relay = self.server.relay
+        for line in self.rfile:
+            try:
+                relay.accept(line.rstrip(b"\n"))
+                reply = ACCEPTED
+            except Exception:
+                reply = REJECTED
+            self.wfile.write(reply)
+            self.wfile.flush()
+
+
+class JarvisRelay:
+    """
+    UNIX 소켓 이벤트 relay
+
+    - 수신한 이벤트는 async_delivery 클라이언트 하나로 전달
+      (keep-alive 연결 풀 + /jarvis/events/batch 배치 + 서킷 브레이커)
+    - 최근 idempotency key LRU로 중복 이벤트 제거
+    - 전송 실패 이벤트는 relay의 outbox 하나에 모으고 drainer가 재전송
+    """
+
+    def __init__(self, socket_path: str, client, dedupe_size: int = 10000, drain: bool = True):
+        """
+        Args:
+            socket_path: listen할 UNIX 소켓 경로
+            client: 실제 전송을 담당할 JarvisClient (async_delivery=True 권장)
+            dedupe_size: 중복 확인용 최근 idempotency key 수
+            drain: True면 outbox drainer 스레드 실행
+        """
+        self.socket_path = socket_path
+        self.client = client
+        self.dedupe_size = dedupe_size
+        self.drain = drain
+        self.stats = {"accepted": 0, "duplicates": 0}
+
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connections: Set[socket.socket] = set()
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def accept(self, data: bytes) -> None:
+        """이벤트 한 줄 처리 (중복이면 무시)"""
+        # client.py가 이 모듈을 지연 import하므로 여기서도 지연 import
+        try:
+            from .client import JarvisEvent
+        except ImportError:
+            from client import JarvisEvent
+
+        event = JarvisEvent(**json.loads(data))
+        with self._lock:
+            if event.idempotency_key in self._seen:
+                self._seen.move_to_end(event.idempotency_key)
+                self.stats["duplicates"] += 1
+                return
+            self._seen[event.idempotency_key] = None
+            if len(self._seen) > self.dedupe_size:
+                self._seen.popitem(last=False)
+            self.stats["accepted"] += 1
+
+        event._encoded = data  # 받은 bytes를 그대로 전송에 재사용
+        self.client.send_event(event)
+
+    def start(self) -> "JarvisRelay":
+        """소켓 listen + 서버 스레드 시작"""
+        path = Path(self.socket_path)
+        if path.exists():
+            # 이전 relay가 남긴 소켓 파일 (살아있는 relay가 있으면 중단)
+            if _is_listening(path):
+                raise RuntimeError(f"Relay already running on {path}")
+            path.unlink()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._server = socketserver.ThreadingUnixStreamServer(str(path), _RelayHandler)
+        self._server.daemon_threads = True
+        self._server.relay = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="jarvis-relay", daemon=True
+        )
+        self._thread.start()
+        if self.drain:
+            self.client.start_drainer()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """수신 중단 후 큐 flush (못 보낸 이벤트는 outbox), 소켓 파일 삭제"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        # 연결된 Worker는 다음 전송부터 직접 전송으로 fallback
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.client.close(timeout)
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+
+def _is_listening(path: Path) -> bool:
+    """소켓 파일에 실제로 listen 중인 프로세스가 있는지"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def main(argv=None) -> int:
+    """python -m jarvis_sdk.relay 진입점"""
+    try:
+        from .client import JarvisClient
+        from .config import get_config
+    except ImportError:
+        from client import JarvisClient
+        from config import get_config
+
+    parser = argparse.ArgumentParser(description="JARVIS local event relay")
+    parser.add_argument("--socket", default=os.environ.get("JARVIS_RELAY_SOCKET", ".jarvis/relay.sock"))
+    parser.add_argument("--batch-max-events", type=int, default=50)
+    parser.add_argument("--linger-ms", type=int, default=20)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    parser.add_argument("--no-drain", action="store_true", help="outbox drainer 실행 안 함")
+    args = parser.parse_args(argv)
+
+    if not hasattr(socket, "AF_UNIX"):
+        parser.error("UNIX sockets are not supported on this platform")
+
+    # relay 자신은 relay를 거치지 않고 직접 전송
+    config = dataclasses.replace(
+        get_config(),
+        relay_socket=None,
+        async_delivery=True,
+        batch_max_events=args.batch_max_events,
+        batch_linger_ms=args.linger_ms,
+        queue_max_size=args.queue_size,
+    )
+    relay = JarvisRelay(args.socket, JarvisClient(config), drain=not args.no_drain).start()
+    print(f"JARVIS relay listening on {args.socket}")
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    while not stopped.wait(1.0):
+        pass
+    relay.stop()
+    print(json.dumps(relay.stats))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,233 @@
+"""
+JARVIS Resources - 태스크 실행 구간의 프로세스 자원 사용량
+
+start() ~ stop() 사이의 CPU 시간, context switch, major page fault, I/O 카운터 변화량과
+최대 RSS를 계산하여 task_completed / task_blocked payload(resources)에 붙입니다.
+
+- resource.getrusage (Windows 등 미지원 시 os.times의 CPU 시간만)
+- /proc/self/io (Linux, 읽을 수 없으면 생략)
+- 선택: sample_interval마다 현재 RSS를 읽는 프로세스 공유 sampler 스레드 (태스크 구간 최대 RSS)
+
+측정값은 프로세스 전체 기준이므로, 같은 프로세스에서 동시에 실행되는 태스크의 사용량이 함께 잡힙니다.
+"""
+
+import os
+import sys
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ru_maxrss 단위 (Linux: KB, macOS: bytes)
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+# /proc/self/io 항목 → payload 키
+_PROC_IO_FIELDS = {
+    "rchar": "read_chars",
+    "wchar": "write_chars",
+    "syscr": "read_syscalls",
+    "syscw": "write_syscalls",
+    "read_bytes": "read_bytes",
+    "write_bytes": "write_bytes",
+}
+
+_proc_io_available = sys.platform.startswith("linux")
+
+
+def _read_proc_io() -> Optional[Dict[str, int]]:
+    """/proc/self/io 카운터 (없거나 권한이 없으면 None, 이후로는 시도하지 않음)"""
+    global _proc_io_available
+    if not _proc_io_available:
+        return None
+    try:
+        with open("/proc/self/io", "rb") as f:
+            data = f.read()
+    except OSError:
+        _proc_io_available = False
+        return None
+    counters = {}
+    for line in data.splitlines():
+        name, _, value = line.partition(b":")
+        key = _PROC_IO_FIELDS.get(name.decode("ascii", "replace"))
+        if key is not None:
+            counters[key] = int(value)
+    return counters
+
+
+def current_rss() -> Optional[int]:
+    """현재 RSS (bytes, /proc/self/statm 기준, 읽을 수 없으면 None)"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def snapshot() -> Dict[str, Any]:
+    """현재 프로세스 자원 카운터"""
+    snap: Dict[str, Any] = {"wall": time.perf_counter()}
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        snap["cpu_user"] = usage.ru_utime
+        snap["cpu_system"] = usage.ru_stime
+        snap["max_rss"] = usage.ru_maxrss * _MAXRSS_UNIT
+        snap["voluntary"] = usage.ru_nvcsw
+        snap["involuntary"] = usage.ru_nivcsw
+        snap["major_faults"] = usage.ru_majflt
+    else:
+        times = os.times()
+        snap["cpu_user"] = times.user
+        snap["cpu_system"] = times.system
+    io = _read_proc_io()
+    if io is not None:
+        snap["io"] = io
+    return snap
+
+
+class ResourceProfile:
+    """
+    태스크 1개의 자원 사용 구간
+
+    Usage:
+        profile = ResourceProfile(sample_interval=1.0)
+        profile.start()
+        ...
+        payload["resources"] = profile.stop()
+    """
+
+    def __init__(self, sample_interval: Optional[float] = None):
+        """
+        Args:
+            sample_interval: 현재 RSS 샘플링 주기 (초, None이면 샘플링 스레드 사용 안 함)
+        """
+        self.sample_interval = sample_interval
+        self.rss_peak: Optional[int] = None
+        self.samples = 0
+        self._start: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._start is not None
+
+    def start(self) -> None:
+        """측정 시작"""
+        self._start = snapshot()
+        if self.sample_interval:
+            self.observe(current_rss())
+            get_sampler(self.sample_interval).register(self)
+
+    def observe(self, rss: Optional[int]) -> None:
+        """RSS 샘플 반영 (sampler 스레드에서 호출)"""
+        if rss is None:
+            return
+        with self._lock:
+            self.samples += 1
+            if self.rss_peak is None or rss > self.rss_peak:
+                self.rss_peak = rss
+
+    def stop(self) -> Dict[str, Any]:
+        """
+        측정 종료 후 요약
+
+        Returns:
+            {"wall_seconds", "cpu_user_seconds", "cpu_system_seconds", "cpu_percent",
+             "max_rss_bytes", "ctx_switches": {"voluntary", "involuntary"}, "major_faults",
+             "io": {...}, "rss_peak_bytes", "rss_samples"} (플랫폼에서 얻을 수 있는 항목만)
+        """
+        if self._start is None:
+            return {}
+        end = snapshot()
+        start, self._start = self._start, None
+        if self.sample_interval:
+            get_sampler(self.sample_interval).unregister(self)
+            self.observe(current_rss())
+
+        wall = end["wall"] - start["wall"]
+        cpu_user = end["cpu_user"] - start["cpu_user"]
+        cpu_system = end["cpu_system"] - start["cpu_system"]
+        summary: Dict[str, Any] = {
+            "wall_seconds": round(wall, 6),
+            "cpu_user_seconds": round(cpu_user, 6),
+            "cpu_system_seconds": round(cpu_system, 6),
+            # 100 초과 = 여러 스레드가 동시에 CPU 사용, 낮으면 I/O / 대기 위주
+            "cpu_percent": round((cpu_user + cpu_system) / wall * 100, 1) if wall > 0 else None,
+        }
+        if "max_rss" in end:
+            summary["max_rss_bytes"] = end["max_rss"]  # 프로세스 시작 이후 최대
+            summary["ctx_switches"] = {
+                "voluntary": end["voluntary"] - start["voluntary"],
+                "involuntary": end["involuntary"] - start["involuntary"],
+            }
+            summary["major_faults"] = end["major_faults"] - start["major_faults"]
+        if "io" in end and "io" in start:
+            summary["io"] = {key: value - start["io"].get(key, 0) for key, value in end["io"].items()}
+        if self.rss_peak is not None:
+            summary["rss_peak_bytes"] = self.rss_peak  # 태스크 구간 샘플 최대
+            summary["rss_samples"] = self.samples
+        return summary
+
+
+class _RssSampler:
+    """
+    등록된 ResourceProfile에 현재 RSS를 주기적으로 전달하는 daemon 스레드
+
+    RSS는 프로세스 단위이므로 태스크가 여러 개여도 스레드 하나가 한 번 읽어 모두에 반영하고,
+    등록된 태스크가 없으면 스레드를 종료합니다. (GC된 태스크는 자동으로 빠짐)
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._profiles: "weakref.WeakSet[ResourceProfile]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, profile: ResourceProfile) -> None:
+        with self._lock:
+            self._profiles.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="jarvis-resources", daemon=True
+                )
+                self._thread.start()
+
+    def unregister(self, profile: ResourceProfile) -> None:
+        with self._lock:
+            self._profiles.discard(profile)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            if not self._sample():
+                return
+
+    def _sample(self) -> bool:
+        """등록된 profile에 RSS 1회 반영 (등록된 것이 없으면 스레드 종료 표시 후 False)"""
+        with self._lock:
+            profiles = list(self._profiles)
+            if not profiles:
+                self._thread = None
+                return False
+        rss = current_rss()
+        for profile in profiles:
+            profile.observe(rss)
+        return True
+
+
+# 샘플링 주기별 공유 sampler
+_samplers: Dict[float, _RssSampler] = {}
+_samplers_lock = threading.Lock()
+
+
+def get_sampler(interval: float) -> _RssSampler:
+    """주기별 공유 RSS sampler 반환 (없으면 생성)"""
+    with _samplers_lock:
+        sampler = _samplers.get(interval)
+        if sampler is None:
+            sampler = _samplers[interval] = _RssSampler(interval)
+        return sampler
@@ -0,0 +1,199 @@
+"""
+JARVIS Background Sender - 비동기 이벤트 전송
+"""
+
+import atexit
+import queue
+import threading
+import time
+import weakref
+from typing import Dict, Any, List, Optional
+
+# 종료 시 drain 대상 (클라이언트 수명에 묶이도록 weak 참조)
+_live_senders: "weakref.WeakSet[BackgroundSender]" = weakref.WeakSet()
+
+
+class BackgroundSender:
+    """
+    bounded 큐 + daemon 스레드 기반 이벤트 전송기
+
+    - submit(): 큐에 넣고 즉시 반환 (worker 스레드 블로킹 없음)
+    - batch_max_events > 1이면 개수/바이트/linger 기준으로 묶어서 배치 전송
+    - 큐가 가득 차면 이벤트를 바로 outbox에 저장 (유실 없음)
+    - 전송 스레드는 유휴 상태가 이어지면 종료되고, 다음 submit() 때 재시작
+    - 프로세스 종료 시 atexit에서 flush, 남은 이벤트는 outbox로 이동
+    """
+
+    def __init__(self, client, max_size: int = 1000, idle_timeout: float = 5.0):
+        """
+        Args:
+            client: 실제 전송을 수행할 JarvisClient
+            max_size: 큐 최대 크기
+            idle_timeout: 전송 스레드 유휴 종료 대기 시간 (초)
+        """
+        self._client = client
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_size)
+        self._idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._inflight: List[Any] = []
+        self._carry = None
+        self._closed = False
+        _live_senders.add(self)
+
+    def submit(self, event) -> Dict[str, Any]:
+        """이벤트를 큐에 넣고 즉시 반환"""
+        if self._closed:
+            return self._outbox(event, "sender closed", "outboxed_sender_closed")
+
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._client.metrics.queue_overflow.inc()
+            return self._outbox(event, "queue full", "outboxed_queue_full")
+
+        self._ensure_thread()
+        return {"status": "queued", "idempotency_key": event.idempotency_key}
+
+    def pending(self) -> int:
+        """아직 처리되지 않은 이벤트 수 (전송 중 포함)"""
+        return self._queue.unfinished_tasks
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        큐가 빌 때까지 대기
+
+        Returns:
+            True면 모든 이벤트 처리 완료, False면 timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                if deadline is None:
+                    self._queue.all_tasks_done.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        flush 후 종료. timeout 내에 못 보낸 이벤트는 outbox에 저장
+        (전송 중이던 이벤트는 중복될 수 있지만 idempotency key로 서버에서 dedupe)
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        if self.flush(timeout):
+            return
+
+        leftovers = list(self._inflight)
+        if self._carry is not None:
+            leftovers.append(self._carry)
+        while True:
+            try:
+                leftovers.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            self._queue.task_done()
+
+        for event in leftovers:
+            self._outbox(event, "not delivered before shutdown", "outboxed_shutdown")
+
+    def _ensure_thread(self):
+        """전송 스레드가 없으면 시작"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="jarvis-sender", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        """전송 루프"""
+        while True:
+            if self._carry is not None:
+                event, self._carry = self._carry, None
+            else:
+                try:
+                    event = self._queue.get(timeout=self._idle_timeout)
+                except queue.Empty:
+                    with self._lock:
+                        # 종료 직전에 들어온 이벤트가 없을 때만 스레드 종료
+                        if self._queue.empty():
+                            self._thread = None
+                            return
+                    continue
+
+            batch = self._collect_batch(event)
+            self._inflight = batch
+            try:
+                if len(batch) == 1:
+                    self._client._deliver(batch[0])
+                else:
+                    self._client.send_batch(batch)
+            except Exception as e:
+                # strict 모드 4xx 등 - 호출자에게 전파할 수 없으므로 outbox 보관
+                for item in batch:
+                    self._outbox(item, str(e), "outboxed_background_error")
+            finally:
+                self._inflight = []
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _collect_batch(self, first) -> List[Any]:
+        """
+        개수 / 바이트 크기 / linger 시간 기준으로 이벤트 묶기
+
+        바이트 한도를 넘기는 이벤트는 다음 배치의 첫 이벤트로 넘김
+        """
+        config = self._client.config
+        batch = [first]
+        if config.batch_max_events <= 1:
+            return batch
+
+        max_bytes = config.payload_max_size_kb * 1024
+        size = len(self._client._encode_event(first))
+        deadline = time.monotonic() + config.batch_linger_ms / 1000
+
+        while len(batch) < config.batch_max_events:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    event = self._queue.get(timeout=remaining)
+                else:
+                    event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            event_size = len(self._client._encode_event(event))
+            if size + event_size > max_bytes:
+                self._carry = event
+                break
+            batch.append(event)
+            size += event_size
+
+        return batch
+
+    def _outbox(self, event, error: str, action: str) -> Dict[str, Any]:
+        """큐를 거치지 않고 outbox에 저장"""
+        path = self._client._save_to_outbox(event, error)
+        self._client._log_event(event, action, {"error": error, "path": str(path)})
+        self._client.metrics.events.inc(event.event_type, "outboxed")
+        return {"status": "outboxed", "path": str(path)}
+
+
+def _drain_all():
+    """프로세스 종료 시 모든 sender drain"""
+    for sender in list(_live_senders):
+        try:
+            sender.close(timeout=sender._client.config.flush_timeout_seconds)
+        except Exception:
+            pass
+
+
+atexit.register(_drain_all)
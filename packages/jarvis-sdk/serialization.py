@@ -0,0 +1,45 @@
+"""
+JARVIS Serialization - compact JSON 인코딩 (orjson 있으면 사용)
+"""
+
+import dataclasses
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json 사용
+    orjson = None
+
+# 사용 중인 JSON 인코더 ("orjson" | "json")
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def json_default(obj: Any) -> Any:
+    """
+    JSON 기본 타입이 아닌 값 변환 (json.dumps / orjson.dumps의 default)
+
+    payload 안의 dataclass(TaskResult 등)는 dataclasses.asdict로 변환합니다
+    (JarvisEvent가 dataclass였을 때의 to_dict()와 같은 결과).
+    """
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    공백 없는 UTF-8 JSON bytes로 직렬화
+
+    orjson이 설치되어 있으면 사용하고, orjson이 처리하지 못하는 값
+    (문자열이 아닌 dict key 등)은 표준 json으로 다시 시도합니다.
+    dataclass는 두 인코더 모두 json_default(asdict)로 변환하므로 결과가 같습니다.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=json_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+        except TypeError:
+            pass
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), default=json_default
+    ).encode("utf-8")
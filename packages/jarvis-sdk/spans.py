@@ -0,0 +1,166 @@
+"""
+JARVIS Spans - 태스크 내부 단계별 시간 측정 (trace_id / parent_span_id)
+
+span은 이벤트로 하나씩 보내지 않고 로컬에 모아 두었다가,
+task_completed / task_blocked payload에 요약(payload.spans)으로 붙입니다.
+
+Usage:
+    with task.span("download"):
+        with task.span("fetch"):
+            ...
+        with task.span("parse"):
+            ...
+"""
+
+import contextvars
+import heapq
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .ids import new_span_id
+except ImportError:
+    from ids import new_span_id
+
+# 현재 실행 중인 span (스레드 / asyncio task별로 분리)
+_current_span = contextvars.ContextVar("jarvis_current_span", default=None)
+
+
+class Span:
+    """실행 중인 span 1개 (시각은 time.perf_counter() 기준)"""
+
+    __slots__ = ("name", "path", "span_id", "parent_span_id", "depth", "recorder", "started")
+
+    def __init__(self, name: str, parent: Optional["Span"], recorder: "SpanRecorder"):
+        self.name = name
+        self.path = f"{parent.path}/{name}" if parent is not None else name
+        self.span_id = new_span_id()
+        self.parent_span_id = parent.span_id if parent is not None else None
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.recorder = recorder
+        self.started = time.perf_counter()
+
+    @property
+    def trace_id(self) -> str:
+        return self.recorder.trace_id
+
+
+class SpanRecorder:
+    """
+    태스크 1개의 span 기록 (thread-safe)
+
+    - 경로(부모/자식 이름)별 횟수 / 합계 / 최대 시간은 모든 span을 집계 (경로 수는 max_paths까지)
+    - 개별 span(id / 부모 id / 시작 오프셋)은 가장 오래 걸린 max_records개만 보관
+    """
+
+    def __init__(self, trace_id: str, max_records: int = 20, max_paths: int = 50):
+        """
+        Args:
+            trace_id: 태스크 trace ID
+            max_records: 요약에 넣을 개별 span 수 (소요 시간 상위)
+            max_paths: 집계할 최대 경로 수 (초과분은 dropped_paths로 개수만 보고)
+        """
+        self.trace_id = trace_id
+        self.max_records = max_records
+        self.max_paths = max_paths
+        self.count = 0
+
+        self._origin = time.perf_counter()
+        self._paths: Dict[str, List[float]] = {}  # path → [횟수, 합계(초), 최대(초), 에러 수]
+        self._slowest: List[Tuple[float, int, Dict[str, Any]]] = []  # (소요 시간, 순번, 기록) min-heap
+        self._dropped_paths = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        """
+        span 기록 context manager (같은 스레드 / asyncio task 안에서 중첩 가능)
+
+        블록에서 예외가 나면 에러로 기록하고 예외는 그대로 전파합니다.
+        """
+        parent = _current_span.get()
+        if parent is not None and parent.recorder is not self:
+            parent = None  # 다른 태스크의 span 안에서 시작한 경우 최상위 span
+        span = Span(name, parent, self)
+        token = _current_span.set(span)
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - span.started
+            _current_span.reset(token)
+            self._record(span, duration, error)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        payload.spans 요약
+
+        Returns:
+            {"trace_id", "count", "paths": {path: {"count", "total_ms", "max_ms"[, "errors"]}},
+             "slowest": [{"name", "span_id", "parent_span_id", "start_ms", "duration_ms"[, "error"]}],
+             "dropped_paths"(초과 시)}
+        """
+        with self._lock:
+            paths = {}
+            for path, (count, total, longest, errors) in self._paths.items():
+                stats: Dict[str, Any] = {
+                    "count": int(count),
+                    "total_ms": _ms(total),
+                    "max_ms": _ms(longest),
+                }
+                if errors:
+                    stats["errors"] = int(errors)
+                paths[path] = stats
+            slowest = sorted((record for _, _, record in self._slowest), key=lambda r: r["start_ms"])
+            summary = {"trace_id": self.trace_id, "count": self.count, "paths": paths, "slowest": slowest}
+            if self._dropped_paths:
+                summary["dropped_paths"] = self._dropped_paths
+        return summary
+
+    def _record(self, span: Span, duration: float, error: Optional[str]) -> None:
+        """끝난 span 집계"""
+        record = {
+            "name": span.name,
+            "span_id": span.span_id,
+            "parent_span_id": span.parent_span_id,
+            "start_ms": _ms(span.started - self._origin),
+            "duration_ms": _ms(duration),
+        }
+        if error is not None:
+            record["error"] = error
+
+        with self._lock:
+            self.count += 1
+            stats = self._paths.get(span.path)
+            if stats is None and len(self._paths) < self.max_paths:
+                stats = self._paths[span.path] = [0, 0.0, 0.0, 0]
+            if stats is not None:
+                stats[0] += 1
+                stats[1] += duration
+                stats[2] = max(stats[2], duration)
+                stats[3] += error is not None
+            else:
+                self._dropped_paths += 1
+
+            if self.max_records <= 0:
+                return
+            item = (duration, self.count, record)
+            if len(self._slowest) < self.max_records:
+                heapq.heappush(self._slowest, item)
+            elif duration > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, item)
+
+
+def current_span() -> Optional[Span]:
+    """현재 스레드 / asyncio task에서 실행 중인 span (없으면 None)"""
+    return _current_span.get()
+
+
+def _ms(seconds: float) -> float:
+    """초 → 밀리초 (µs 단위 반올림)"""
+    return round(seconds * 1000, 3)
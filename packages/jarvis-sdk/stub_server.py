@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+JARVIS Stub Server - 로컬 MindCollab /jarvis/events 대역 서버
+
+테스트 / 부하 테스트용으로 실제 API 대신 사용합니다.
+
+- POST /jarvis/events, /jarvis/events/batch (idempotency key dedupe)
+- GET /jarvis/events/stream?cursor=&limit=&timeout= (수신 이벤트 long-poll 구독)
+- 응답 지연, 5xx / 4xx 주입, 응답 없이 연결 끊기
+- gzip 요청 body (Content-Encoding: gzip)
+
+Usage:
+    # 프로세스 내
+    with StubServer(latency=0.005, error_rate=0.1) as server:
+        config = JarvisConfig(api_base_url=server.api_url, api_key="stub")
+
+    # 독립 프로세스
+    python stub_server.py --port 8765 --latency-ms 5 --error-rate 0.1
+"""
+
+import argparse
+import gzip
+import json
+import random
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# stream 요청당 최대 이벤트 수 / long-poll 최대 대기 시간 (초)
+STREAM_MAX_LIMIT = 1000
+STREAM_MAX_TIMEOUT = 60.0
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """/jarvis/events, /jarvis/events/batch, /jarvis/events/stream 핸들러"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        """
+        /jarvis/events/stream long-poll
+
+        cursor 이후 이벤트가 없으면 새 이벤트가 들어오거나 timeout이 지날 때까지 대기합니다.
+        장애 주입(fail_next / *_rate)은 POST에만 적용됩니다.
+        """
+        parts = urlsplit(self.path)
+        if not parts.path.endswith("/jarvis/events/stream"):
+            self._respond(404, {"error": "not found"})
+            return
+        query = parse_qs(parts.query)
+        try:
+            cursor = int(query.get("cursor", ["0"])[0] or 0)
+            limit = min(max(int(query.get("limit", ["100"])[0]), 1), STREAM_MAX_LIMIT)
+            timeout = min(max(float(query.get("timeout", ["0"])[0]), 0.0), STREAM_MAX_TIMEOUT)
+        except ValueError:
+            self._respond(400, {"error": "invalid cursor / limit / timeout"})
+            return
+        self._respond(200, self.server.read_stream(cursor, limit, timeout))
+
+    def do_POST(self):
+        server = self.server
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        wire_size = len(raw)
+        outcome = server.next_outcome()
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if outcome == "drop":
+            # 응답 없이 연결 종료 (클라이언트는 RemoteDisconnected / 재연결)
+            self.close_connection = True
+            return
+        if isinstance(outcome, int):
+            self._respond(outcome, {"error": "injected", "status": outcome})
+            return
+
+        if self.headers.get("Content-Encoding") == "gzip":
+            if not server.accept_gzip:
+                self._respond(415, {"error": "gzip not supported"})
+                return
+            raw = gzip.decompress(raw)
+
+        try:
+            body = json.loads(raw)
+        except ValueError:
+            self._respond(400, {"error": "invalid json"})
+            return
+
+        with server.lock:
+            server.requests.append((self.path, body))
+            server.body_sizes.append(wire_size)
+            if self.path.endswith("/jarvis/events/batch"):
+                response = {"results": [server.accept(e) for e in body["events"]]}
+            elif self.path.endswith("/jarvis/events"):
+                response = server.accept(body)
+            else:
+                response = None
+
+        if response is None:
+            self._respond(404, {"error": "not found"})
+            return
+        self._respond(200, response)
+
+        if server.drop_after_response:
+            # keep-alive 응답 후 서버 측에서 연결 종료 (stale 연결 재현)
+            self.close_connection = True
+
+    def _respond(self, status: int, response: Dict[str, Any]) -> None:
+        """JSON 응답"""
+        data = json.dumps(response).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    idempotency key dedupe를 지원하는 로컬 /jarvis/events 서버
+
+    응답 결과는 fail_next()로 예약한 순서가 먼저 적용되고,
+    이후 drop_rate → error_rate(5xx) → client_error_rate(4xx) 확률로 결정됩니다.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        client_error_rate: float = 0.0,
+        client_error_status: int = 400,
+        drop_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            host, port: listen 주소 (port=0이면 임의 포트)
+            latency: 요청당 응답 지연 (초)
+            error_rate: 5xx 응답 확률
+            error_status: 주입할 5xx 상태 코드
+            client_error_rate: 4xx 응답 확률
+            client_error_status: 주입할 4xx 상태 코드
+            drop_rate: 응답 없이 연결을 끊을 확률
+            seed: 주입 난수 seed (재현용)
+        """
+        super().__init__((host, port), _StubHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.client_error_rate = client_error_rate
+        self.client_error_status = client_error_status
+        self.drop_rate = drop_rate
+        self.drop_after_response = False
+        self.accept_gzip = True
+
+        self.lock = threading.Lock()
+        self.stream_ready = threading.Condition(self.lock)  # 새 이벤트 수신 알림 (long-poll)
+        self.stream: List[Dict[str, Any]] = []  # 수신 순서대로 저장된 이벤트 (index + 1 = cursor)
+        self.requests: List[Tuple[str, Dict[str, Any]]] = []
+        self.body_sizes: List[int] = []
+        self.seen: Dict[str, str] = {}
+        self.connections = 0
+        self.counters = {"created": 0, "duplicate": 0, "5xx": 0, "4xx": 0, "drops": 0}
+
+        self._random = random.Random(seed)
+        self._scheduled: Deque[Any] = deque()
+        self._thread: Optional[threading.Thread] = None
+
+    def handle_error(self, request, client_address) -> None:
+        """응답 전에 클라이언트가 끊은 연결(요청 취소 / timeout)은 traceback 없이 무시"""
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    @property
+    def api_url(self) -> str:
+        """JarvisConfig.api_base_url로 쓸 주소"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self) -> "StubServer":
+        """백그라운드 스레드에서 serve 시작"""
+        self._thread = threading.Thread(target=self.serve_forever, name="jarvis-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """serve 중단 + 소켓 닫기"""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.stop()
+        return False
+
+    def fail_next(self, count: int = 1, status: Any = 503) -> None:
+        """
+        다음 count개 요청의 결과 예약
+
+        Args:
+            status: HTTP 상태 코드 또는 "drop" (응답 없이 연결 종료)
+        """
+        with self.lock:
+            self._scheduled.extend([status] * count)
+
+    def next_outcome(self) -> Any:
+        """이번 요청 결과: None(정상) / 상태 코드 / "drop" """
+        with self.lock:
+            if self._scheduled:
+                outcome = self._scheduled.popleft()
+            else:
+                roll = self._random.random()
+                if roll < self.drop_rate:
+                    outcome = "drop"
+                elif roll < self.drop_rate + self.error_rate:
+                    outcome = self.error_status
+                elif roll < self.drop_rate + self.error_rate + self.client_error_rate:
+                    outcome = self.client_error_status
+                else:
+                    outcome = None
+
+            if outcome == "drop":
+                self.counters["drops"] += 1
+            elif isinstance(outcome, int):
+                self.counters["5xx" if outcome >= 500 else "4xx"] += 1
+            return outcome
+
+    def accept(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """이벤트 수신 처리 (lock 보유 상태에서 호출)"""
+        key = event["idempotency_key"]
+        if key in self.seen:
+            self.counters["duplicate"] += 1
+            return {"idempotency_key": key, "status": "duplicate", "event_id": self.seen[key]}
+        self.seen[key] = f"evt_{len(self.seen) + 1}"
+        self.counters["created"] += 1
+        self.stream.append({**event, "event_id": self.seen[key], "cursor": str(len(self.stream) + 1)})
+        self.stream_ready.notify_all()
+        return {"idempotency_key": key, "status": "created", "event_id": self.seen[key]}
+
+    def read_stream(self, cursor: int, limit: int, timeout: float) -> Dict[str, Any]:
+        """
+        cursor 이후 이벤트 최대 limit건 (없으면 timeout까지 대기)
+
+        Returns:
+            {"events": [...], "cursor": 다음 요청에 쓸 cursor}
+        """
+        with self.stream_ready:
+            self.stream_ready.wait_for(lambda: len(self.stream) > cursor, timeout)
+            events = self.stream[cursor:cursor + limit]
+        return {"events": events, "cursor": str(cursor + len(events))}
+
+    def stats(self) -> Dict[str, int]:
+        """요청 / 이벤트 / 주입 통계"""
+        with self.lock:
+            return {
+                "requests": len(self.requests),
+                "unique_events": len(self.seen),
+                "connections": self.connections,
+                **self.counters,
+            }
+
+
+def start_subprocess(**options) -> Tuple[subprocess.Popen, str]:
+    """
+    독립 프로세스로 stub 서버 실행
+
+    Args:
+        **options: main() 인자 (latency_ms, error_rate, drop_rate, ...)
+
+    Returns:
+        (프로세스, api_url). 종료는 process.terminate(),
+        최종 stats()는 종료 후 process.communicate()의 stderr (JSON)
+    """
+    args = [sys.executable, str(Path(__file__).resolve()), "--port", str(options.pop("port", 0))]
+    for name, value in options.items():
+        args += [f"--{name.replace('_', '-')}", str(value)]
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    line = process.stdout.readline().strip()  # "listening on <api_url>"
+    if not line.startswith("listening on "):
+        process.terminate()
+        raise RuntimeError(f"Stub server failed to start: {line!r}")
+    return process, line[len("listening on "):]
+
+
+def _raise_interrupt(signum, frame):
+    """SIGTERM → KeyboardInterrupt (통계 출력 후 종료)"""
+    raise KeyboardInterrupt
+
+
+def main(argv=None) -> int:
+    """python stub_server.py 진입점"""
+    parser = argparse.ArgumentParser(description="Local MindCollab /jarvis/events stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="5xx 응답 확률")
+    parser.add_argument("--client-error-rate", type=float, default=0.0, help="4xx 응답 확률")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="응답 없이 연결 끊을 확률")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = StubServer(
+        args.host,
+        args.port,
+        latency=args.latency_ms / 1000,
+        error_rate=args.error_rate,
+        client_error_rate=args.client_error_rate,
+        drop_rate=args.drop_rate,
+        seed=args.seed,
+    )
+    print(f"listening on {server.api_url}", flush=True)
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats()), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,269 @@
+"""
+JARVIS Subscriber - PM 측 이벤트 구독 (cursor 기반 long-poll)
+
+MindCollab의 /jarvis/events/stream을 long-poll로 구독하여 받은 이벤트를
+로컬 inbox(JSONL)에 배치 단위로 append하고, 마지막 cursor를 저장해
+재시작 후에도 이미 받은 이벤트를 다시 읽지 않고 이어서 받습니다.
+
+Usage:
+    subscriber = JarvisSubscriber()
+    for event in subscriber.stream():
+        handle(event)
+
+    # 백그라운드 스레드
+    subscriber.start(handler=handle)
+    ...
+    subscriber.stop()
+
+    # 독립 프로세스 (Push Daemon 대신 inbox.jsonl 기록)
+    python -m jarvis_sdk.subscriber --inbox .jarvis/inbox.jsonl
+
+Protocol:
+    GET {api_base_url}/jarvis/events/stream?cursor=<cursor>&limit=<n>&timeout=<초>
+    → {"events": [...], "cursor": "<다음 요청에 쓸 cursor>"}
+"""
+
+import argparse
+import http.client
+import io
+import json
+import os
+import signal
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlencode
+
+try:
+    from .config import JarvisConfig, get_config
+    from .connection import get_pool, uses_proxy
+    from .serialization import dumps
+except ImportError:
+    from config import JarvisConfig, get_config
+    from connection import get_pool, uses_proxy
+    from serialization import dumps
+
+# 요청 실패 시 재시도 대기 상한 (초)
+MAX_BACKOFF = 30.0
+
+
+class JarvisSubscriber:
+    """
+    이벤트 스트림 구독자
+
+    inbox에 배치를 append(+fsync)한 뒤 cursor를 저장하므로, 그 사이에 프로세스가 죽으면
+    재시작 후 마지막 배치가 inbox에 한 번 더 기록될 수 있습니다 (at-least-once, event_id로 구분).
+    """
+
+    def __init__(
+        self,
+        config: Optional[JarvisConfig] = None,
+        inbox_path: Optional[Path] = None,
+        cursor_path: Optional[Path] = None,
+        batch_size: Optional[int] = None,
+        poll_timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            config: JarvisConfig 인스턴스
+            inbox_path: 이벤트를 append할 JSONL 파일 (기본 config.inbox_path)
+            cursor_path: 마지막 cursor 저장 파일 (기본 <inbox_path>.cursor)
+            batch_size: 요청당 최대 이벤트 수 (기본 config.subscribe_batch_size)
+            poll_timeout: long-poll 대기 시간 (기본 config.subscribe_poll_timeout)
+        """
+        self.config = config or get_config()
+        self.inbox_path = Path(inbox_path or self.config.inbox_path)
+        self.cursor_path = (
+            Path(cursor_path) if cursor_path
+            else self.inbox_path.with_name(self.inbox_path.name + ".cursor")
+        )
+        self.batch_size = batch_size or self.config.subscribe_batch_size
+        self.poll_timeout = (
+            self.config.subscribe_poll_timeout if poll_timeout is None else poll_timeout
+        )
+        self.cursor: Optional[str] = self._load_cursor()
+        self.stats = {"polls": 0, "events": 0, "errors": 0, "handler_errors": 0}
+
+        self._lock = threading.Lock()  # poll 직렬화 (inbox 기록 → cursor 저장 순서 보장)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        한 번 요청해서 받은 이벤트를 inbox에 기록하고 cursor 저장
+
+        Args:
+            timeout: long-poll 대기 시간 (None이면 poll_timeout, 0이면 즉시 응답)
+
+        Returns:
+            받은 이벤트 목록 (새 이벤트가 없으면 빈 목록)
+
+        Raises:
+            urllib.error.URLError, OSError: 요청 실패 (cursor는 그대로)
+        """
+        wait = self.poll_timeout if timeout is None else timeout
+        with self._lock:
+            response = self._fetch(self.cursor, wait)
+            events = response.get("events") or []
+            if events:
+                self._append_inbox(events)
+            next_cursor = response.get("cursor")
+            if next_cursor is not None and str(next_cursor) != self.cursor:
+                self._save_cursor(str(next_cursor))
+            self.stats["polls"] += 1
+            self.stats["events"] += len(events)
+        return events
+
+    def stream(self) -> Iterator[Dict[str, Any]]:
+        """
+        stop()까지 이벤트를 하나씩 yield
+
+        요청이 실패하면 지수 백오프(retry_backoff_base, 최대 MAX_BACKOFF초) 후 같은 cursor로 재시도합니다.
+        """
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                events = self.poll()
+            except (OSError, ValueError, http.client.HTTPException):
+                failures += 1
+                self.stats["errors"] += 1
+                self._stop.wait(self._backoff(failures))
+                continue
+            failures = 0
+            yield from events
+
+    def start(self, handler: Optional[Callable[[Dict[str, Any]], None]] = None) -> "JarvisSubscriber":
+        """
+        백그라운드 스레드에서 구독 시작
+
+        Args:
+            handler: 이벤트마다 호출할 함수 (None이면 inbox 기록만)
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(handler,), name="jarvis-subscriber", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        구독 종료
+
+        진행 중인 long-poll은 응답(새 이벤트 또는 poll_timeout)이 올 때까지 끝나지 않으므로
+        timeout을 주면 그만큼만 기다립니다. 받은 배치는 기록된 뒤 종료됩니다.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self, handler: Optional[Callable[[Dict[str, Any]], None]]) -> None:
+        """구독 루프"""
+        for event in self.stream():
+            if handler is None:
+                continue
+            try:
+                handler(event)
+            except Exception:
+                self.stats["handler_errors"] += 1
+
+    def _backoff(self, failures: int) -> float:
+        """연속 실패 횟수별 재시도 대기 시간 (초)"""
+        return min(self.config.retry_backoff_base * (2 ** (failures - 1)), MAX_BACKOFF)
+
+    def _fetch(self, cursor: Optional[str], wait: float) -> Dict[str, Any]:
+        """stream 요청 + JSON 응답 파싱"""
+        query: Dict[str, Any] = {"limit": self.batch_size, "timeout": wait}
+        if cursor is not None:
+            query["cursor"] = cursor
+        url = f"{self.config.api_base_url}/jarvis/events/stream?{urlencode(query)}"
+        headers = {
+            "Accept": "application/json",
+            "X-Jarvis-API-Key": self.config.api_key or "",
+        }
+        timeout = wait + self.config.timeout_seconds  # 서버 대기 시간 + 응답 여유
+
+        if self.config.keep_alive and not uses_proxy(url):
+            status, reason, response_headers, body = get_pool().request(
+                "GET", url, headers=headers, timeout=timeout
+            )
+            if status >= 400:
+                raise urllib.error.HTTPError(url, status, reason, response_headers, io.BytesIO(body))
+            return json.loads(body.decode("utf-8"))
+
+        request = urllib.request.Request(url, headers=headers, method="GET")
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def _append_inbox(self, events: List[Dict[str, Any]]) -> None:
+        """배치를 inbox에 한 번에 append (이벤트당 한 줄)"""
+        self.inbox_path.parent.mkdir(parents=True, exist_ok=True)
+        data = b"".join(dumps(event) + b"\n" for event in events)
+        with open(self.inbox_path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _load_cursor(self) -> Optional[str]:
+        """저장된 cursor (없으면 None = 처음부터)"""
+        try:
+            return self.cursor_path.read_text(encoding="utf-8").strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _save_cursor(self, cursor: str) -> None:
+        """cursor 저장 (임시 파일 → rename으로 원자적 교체)"""
+        self.cursor_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cursor_path.with_name(self.cursor_path.name + ".tmp")
+        tmp.write_text(cursor, encoding="utf-8")
+        os.replace(tmp, self.cursor_path)
+        self.cursor = cursor
+
+
+def main(argv=None) -> int:
+    """python -m jarvis_sdk.subscriber 진입점"""
+    parser = argparse.ArgumentParser(description="JARVIS event subscriber (PM side)")
+    parser.add_argument("--inbox", type=Path, default=None, help="이벤트를 append할 JSONL 파일")
+    parser.add_argument("--cursor-file", type=Path, default=None, help="cursor 저장 파일")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--poll-timeout", type=float, default=None)
+    parser.add_argument("--once", action="store_true", help="한 번만 요청 후 종료")
+    parser.add_argument("--print", dest="echo", action="store_true", help="받은 이벤트를 stdout에도 출력")
+    args = parser.parse_args(argv)
+
+    subscriber = JarvisSubscriber(
+        inbox_path=args.inbox,
+        cursor_path=args.cursor_file,
+        batch_size=args.batch_size,
+        poll_timeout=args.poll_timeout,
+    )
+
+    def echo(event: Dict[str, Any]) -> None:
+        print(json.dumps(event, ensure_ascii=False), flush=True)
+
+    if args.once:
+        events = subscriber.poll(timeout=0)
+        if args.echo:
+            for event in events:
+                echo(event)
+        print(json.dumps({"events": len(events), "cursor": subscriber.cursor}))
+        return 0
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+
+    subscriber.start(handler=echo if args.echo else None)
+    while not stopped.wait(1.0):
+        pass
+    subscriber.stop(timeout=1.0)
+    print(json.dumps({**subscriber.stats, "cursor": subscriber.cursor}))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
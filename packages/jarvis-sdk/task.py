@@ -3,29 +3,405 @@ JARVIS Task - Context Manager for IPC Events
 """
 
 import os
+import threading
+import time
 import traceback
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import ContextManager, Dict, Any, List, Optional, Tuple, Union
 from dataclasses import dataclass
 
 try:
-    from .client import JarvisClient, JarvisEvent
+    from .artifacts import ArtifactStore, create_artifact_store, spill_large_values, store_artifacts
+    from .client import JarvisClient, JarvisEvent, get_client
     from .config import JarvisConfig, get_config
+    from .ratelimit import TokenBucket
+    from .ids import resolve_run_id, resolve_trace_id
+    from .spans import Span, SpanRecorder
+    from .resources import ResourceProfile
+    from .heartbeat import TaskHeartbeat
 except ImportError:
-    from client import JarvisClient, JarvisEvent
+    from artifacts import ArtifactStore, create_artifact_store, spill_large_values, store_artifacts
+    from client import JarvisClient, JarvisEvent, get_client
     from config import JarvisConfig, get_config
+    from ratelimit import TokenBucket
+    from ids import resolve_run_id, resolve_trace_id
+    from spans import Span, SpanRecorder
+    from resources import ResourceProfile
+    from heartbeat import TaskHeartbeat
+
+# 빈도 제한 없이 항상 전송되는 로그 레벨
+_UNCOALESCED_LEVELS = ("warning", "error")
 
 
 @dataclass
 class TaskResult:
-    """태스크 결과"""
+    """태스크 결과 (complete()에 그대로 전달 가능)"""
     status: str  # 'success', 'partial', 'failed'
     summary: str
     data: Optional[Dict[str, Any]] = None
-    artifacts: Optional[list] = None
+    artifacts: Optional[list] = None  # bytes / 파일 경로 / 저장된 artifact 참조
+
+
+class _TaskBase:
+    """JarvisTask / AsyncJarvisTask 공통 상태 및 이벤트 생성"""
+
+    def __init__(
+        self,
+        task_id: str,
+        node_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        project_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        config: Optional[JarvisConfig] = None,
+        strict: bool = False,
+        run_id: Optional[str] = None,
+        trace_id: Optional[str] = None
+    ):
+        self.task_id = task_id
+        self.node_id = node_id
+        self.worker_id = worker_id or os.environ.get("JARVIS_WORKER_ID", "unknown")
+        # 이 실행의 모든 이벤트 key에 들어감 (같은 run_id로 재실행하면 같은 key)
+        self.run_id = resolve_run_id(run_id)
+        # 모든 이벤트의 trace_id (span의 parent_span_id와 함께 PM이 단계별 시간 추적)
+        self.trace_id = resolve_trace_id(trace_id)
+        self.project_id = project_id
+        self.session_id = session_id or os.environ.get("TMUX_PANE", None)
+        self.strict = strict
+
+        self.config = config or get_config()
 
+        self._started = False
+        self._completed = False
+        self._log_sequence = 0
+        self._start_time: Optional[datetime] = None
+        self._start_clock: Optional[float] = None  # duration_seconds 계산용 (time.perf_counter)
+
+        # progress / log 빈도 제한 (초과분은 최신 값 하나만 보류)
+        self._progress_bucket = TokenBucket(self.config.progress_rate_limit)
+        self._log_bucket = (
+            TokenBucket(self.config.log_rate_limit) if self.config.log_rate_limit else None
+        )
+        self._pending_progress: Optional[Tuple[float, Optional[float], Optional[str]]] = None
+        self._pending_log: Optional[Tuple[str, str, Optional[Dict[str, Any]]]] = None
+        self._suppressed = 0  # 전송되지 않고 버려진 progress/log 수 (다음 이벤트에 보고)
+        # 마지막 progress 값과 값이 바뀐 횟수 / 시각 (heartbeat의 steady / stalled 판단)
+        self._last_progress: Optional[Tuple[float, Optional[float]]] = None
+        self._progress_version = 0
+        self._progress_changed_clock: Optional[float] = None
+        self._heartbeat_sequence = 0
+
+        self._artifact_store: Optional[ArtifactStore] = None
+        self._spans = SpanRecorder(
+            self.trace_id,
+            max_records=self.config.span_max_records,
+            max_paths=self.config.span_max_paths,
+        )
+        # start() ~ complete()/blocked() 구간 자원 사용량 (resource_profile=True일 때만)
+        self._resources: Optional[ResourceProfile] = (
+            ResourceProfile(self.config.resource_sample_interval)
+            if self.config.resource_profile else None
+        )
+
+    def span(self, name: str) -> ContextManager[Span]:
+        """
+        단계별 시간 측정 context manager (중첩 가능)
+
+        span은 이벤트로 보내지 않고 모아 두었다가 task_completed / task_blocked의
+        payload.spans에 요약으로 붙입니다.
+
+        Usage:
+            with task.span("download"):
+                with task.span("parse"):
+                    ...
+        """
+        return self._spans.span(name)
+
+    @property
+    def artifacts(self) -> ArtifactStore:
+        """artifact 저장소 (최초 접근 시 생성)"""
+        if self._artifact_store is None:
+            self._artifact_store = create_artifact_store(self.config)
+        return self._artifact_store
+
+    def _build_event(
+        self,
+        event_type: str,
+        payload: Dict[str, Any],
+        summary: Optional[str] = None,
+        sequence: Optional[int] = None
+    ) -> JarvisEvent:
+        """태스크 공통 필드를 채운 이벤트 생성 (버려진 progress/log 수가 있으면 함께 보고)"""
+        if self._suppressed:
+            payload = {**payload, "suppressed": self._suppressed}
+            self._suppressed = 0
+
+        return JarvisEvent(
+            event_type=event_type,
+            task_id=self.task_id,
+            idempotency_key=self.client.generate_idempotency_key(
+                self.worker_id, self.task_id, event_type, sequence, self.run_id
+            ),
+            worker_id=self.worker_id,
+            node_id=self.node_id,
+            project_id=self.project_id,
+            session_id=self.session_id,
+            payload=payload,
+            summary=summary,
+            trace_id=self.trace_id
+        )
+
+    def _build_started(self, description: str) -> JarvisEvent:
+        """task_started 이벤트 생성 (시작 상태 기록)"""
+        self._started = True
+        self._start_time = datetime.now()
+        self._start_clock = time.perf_counter()
+        if self._resources is not None:
+            self._resources.start()
+
+        return self._build_event(
+            "task_started",
+            payload={
+                "description": description,
+                "started_at": self._start_time.isoformat()
+            },
+            summary=f"시작: {description}"
+        )
+
+    def _build_completed(
+        self,
+        result: Union[Dict[str, Any], TaskResult],
+        summary: Optional[str],
+        status: str
+    ) -> JarvisEvent:
+        """
+        task_completed 이벤트 생성 (종료 상태 기록)
+
+        artifact_threshold_kb 이상인 결과 값과 TaskResult.artifacts는 artifact 저장소에
+        저장하고, payload에는 digest / 크기만 담습니다 (payload.artifacts).
+        """
+        self._completed = True
+        completed_at = datetime.now()
+
+        attached: List[Any] = []
+        if isinstance(result, TaskResult):
+            summary = summary or result.summary
+            status = result.status
+            attached = result.artifacts or []
+            result = result.data or {}
+
+        refs = store_artifacts(self.artifacts, attached) if attached else []
+        threshold_kb = self.config.artifact_threshold_kb
+        if threshold_kb is not None:
+            result, spilled = spill_large_values(result, self.artifacts, int(threshold_kb * 1024))
+            refs.extend(spilled)
+
+        duration_seconds = None
+        if self._start_clock is not None:
+            # 시스템 시계 변경에 영향받지 않도록 단조 시계로 계산
+            duration_seconds = round(time.perf_counter() - self._start_clock, 6)
+
+        payload = {
+            "result": {
+                "status": status,
+                "data": result
+            },
+            "duration_seconds": duration_seconds,
+            "completed_at": completed_at.isoformat()
+        }
+        if refs:
+            payload["artifacts"] = refs
+        if self._spans.count:
+            payload["spans"] = self._spans.summary()
+        self._attach_resources(payload)
+
+        return self._build_event(
+            "task_completed",
+            payload=payload,
+            summary=summary or f"완료 ({status})"
+        )
+
+    def _build_blocked(
+        self,
+        reason: str,
+        blocker_type: str,
+        error_details: Optional[str]
+    ) -> JarvisEvent:
+        """task_blocked 이벤트 생성 (blocked도 종료 상태)"""
+        self._completed = True
+        blocked_at = datetime.now()
+
+        payload = {
+            "reason": reason,
+            "blocker_type": blocker_type,
+            "error_details": error_details,
+            "blocked_at": blocked_at.isoformat()
+        }
+        if self._spans.count:
+            payload["spans"] = self._spans.summary()
+        self._attach_resources(payload)
+
+        return self._build_event(
+            "task_blocked",
+            payload=payload,
+            summary=f"블로커: {reason}"
+        )
+
+    def _attach_resources(self, payload: Dict[str, Any]) -> None:
+        """자원 사용량 측정 중이면 종료하고 payload.resources에 요약 추가"""
+        if self._resources is not None and self._resources.running:
+            payload["resources"] = self._resources.stop()
+
+    def _build_log(
+        self,
+        message: str,
+        level: str,
+        context: Optional[Dict[str, Any]]
+    ) -> JarvisEvent:
+        """task_log 이벤트 생성"""
+        self._log_sequence += 1
+
+        return self._build_event(
+            "task_log",
+            payload={
+                "level": level,
+                "message": message,
+                "context": context or {}
+            },
+            summary=None,  # 로그는 알림 안함
+            sequence=self._log_sequence
+        )
+
+    def _build_progress(
+        self,
+        current: float,
+        total: Optional[float],
+        message: Optional[str]
+    ) -> JarvisEvent:
+        """진행률 이벤트 생성 (task_log + progress 필드)"""
+        self._log_sequence += 1
+
+        progress = _progress_fields(current, total)
+        if message is None:
+            message = f"{current}/{total} ({progress['percent']}%)" if total else f"{current}"
+
+        return self._build_event(
+            "task_log",
+            payload={
+                "level": "info",
+                "message": message,
+                "context": {},
+                "progress": progress
+            },
+            summary=None,
+            sequence=self._log_sequence
+        )
+
+    def _coalesce_progress(
+        self,
+        current: float,
+        total: Optional[float],
+        message: Optional[str]
+    ) -> Optional[JarvisEvent]:
+        """
+        빈도 제한 내면 progress 이벤트 생성, 초과면 최신 값으로 보류
+
+        Returns:
+            전송할 이벤트 (보류되면 None)
+        """
+        if (current, total) != self._last_progress:
+            self._last_progress = (current, total)
+            self._progress_version += 1
+            self._progress_changed_clock = time.perf_counter()
+
+        if self._pending_progress is not None:
+            # 보류 중이던 값은 새 값으로 대체됨
+            self._suppressed += 1
+            self._pending_progress = None
+
+        if self._progress_bucket.try_acquire():
+            return self._build_progress(current, total, message)
+
+        self._pending_progress = (current, total, message)
+        return None
+
+    def _build_heartbeat(self, state: str, next_interval: float) -> JarvisEvent:
+        """
+        task_heartbeat 이벤트 생성 (보류 중인 progress가 있으면 합쳐서 보내고 보류 해제)
 
-class JarvisTask:
+        Args:
+            state: 'steady', 'stalled', 'alive'
+            next_interval: 다음 heartbeat까지 시간 (초, PM의 무응답 판단 기준)
+        """
+        self._heartbeat_sequence += 1
+        now = time.perf_counter()
+
+        payload: Dict[str, Any] = {
+            "state": state,
+            "next_heartbeat_seconds": round(next_interval, 3),
+        }
+        if self._start_clock is not None:
+            payload["elapsed_seconds"] = round(now - self._start_clock, 3)
+        if self._progress_changed_clock is not None:
+            payload["since_progress_seconds"] = round(now - self._progress_changed_clock, 3)
+        if self._pending_progress is not None:
+            current, total, message = self._pending_progress
+            self._pending_progress = None
+            payload["progress"] = _progress_fields(current, total)
+            if message is not None:
+                payload["message"] = message
+
+        return self._build_event(
+            "task_heartbeat",
+            payload=payload,
+            summary=None,
+            sequence=self._heartbeat_sequence
+        )
+
+    def _coalesce_log(
+        self,
+        message: str,
+        level: str,
+        context: Optional[Dict[str, Any]]
+    ) -> Optional[JarvisEvent]:
+        """
+        log_rate_limit 내면 로그 이벤트 생성, 초과면 최신 메시지로 보류
+        (warning / error는 항상 전송)
+
+        Returns:
+            전송할 이벤트 (보류되면 None)
+        """
+        if self._log_bucket is None or level in _UNCOALESCED_LEVELS:
+            return self._build_log(message, level, context)
+
+        if self._pending_log is not None:
+            self._suppressed += 1
+            self._pending_log = None
+
+        if self._log_bucket.try_acquire():
+            return self._build_log(message, level, context)
+
+        self._pending_log = (message, level, context)
+        return None
+
+    def _take_pending(self) -> List[JarvisEvent]:
+        """보류 중인 progress / log 이벤트 생성 (보류 상태 초기화)"""
+        events = []
+        if self._pending_log is not None:
+            events.append(self._build_log(*self._pending_log))
+            self._pending_log = None
+        if self._pending_progress is not None:
+            events.append(self._build_progress(*self._pending_progress))
+            self._pending_progress = None
+        return events
+
+
+def _progress_fields(current: float, total: Optional[float]) -> Dict[str, Any]:
+    """payload.progress (total이 있으면 percent 계산)"""
+    percent = round(current / total * 100, 1) if total else None
+    return {"current": current, "total": total, "percent": percent}
+
+
+class JarvisTask(_TaskBase):
     """
     JARVIS 태스크 - Context Manager 지원
 
@@ -50,7 +426,9 @@ class JarvisTask:
         project_id: Optional[str] = None,
         session_id: Optional[str] = None,
         config: Optional[JarvisConfig] = None,
-        strict: bool = False
+        strict: bool = False,
+        run_id: Optional[str] = None,
+        trace_id: Optional[str] = None
     ):
         """
         Args:
@@ -61,21 +439,17 @@ class JarvisTask:
             session_id: tmux 세션 ID (기본: TMUX_PANE 환경변수)
             config: JarvisConfig (선택)
             strict: True면 API 오류 시 예외, False(기본)면 fail-open
+            run_id: 태스크 실행 ID (기본: JARVIS_RUN_ID 환경변수 또는 새 ULID)
+            trace_id: 이벤트 trace ID (기본: JARVIS_TRACE_ID 환경변수 또는 새 ID)
         """
-        self.task_id = task_id
-        self.node_id = node_id
-        self.worker_id = worker_id or os.environ.get("JARVIS_WORKER_ID", "unknown")
-        self.project_id = project_id
-        self.session_id = session_id or os.environ.get("TMUX_PANE", None)
-        self.strict = strict
-
-        self.config = config or get_config()
-        self.client = JarvisClient(self.config, strict=strict)
-
-        self._started = False
-        self._completed = False
-        self._log_sequence = 0
-        self._start_time: Optional[datetime] = None
+        super().__init__(
+            task_id, node_id, worker_id, project_id, session_id, config, strict, run_id, trace_id
+        )
+        # 같은 설정의 태스크끼리 클라이언트(연결 / 큐 / 서킷 / outbox)를 공유
+        self.client: JarvisClient = get_client(self.config, strict=strict)
+        # 이벤트 생성 상태(순번 / 보류 값) 보호 - heartbeat 스레드와 공유, 전송 중에는 잡지 않음
+        self._lock = threading.Lock()
+        self._heartbeat: Optional[TaskHeartbeat] = None
 
     def __enter__(self) -> "JarvisTask":
         """Context manager 진입"""
@@ -86,7 +460,9 @@ class JarvisTask:
         Context manager 종료
         - 예외 발생 시: blocked() 자동 호출 (실패해도 원래 예외 전파)
         - 정상 종료 + complete 미호출 시: 경고 로그
+        - heartbeat는 기다리지 않고 종료 신호만 보냄 (complete() / blocked()는 전송 중인 1건을 최대 heartbeat_timeout초 대기)
         """
+        self.stop_heartbeat()
         if exc_type is not None:
             # 예외 발생 → blocked (fail-safe: blocked() 실패해도 원래 예외 전파)
             try:
@@ -102,8 +478,9 @@ class JarvisTask:
             return False  # 예외 전파
 
         if self._started and not self._completed:
-            # 시작했지만 완료 안함 → 경고 (실패해도 무시)
+            # 시작했지만 완료 안함 → 보류된 progress 전송 후 경고 (실패해도 무시)
             try:
+                self.flush()
                 self.log(
                     "Task exited without calling complete() or blocked()",
                     level="warning"
@@ -124,31 +501,49 @@ class JarvisTask:
             self.log("start() called multiple times", level="warning")
             return {"status": "skipped", "reason": "already_started"}
 
-        self._started = True
-        self._start_time = datetime.now()
+        with self._lock:
+            event = self._build_started(description)
+        result = self.client.send_event(event)
+        if self.config.heartbeat_interval:
+            self.start_heartbeat()
+        return result
 
-        event = JarvisEvent(
-            event_type="task_started",
-            task_id=self.task_id,
-            idempotency_key=self.client.generate_idempotency_key(
-                self.worker_id, self.task_id, "task_started"
-            ),
-            worker_id=self.worker_id,
-            node_id=self.node_id,
-            project_id=self.project_id,
-            session_id=self.session_id,
-            payload={
-                "description": description,
-                "started_at": self._start_time.isoformat()
-            },
-            summary=f"시작: {description}"
-        )
+    def start_heartbeat(
+        self,
+        interval: Optional[float] = None,
+        max_interval: Optional[float] = None
+    ) -> TaskHeartbeat:
+        """
+        heartbeat 스레드 시작 (이미 실행 중이면 그대로 반환)
 
-        return self.client.send_event(event)
+        complete() / blocked() / with 블록 종료 시 자동으로 멈추며, 종료 이벤트 뒤에 heartbeat가 나가지 않습니다.
+
+        Args:
+            interval: 기본 주기 (초, 기본 config.heartbeat_interval 또는 30)
+            max_interval: 주기 상한 (초, 기본 config.heartbeat_max_interval)
+        """
+        if self._heartbeat is None or not self._heartbeat.running:
+            self._heartbeat = TaskHeartbeat(
+                self,
+                interval or self.config.heartbeat_interval or 30.0,
+                max_interval or self.config.heartbeat_max_interval,
+                timeout=self.config.heartbeat_timeout,
+            ).start()
+        return self._heartbeat
+
+    def stop_heartbeat(self) -> None:
+        """heartbeat 종료 신호 (기다리지 않음)"""
+        if self._heartbeat is not None:
+            self._heartbeat.stop()
+
+    def _finish_heartbeat(self) -> None:
+        """종료 이벤트 전 heartbeat 종료 (종료 이벤트보다 늦게 나가지 않도록 전송 중인 1건을 최대 heartbeat_timeout초 대기)"""
+        if self._heartbeat is not None:
+            self._heartbeat.finish()
 
     def complete(
         self,
-        result: Dict[str, Any],
+        result: Union[Dict[str, Any], TaskResult],
         summary: Optional[str] = None,
         status: str = "success"
     ) -> Dict[str, Any]:
@@ -156,42 +551,20 @@ class JarvisTask:
         태스크 완료 이벤트 전송
 
         Args:
-            result: 결과 데이터
+            result: 결과 데이터 또는 TaskResult (status / summary / artifacts 포함)
             summary: 알림용 요약 (선택)
             status: 'success', 'partial', 'failed'
+
+        artifact_threshold_kb 이상인 결과 값은 artifact 저장소에 저장되고 digest로 대체됩니다.
         """
         if self._completed:
             self.log("complete() called multiple times", level="warning")
             return {"status": "skipped", "reason": "already_completed"}
 
-        self._completed = True
-        completed_at = datetime.now()
-
-        duration_seconds = None
-        if self._start_time:
-            duration_seconds = (completed_at - self._start_time).total_seconds()
-
-        event = JarvisEvent(
-            event_type="task_completed",
-            task_id=self.task_id,
-            idempotency_key=self.client.generate_idempotency_key(
-                self.worker_id, self.task_id, "task_completed"
-            ),
-            worker_id=self.worker_id,
-            node_id=self.node_id,
-            project_id=self.project_id,
-            session_id=self.session_id,
-            payload={
-                "result": {
-                    "status": status,
-                    "data": result
-                },
-                "duration_seconds": duration_seconds,
-                "completed_at": completed_at.isoformat()
-            },
-            summary=summary or f"완료 ({status})"
-        )
-
+        self._finish_heartbeat()
+        self.flush()
+        with self._lock:
+            event = self._build_completed(result, summary, status)
         return self.client.send_event(event)
 
     def blocked(
@@ -212,28 +585,10 @@ class JarvisTask:
             self.log("blocked() called after complete()", level="warning")
             return {"status": "skipped", "reason": "already_completed"}
 
-        self._completed = True  # blocked도 종료 상태
-        blocked_at = datetime.now()
-
-        event = JarvisEvent(
-            event_type="task_blocked",
-            task_id=self.task_id,
-            idempotency_key=self.client.generate_idempotency_key(
-                self.worker_id, self.task_id, "task_blocked"
-            ),
-            worker_id=self.worker_id,
-            node_id=self.node_id,
-            project_id=self.project_id,
-            session_id=self.session_id,
-            payload={
-                "reason": reason,
-                "blocker_type": blocker_type,
-                "error_details": error_details,
-                "blocked_at": blocked_at.isoformat()
-            },
-            summary=f"블로커: {reason}"
-        )
-
+        self._finish_heartbeat()
+        self.flush()
+        with self._lock:
+            event = self._build_blocked(reason, blocker_type, error_details)
         return self.client.send_event(event)
 
     def log(
@@ -249,25 +604,44 @@ class JarvisTask:
             message: 로그 메시지
             level: 'info', 'warning', 'error', 'debug'
             context: 추가 컨텍스트
+
+        log_rate_limit이 설정되면 info/debug 로그는 초당 log_rate_limit개까지만 전송되고,
+        초과분은 최신 메시지 하나만 보류됩니다 (warning / error는 항상 전송).
         """
-        self._log_sequence += 1
+        with self._lock:
+            event = self._coalesce_log(message, level, context)
+        if event is None:
+            return {"status": "coalesced"}
+        return self.client.send_event(event)
 
-        event = JarvisEvent(
-            event_type="task_log",
-            task_id=self.task_id,
-            idempotency_key=self.client.generate_idempotency_key(
-                self.worker_id, self.task_id, "task_log", self._log_sequence
-            ),
-            worker_id=self.worker_id,
-            node_id=self.node_id,
-            project_id=self.project_id,
-            session_id=self.session_id,
-            payload={
-                "level": level,
-                "message": message,
-                "context": context or {}
-            },
-            summary=None  # 로그는 알림 안함
-        )
+    def progress(
+        self,
+        current: float,
+        total: Optional[float] = None,
+        message: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        진행률 전송 (초당 progress_rate_limit개까지, 초과분은 최신 값만 보류)
+
+        보류된 값은 다음 progress 전송, heartbeat 또는 complete() / blocked() 직전에 전송되며,
+        버려진 호출 수는 다음 이벤트 payload의 "suppressed"로 보고됩니다.
+
+        Args:
+            current: 현재 진행량
+            total: 전체 양 (선택, 있으면 percent 계산)
+            message: 표시 메시지 (기본: "current/total (percent%)")
 
+        Returns:
+            send_event 결과, 보류되면 {"status": "coalesced"}
+        """
+        with self._lock:
+            event = self._coalesce_progress(current, total, message)
+        if event is None:
+            return {"status": "coalesced"}
         return self.client.send_event(event)
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """보류 중인 progress / log 즉시 전송"""
+        with self._lock:
+            events = self._take_pending()
+        return [self.client.send_event(event) for event in events]
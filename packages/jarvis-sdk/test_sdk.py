@@ -4,6 +4,14 @@ JARVIS SDK - Test Script
 
 import os
 import sys
+import json
+import asyncio
+import dataclasses
+import gzip
+import subprocess
+import tempfile
+import threading
+import time
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -15,8 +23,20 @@ os.environ.setdefault("JARVIS_API_URL", "http://localhost:3000/api")
 
 # Import without relative imports for standalone testing
 from config import JarvisConfig, get_config  # noqa: E402
-from client import JarvisClient, JarvisEvent  # noqa: E402
-from task import JarvisTask  # noqa: E402
+from client import JarvisClient, JarvisEvent, get_client, MAX_SHARED_CLIENTS  # noqa: E402
+from task import JarvisTask, TaskResult  # noqa: E402
+from async_client import AsyncJarvisClient  # noqa: E402
+from async_task import AsyncJarvisTask  # noqa: E402
+from outbox import SegmentLogOutbox, SQLiteOutbox  # noqa: E402
+from logsink import JsonlLogSink  # noqa: E402
+from payload import fit_payload  # noqa: E402
+from relay import JarvisRelay  # noqa: E402
+from stub_server import StubServer, start_subprocess  # noqa: E402
+from subscriber import JarvisSubscriber  # noqa: E402
+from connection import clear_proxy_cache  # noqa: E402
+from breaker import CircuitBreaker  # noqa: E402
+from heartbeat import TaskHeartbeat  # noqa: E402
+import serialization  # noqa: E402
 
 
 def test_config():
@@ -82,6 +102,25 @@ def test_idempotency_key():
     assert "task_001" in key1
     assert "task_completed" in key1
 
+    # 같은 초 안에서도 중복 없음 + 생성 순서대로 정렬
+    keys = [client.generate_idempotency_key("haedong", "task_001", "task_started") for _ in range(1000)]
+    assert len(set(keys)) == len(keys), "colliding keys"
+    assert keys == sorted(keys), "keys not monotonic"
+
+    # run_id가 같으면 재실행해도 같은 key (서버 dedupe)
+    run_keys = [
+        JarvisTask("task_001", worker_id="haedong", run_id="run-1")._build_started("시작").idempotency_key
+        for _ in range(2)
+    ]
+    assert run_keys[0] == run_keys[1] and "run-1" in run_keys[0], run_keys
+    os.environ["JARVIS_RUN_ID"] = "run-env"
+    try:
+        assert JarvisTask("task_001", worker_id="haedong").run_id == "run-env"
+    finally:
+        del os.environ["JARVIS_RUN_ID"]
+    assert JarvisTask("task_001").run_id != JarvisTask("task_001").run_id
+
+    print(f"  Run key: {run_keys[0]}")
     print("  ✅ Idempotency keys generated correctly")
     return True
 
@@ -110,24 +149,1601 @@ def test_task_context_manager():
 
 
 def test_outbox_directory():
-    """Outbox 디렉토리 생성 테스트"""
+    """Outbox 디렉토리 생성 테스트 (클라이언트 생성 시가 아니라 첫 기록 시 생성)"""
     print("\n" + "=" * 50)
     print("5. Outbox Directory Test")
     print("=" * 50)
 
-    config = JarvisConfig()
-    client = JarvisClient(config)
+    with tempfile.TemporaryDirectory() as tmp:
+        config = _offline_config(tmp, max_retries=1, outbox_max_retries=1)
+        client = JarvisClient(config)
+
+        assert not config.outbox_path.exists(), "Outbox path should not be created eagerly"
+        assert not config.log_path.exists(), "Log path should not be created eagerly"
+
+        client.send_event(_make_event("dirs"))  # 연결 불가 → outbox
+        client.flush()
+        assert (config.outbox_path / "pending").exists(), "Pending dir should exist"
+        assert config.log_path.exists(), "Log path should be created"
+        assert not (config.outbox_path / "failed").exists()
+
+        client.retry_outbox()  # 재시도 실패 → 다음 재시도에서 failed로 이동
+        client.retry_outbox(force=True)
+        assert (config.outbox_path / "failed").exists(), "Failed dir should exist"
+
+        print(f"  Outbox: {config.outbox_path}")
+        print(f"  Pending: {config.outbox_path / 'pending'}")
+        print(f"  Failed: {config.outbox_path / 'failed'}")
+        print(f"  Logs: {config.log_path}")
+    print("  ✅ Directories created on first write")
+    return True
+
+
+def _offline_config(tmp: str, **overrides) -> JarvisConfig:
+    """연결 불가능한 API + 임시 디렉토리 설정 (빠른 재시도)"""
+    options = dict(
+        api_base_url="http://127.0.0.1:9/api",
+        api_key="test-key",
+        timeout_seconds=1,
+        retry_backoff_base=0.01,
+        outbox_path=Path(tmp) / "outbox",
+        log_path=Path(tmp) / "logs",
+        # 같은 주소를 쓰는 테스트끼리 공유 breaker 상태가 섞이지 않도록
+        breaker_enabled=False,
+    )
+    options.update(overrides)
+    return JarvisConfig(**options)
+
+
+def _make_event(task_id: str = "test_task", event_type: str = "task_log", seq: int = 1) -> JarvisEvent:
+    """테스트용 이벤트"""
+    return JarvisEvent(
+        event_type=event_type,
+        task_id=task_id,
+        idempotency_key=f"test:{task_id}:{event_type}:{seq}",
+        worker_id="test_worker",
+        payload={"level": "info", "message": f"message {seq}"},
+    )
+
+
+def test_async_delivery():
+    """비동기 전송 테스트 (API 불가 → 큐 → outbox)"""
+    print("\n" + "=" * 50)
+    print("6. Async Delivery Test")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = _offline_config(tmp, async_delivery=True)
+        client = JarvisClient(config)
+
+        started = time.monotonic()
+        results = [client.send_event(_make_event(seq=i)) for i in range(3)]
+        elapsed = time.monotonic() - started
+
+        assert all(r["status"] == "queued" for r in results), results
+        assert elapsed < 0.5, f"send_event blocked for {elapsed:.2f}s"
+        assert client.flush(timeout=10), "flush timed out"
+
+        pending = list((config.outbox_path / "pending").glob("*.json"))
+        assert len(pending) == 3, f"expected 3 outboxed events, got {len(pending)}"
+
+        print(f"  Enqueue time: {elapsed * 1000:.1f}ms for 3 events")
+        print(f"  Outboxed after flush: {len(pending)}")
+        print("  ✅ Async delivery queued and drained correctly")
+    return True
+
+
+def _StubServer(port: int = 0, **options) -> StubServer:
+    """백그라운드에서 실행 중인 로컬 stub 서버"""
+    return StubServer(port=port, **options).start()
+
+
+def test_batch_delivery():
+    """배치 전송 테스트 (로컬 스텁 서버)"""
+    print("\n" + "=" * 50)
+    print("7. Batch Delivery Test")
+    print("=" * 50)
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            config = _offline_config(
+                tmp,
+                api_base_url=server.api_url,
+                async_delivery=True,
+                batch_max_events=10,
+                batch_linger_ms=200,
+            )
+            client = JarvisClient(config)
+
+            for i in range(5):
+                assert client.send_event(_make_event(seq=i))["status"] == "queued"
+            assert client.flush(timeout=10), "flush timed out"
+
+            batches = [body for path, body in server.requests if path.endswith("/batch")]
+            assert len(batches) == 1, f"expected 1 batch request, got {len(server.requests)} requests"
+            assert len(batches[0]["events"]) == 5
+
+            # 동기 배치 전송: 이벤트별 idempotency 상태 매핑
+            results = client.send_batch([_make_event(seq=0), _make_event(seq=99)])
+            assert [r["status"] for r in results] == ["duplicate", "created"], results
+
+            print(f"  Requests: {len(server.requests)} (events coalesced into 1 batch)")
+            print(f"  Per-event results: {[r['status'] for r in results]}")
+            print("  ✅ Batch delivery coalesced and mapped correctly")
+    finally:
+        server.stop()
+    return True
+
+
+def test_connection_pool():
+    """keep-alive 연결 재사용 / 재연결 테스트"""
+    print("\n" + "=" * 50)
+    print("8. Connection Pool Test")
+    print("=" * 50)
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            client = JarvisClient(_offline_config(tmp, api_base_url=server.api_url))
+
+            for i in range(5):
+                assert client.send_event(_make_event(seq=i))["status"] == "created"
+            assert server.connections == 1, f"expected 1 connection, got {server.connections}"
+
+            # 서버가 idle 연결을 닫아도 재연결 후 정상 전송
+            server.drop_after_response = True
+            for i in range(5, 8):
+                assert client.send_event(_make_event(seq=i))["status"] == "created"
+            assert not list((Path(tmp) / "outbox" / "pending").glob("*.json"))
+
+            # HTTP_PROXY 대상 host는 keep-alive 풀 대신 urlopen(프록시 경유), NO_PROXY 대상은 풀 사용
+            host, port = server.server_address[:2]
+            saved = {name: os.environ.get(name) for name in ("http_proxy", "no_proxy")}
+            try:
+                os.environ["http_proxy"] = f"http://{host}:{port}"
+                os.environ["no_proxy"] = "bypass.invalid"
+                clear_proxy_cache()
+                proxied = JarvisClient(_offline_config(tmp, api_base_url="http://jarvis.invalid/api"))
+                assert proxied.send_event(_make_event(seq=100))["status"] == "created"
+                assert server.requests[-1][0] == "http://jarvis.invalid/api/jarvis/events"
+                bypassed = JarvisClient(_offline_config(
+                    tmp, api_base_url="http://bypass.invalid/api", max_retries=1
+                ))
+                assert bypassed.send_event(_make_event(seq=101))["status"] == "outboxed"
+                assert server.requests[-1][1]["idempotency_key"].endswith(":100")
+            finally:
+                for name, value in saved.items():
+                    if value is None:
+                        os.environ.pop(name, None)
+                    else:
+                        os.environ[name] = value
+                clear_proxy_cache()
+
+            print(f"  Connections opened: {server.connections} for {len(server.requests)} requests")
+            print("  ✅ Connections reused and re-established correctly, proxied hosts use urlopen")
+    finally:
+        server.stop()
+    return True
+
+
+def test_async_task():
+    """asyncio 태스크 테스트 (동시 실행 + 동시 요청 상한 + outbox fallback)"""
+    print("\n" + "=" * 50)
+    print("9. Async Task Test")
+    print("=" * 50)
+
+    async def lifecycle(client, task_id):
+        async with AsyncJarvisTask(task_id, worker_id="test_worker", client=client) as task:
+            await task.start("비동기 작업")
+            await task.log("진행 중")
+            return await task.complete({"ok": True})
+
+    async def main(config, offline_config):
+        async with AsyncJarvisClient(config, max_in_flight=2) as client:
+            results = await asyncio.gather(
+                *(lifecycle(client, f"async_{i}") for i in range(10))
+            )
+        # API 불가 → 백오프 후 outbox (이벤트 루프는 계속 동작)
+        async with AsyncJarvisTask("async_offline", config=offline_config) as task:
+            offline = await task.start("오프라인")
+        return results, offline
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            config = _offline_config(tmp, api_base_url=server.api_url)
+            results, offline = asyncio.run(main(config, _offline_config(tmp)))
+
+            assert all(r["status"] == "created" for r in results), results
+            assert len(server.requests) == 30
+            assert server.connections <= 2, f"expected <= 2 connections, got {server.connections}"
+            assert offline["status"] == "outboxed", offline
+            requests, connections = len(server.requests), server.connections
+
+            # 로그 flush(파일 I/O)는 이벤트 루프 스레드가 아닌 executor에서
+            # (전송 / 중복 제거(deduped) / 크기 축약(truncated) 로그 모두)
+            async def log_on_loop():
+                async with AsyncJarvisClient(log_config) as client:
+                    sink = client._sync._log_sink
+                    flush, write = sink.flush, sink.write
+                    sink.flush = lambda: (flush_threads.append(threading.get_ident()), flush())
+                    sink.write = lambda line: (write_threads.append(threading.get_ident()), write(line))
+                    try:
+                        event = _make_event("async_log")
+                        await client.send_event(event)
+                        deduped = await client.send_event(event)
+                        large = _make_event("async_log", seq=2)
+                        large.payload["message"] = os.urandom(4096).hex()
+                        await client.send_event(large)
+                    finally:
+                        del sink.flush, sink.write
+                return threading.get_ident(), deduped, large
+
+            flush_threads, write_threads = [], []
+            log_config = _offline_config(
+                tmp, api_base_url=server.api_url, log_path=Path(tmp) / "async_logs",
+                log_buffer_size_kb=0, payload_max_size_kb=2,
+            )
+            loop_thread, deduped, large = asyncio.run(log_on_loop())
+            assert deduped["status"] == "duplicate" and "truncated" in large.payload, deduped
+            assert len(flush_threads) >= 4 and loop_thread not in flush_threads, flush_threads
+            assert loop_thread not in write_threads, write_threads
+            actions = [
+                json.loads(line)["action"]
+                for path in (Path(tmp) / "async_logs").glob("*.jsonl")
+                for line in path.read_text().splitlines()
+            ]
+            assert {"sent", "deduped", "truncated"} <= set(actions), actions
+
+            print(f"  Lifecycles: {len(results)}, requests: {requests}")
+            print(f"  Connections (max_in_flight=2): {connections}")
+            print("  ✅ Async tasks sent concurrently without blocking (log flush in executor)")
+    finally:
+        server.stop()
+    return True
+
+
+def test_concurrent_outbox_replay():
+    """병렬 outbox 재전송 테스트 (태스크별 순서 보장 + rate limit + 진행 상황)"""
+    print("\n" + "=" * 50)
+    print("10. Concurrent Outbox Replay Test")
+    print("=" * 50)
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            offline = JarvisClient(_offline_config(tmp, max_retries=1))
+            for i in range(4):
+                for event_type in ("task_started", "task_log", "task_completed"):
+                    offline.send_event(_make_event(f"replay_{i}", event_type))
+
+            client = JarvisClient(_offline_config(tmp, api_base_url=server.api_url))
+            updates = []
+            started = time.monotonic()
+            stats = client.retry_outbox(workers=4, rate_limit=100, progress=updates.append)
+            elapsed = time.monotonic() - started
+
+            assert stats["success"] == 12 and stats["total"] == 12, stats
+            assert len(updates) == 12 and updates[-1]["success"] == 12
+            assert elapsed >= 0.1, f"rate limit not applied ({elapsed:.3f}s)"
+
+            order = {}
+            for _, body in server.requests:
+                order.setdefault(body["task_id"], []).append(body["event_type"])
+            for task_id, types in order.items():
+                assert types == ["task_started", "task_log", "task_completed"], (task_id, types)
+
+            print(f"  Stats: {stats}")
+            print(f"  Elapsed (rate_limit=100/s): {elapsed:.3f}s")
+            print("  ✅ Outbox replayed in parallel with per-task ordering")
+    finally:
+        server.stop()
+    return True
+
+
+def test_segment_outbox():
+    """세그먼트 로그 outbox 테스트 (저장 / 재시도 실패 / 재전송 / compaction / 마이그레이션)"""
+    print("\n" + "=" * 50)
+    print("11. Segment Log Outbox Test")
+    print("=" * 50)
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            # 기존 파일 포맷으로 2건 저장 (마이그레이션 대상)
+            legacy = JarvisClient(_offline_config(tmp, max_retries=1))
+            legacy.send_event(_make_event("legacy", "task_started"))
+            legacy.send_event(_make_event("legacy", "task_completed"))
+
+            offline = JarvisClient(_offline_config(tmp, max_retries=1, outbox_backend="segment"))
+            for i in range(5):
+                offline.send_event(_make_event("segment", seq=i))
+            assert offline.outbox.count() == 5
+
+            # 재전송 실패 → 파일 재작성 없이 acks.log에 기록
+            stats = offline.retry_outbox()
+            assert stats["failed"] == 2 and stats["deferred"] == 5, stats
+            assert not list((Path(tmp) / "outbox" / "pending").glob("*.json")), "legacy files not migrated"
+            offline.outbox.close()
+
+            # 새 프로세스에서 복구 (디스크에서 다시 읽음)
+            recovered = SegmentLogOutbox(Path(tmp) / "outbox")
+            assert [e.retry_count for e in recovered.pending()][:1] == [1]
+            assert len(recovered.pending()) == 7
+            recovered.close()
+
+            # 같은 경로의 클라이언트는 store를 공유 (seq가 겹쳐 pending()에서 이벤트가 사라지지 않도록)
+            shared = Path(tmp) / "shared"
+            first = JarvisClient(_offline_config(tmp, max_retries=1, outbox_backend="segment", outbox_path=shared))
+            second = JarvisClient(_offline_config(tmp, max_retries=1, outbox_backend="segment", outbox_path=shared))
+            assert first.outbox is second.outbox
+            for i in range(6):
+                (first if i % 2 else second).send_event(_make_event(f"shared_{i}"))
+            ids = [entry.entry_id for entry in SegmentLogOutbox(shared).pending()]
+            assert len(ids) == 6 and ids == sorted(ids) == sorted(ids, key=int), ids
+
+            client = JarvisClient(_offline_config(
+                tmp, api_base_url=server.api_url, max_retries=3, outbox_backend="segment"
+            ))
+            entries = client.outbox.pending()
+            assert len(entries) == 7 and entries[0].retry_count == 1
+            stats = client.retry_outbox(workers=2, force=True)
+            assert stats["success"] == 7, stats
+            assert client.outbox.count() == 0
+            assert not list((Path(tmp) / "outbox" / "segments").glob("*.seg")), "segments not compacted"
+
+            print(f"  Replay stats: {stats}")
+            print("  ✅ Segment outbox recovered, replayed, compacted and migrated")
+    finally:
+        server.stop()
+    return True
+
+
+def test_sqlite_outbox():
+    """SQLite outbox 테스트 (insert dedupe / due 조회 / 공유 writer / 재전송)"""
+    print("\n" + "=" * 50)
+    print("12. SQLite Outbox Test")
+    print("=" * 50)
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            config = _offline_config(tmp, max_retries=1, outbox_backend="sqlite")
+
+            # 여러 writer가 같은 DB 공유 (같은 key는 1건만 저장)
+            def writer(worker: int):
+                store = SQLiteOutbox(config.outbox_path)
+                for i in range(20):
+                    store.add(_make_event(f"sqlite_{i % 4}", seq=i).to_dict(), "offline")
+                store.close()
+
+            threads = [threading.Thread(target=writer, args=(w,)) for w in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            store = SQLiteOutbox(config.outbox_path)
+            assert store.count() == 20, f"expected 20 deduped rows, got {store.count()}"
+
+            # 재시도 예약된 이벤트는 due 조회에서 제외
+            entries = store.pending()
+            store.record_failure(entries[0], "later", next_attempt_at=time.time() + 3600)
+            # 같은 태스크의 뒤 이벤트도 순서 보장을 위해 함께 보류
+            assert len(store.pending(due_before=time.time())) == 15
+
+            client = JarvisClient(_offline_config(
+                tmp, api_base_url=server.api_url, outbox_backend="sqlite", max_retries=3
+            ))
+            stats = client.retry_outbox(workers=4)
+            assert stats["success"] == 15 and stats["total"] == 15, stats
+            assert client.outbox.count() == 5
+
+            # 한 태스크의 행이 선점 중이면 같은 태스크의 뒤 이벤트도 제외
+            for event_type in ("task_started", "task_log"):
+                store.add(_make_event("sqlite_leased", event_type).to_dict(), "offline")
+            leased = [e for e in store.pending() if e.task_id == "sqlite_leased"]
+            assert store.claim(leased[0], 60)
+            assert not [e for e in store.pending() if e.task_id == "sqlite_leased"]
+            store.ack(leased[0])
+            assert [e.entry_id for e in store.pending() if e.task_id == "sqlite_leased"] == [leased[1].entry_id]
+
+            # dead letter된 key로 다시 저장하면 pending으로 복구 (조용히 버려지지 않음)
+            store.dead_letter(leased[1])
+            assert store.add(leased[1].event, "offline again").endswith(f"#{leased[1].entry_id}")
+            revived = [e for e in store.pending() if e.task_id == "sqlite_leased"]
+            assert len(revived) == 1 and revived[0].error == "offline again" and revived[0].retry_count == 0
+
+            print(f"  Rows after dedupe: 20 (80 inserts), replay stats: {stats}")
+            print("  ✅ SQLite outbox deduped, scheduled, replayed due events and revived dead keys")
+    finally:
+        server.stop()
+    return True
+
+
+def test_outbox_drainer():
+    """백그라운드 drainer 테스트 (백오프 예약 + 연결 복구 시 즉시 재전송)"""
+    print("\n" + "=" * 50)
+    print("13. Outbox Drainer Test")
+    print("=" * 50)
+
+    # 사용 후 닫힌 포트 = 다운된 API
+    down = StubServer()
+    port = down.server_address[1]
+    down.server_close()
+
+    server = None
+    with tempfile.TemporaryDirectory() as tmp:
+        config = _offline_config(
+            tmp,
+            api_base_url=f"http://127.0.0.1:{port}/api",
+            max_retries=1,
+            outbox_max_retries=10,
+            outbox_backoff_base=60.0,
+        )
+        client = JarvisClient(config)
+        for event_type in ("task_started", "task_completed"):
+            client.send_event(_make_event("drain", event_type))
+
+        drainer = client.start_drainer(poll_interval=0.1, probe_interval=0.05)
+        try:
+            deadline = time.monotonic() + 5
+            while not drainer.offline and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert drainer.offline, "drainer did not detect outage"
+
+            # 실패한 이벤트는 지수 백오프로 예약됨
+            next_due = client.outbox.next_due()
+            assert next_due is not None and next_due - time.time() > 20, next_due
+
+            # API 복구 → 예약 시각(30초+) 전이라도 즉시 재전송
+            server = _StubServer(port)
+            deadline = time.monotonic() + 5
+            while client.outbox.count() and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert client.outbox.count() == 0, "outbox not drained after recovery"
+            types = [body["event_type"] for _, body in server.requests]
+            assert types == ["task_started", "task_completed"], types
+
+            print(f"  Backoff scheduled: {next_due - time.time():.1f}s ahead")
+            print(f"  Drained after recovery: {types}")
+            print("  ✅ Drainer backed off and drained immediately on recovery")
+        finally:
+            client.close(timeout=5)
+            if server is not None:
+                server.stop()
+    return True
+
+
+def test_circuit_breaker():
+    """서킷 브레이커 테스트 (open 시 즉시 outbox + half-open probe로 복구)"""
+    print("\n" + "=" * 50)
+    print("14. Circuit Breaker Test")
+    print("=" * 50)
+
+    # 사용 후 닫힌 포트 = 다운된 API (테스트마다 다른 주소 → 별도 breaker)
+    down = StubServer()
+    port = down.server_address[1]
+    down.server_close()
+
+    server = None
+    with tempfile.TemporaryDirectory() as tmp:
+        config = _offline_config(
+            tmp,
+            api_base_url=f"http://127.0.0.1:{port}/api",
+            retry_backoff_base=0.2,
+            breaker_enabled=True,
+            breaker_failure_threshold=2,
+            breaker_reset_timeout=0.3,
+        )
+        client = JarvisClient(config)
+        try:
+            # 연속 실패 2회 → open, 남은 재시도 백오프 없이 바로 outbox
+            first = client.send_event(_make_event("breaker", seq=1))
+            assert first["status"] == "outboxed", first
+            assert client.breaker.state == "open", client.breaker.state
+
+            # open 상태: 네트워크 시도 없이 즉시 outbox
+            started = time.monotonic()
+            second = client.send_event(_make_event("breaker", seq=2))
+            elapsed = time.monotonic() - started
+            assert second.get("reason") == "circuit_open", second
+            assert elapsed < 0.1, f"open circuit still blocked for {elapsed:.2f}s"
+
+            # reset_timeout 후 API 복구 → half-open probe 성공 → closed
+            server = _StubServer(port)
+            time.sleep(0.35)
+            third = client.send_event(_make_event("breaker", seq=3))
+            assert third["status"] == "created", third
+
+            metrics = client.breaker.metrics()
+            assert metrics["state"] == "closed", metrics
+            for transition in ("closed->open", "open->half_open", "half_open->closed"):
+                assert metrics["transitions"].get(transition) == 1, metrics
+            assert metrics["rejected"] >= 1, metrics
+
+            # 취소된 half-open probe(wait_for timeout)는 슬롯을 반환 → 다음 요청이 probe 가능
+            slow = _StubServer(latency=0.5)
+            try:
+                probe_config = _offline_config(
+                    tmp, api_base_url=slow.api_url,
+                    breaker_enabled=True, breaker_failure_threshold=1, breaker_reset_timeout=0.05,
+                )
+
+                async def cancel_probe():
+                    async with AsyncJarvisClient(probe_config) as async_client:
+                        breaker = async_client._sync.breaker
+                        breaker.record_failure()
+                        await asyncio.sleep(0.06)
+                        try:
+                            await asyncio.wait_for(async_client.send_event(_make_event("probe")), 0.05)
+                        except asyncio.TimeoutError:
+                            pass
+                        return breaker
+
+                probe_breaker = asyncio.run(cancel_probe())
+            finally:
+                slow.stop()
+            assert probe_breaker.state == "half_open" and probe_breaker.allow_request()
+
+            # 결과가 기록되지 않은 probe도 reset_timeout 후 만료
+            lost = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+            lost.record_failure()
+            time.sleep(0.06)
+            assert lost.allow_request() and not lost.allow_request()
+            time.sleep(0.06)
+            assert lost.allow_request(), "lost half-open probe never expired"
+
+            print(f"  Open-circuit send: {elapsed * 1000:.1f}ms")
+            print(f"  Transitions: {metrics['transitions']}")
+            print("  ✅ Breaker opened, short-circuited, recovered and released cancelled probes")
+        finally:
+            client.close(timeout=5)
+            if server is not None:
+                server.stop()
+    return True
+
+
+def test_log_sink():
+    """로그 sink 테스트 (버퍼링 + 크기 로테이션 + 멀티스레드 + writer 스레드 + idle flush)"""
+    print("\n" + "=" * 50)
+    print("15. Log Sink Test")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 버퍼 크기 전에는 파일에 기록되지 않음
+        sink = JsonlLogSink(Path(tmp) / "buffered", buffer_size=1 << 20, flush_interval=60)
+        sink.write(b'{"n": 0}')
+        assert sink.current_file() is None, "line written before buffer filled"
+        sink.flush()
+        assert sink.current_file().read_text().strip() == '{"n": 0}'
+        sink.close()
+
+        # 4개 스레드 동시 기록 + 작은 max_bytes로 크기 로테이션
+        directory = Path(tmp) / "rotating"
+        sink = JsonlLogSink(directory, buffer_size=512, flush_interval=60, max_bytes=4096)
+
+        def writer(thread_id):
+            for i in range(250):
+                sink.write(json.dumps({"thread": thread_id, "n": i}).encode())
+
+        threads = [threading.Thread(target=writer, args=(t,)) for t in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        sink.close()
+
+        # jarvis_sdk_YYYYMMDD.jsonl, jarvis_sdk_YYYYMMDD.1.jsonl, ... 순서
+        files = sorted(directory.glob("jarvis_sdk_*.jsonl"), key=lambda f: len(f.suffixes))
+        files = files[:1] + sorted(files[1:], key=lambda f: int(f.suffixes[0][1:]))
+        assert len(files) > 1, "size rotation did not happen"
+        assert all(f.stat().st_size <= 4096 for f in files), "file exceeded max_bytes"
+        lines = [json.loads(line) for f in files for line in f.read_text().splitlines()]
+        assert len(lines) == 1000, f"expected 1000 lines, got {len(lines)}"
+        for thread_id in range(4):
+            seen = [line["n"] for line in lines if line["thread"] == thread_id]
+            assert seen == list(range(250)), "per-thread order not preserved"
+
+        # writer 스레드: 호출자는 파일에 쓰지 않고 interval마다 기록
+        sink = JsonlLogSink(Path(tmp) / "background", flush_interval=0.05, background=True)
+        sink.write(b'{"n": 1}')
+        deadline = time.monotonic() + 2
+        while sink.current_file() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sink.current_file() is not None, "background writer did not flush"
+        sink.close()
+
+        # 이후 쓰기가 없어도 flush_interval이 지나면 기록 (background 아님)
+        sink = JsonlLogSink(Path(tmp) / "idle", buffer_size=1 << 20, flush_interval=0.05)
+        sink.write(b'{"n": 2}')
+        deadline = time.monotonic() + 2
+        while sink.current_file() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sink.current_file() is not None, "idle buffer was not flushed after flush_interval"
+        assert sink.current_file().read_text().strip() == '{"n": 2}'
+        sink.close()
+
+        # JarvisClient 연동: flush() 후 날짜별 로그 파일에 기록됨
+        config = _offline_config(tmp, max_retries=1, log_flush_interval=60)
+        client = JarvisClient(config)
+        client.send_event(_make_event("log_sink"))
+        client.flush()
+        log_files = list(config.log_path.glob("jarvis_sdk_*.jsonl"))
+        assert len(log_files) == 1, log_files
+        actions = [json.loads(line)["action"] for line in log_files[0].read_text().splitlines()]
+        assert actions == ["outboxed"], actions
+
+        print(f"  Rotated files: {len(files)} (max 4096 bytes)")
+        print(f"  Lines from 4 threads: {len(lines)}")
+        print("  ✅ Buffered, rotated and flushed in order")
+    return True
+
+
+def test_progress_coalescing():
+    """progress / log 빈도 제한 테스트 (최신 값 전송 + warning 유지 + suppressed 보고)"""
+    print("\n" + "=" * 50)
+    print("16. Progress Coalescing Test")
+    print("=" * 50)
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            config = _offline_config(
+                tmp, api_base_url=server.api_url, progress_rate_limit=1.0, log_rate_limit=1.0
+            )
+            with JarvisTask("coalesce", worker_id="test_worker", config=config) as task:
+                task.start("progress loop")
+                results = [task.progress(i, 100) for i in range(1, 101)]
+                task.log("halfway", level="warning")
+                for i in range(10):
+                    task.log(f"step {i}")
+                task.complete({"ok": True})
+
+            assert results[0]["status"] == "created", results[0]
+            assert all(r["status"] == "coalesced" for r in results[1:]), "progress not coalesced"
+
+            bodies = [body for _, body in server.requests]
+            types = [body["event_type"] for body in bodies]
+            assert types[0] == "task_started" and types[-1] == "task_completed", types
+
+            logs = [body["payload"] for body in bodies if body["event_type"] == "task_log"]
+            warnings = [p for p in logs if p["level"] == "warning"]
+            assert [p["message"] for p in warnings] == ["halfway"], "warning dropped"
+
+            progress = [p["progress"] for p in logs if "progress" in p]
+            assert progress[0]["current"] == 1 and progress[-1]["current"] == 100, progress
+            assert progress[-1]["percent"] == 100.0, progress[-1]
+
+            # 100번 progress + 10번 로그 중 전송된 것을 제외한 전부가 suppressed로 보고됨
+            reported = sum(body["payload"].get("suppressed", 0) for body in bodies)
+            info_sent = len(logs) - len(warnings) - len(progress)
+            assert reported == 110 - len(progress) - info_sent, (reported, len(progress), info_sent)
+
+            print(f"  Events sent: {len(bodies)} (110 progress/log calls)")
+            print(f"  Suppressed reported: {reported}")
+            print("  ✅ Latest progress sent, warning kept, suppressed count reported")
+    finally:
+        server.stop()
+    return True
+
+
+def test_event_serialization():
+    """이벤트 직렬화 테스트 (__slots__ + 캐시된 bytes 재사용 + 중첩 dataclass)"""
+    print("\n" + "=" * 50)
+    print("17. Event Serialization Test")
+    print("=" * 50)
+
+    event = _make_event("serialize")
+    event.payload["message"] = "한글 메시지"
+    assert not hasattr(event, "__dict__"), "JarvisEvent should use __slots__"
+
+    encoded = event.encode()
+    assert event.encode() is encoded, "encoded bytes not cached"
+    assert json.loads(encoded) == event.to_dict(), "encoded JSON differs from to_dict()"
+    assert "node_id" not in event.to_dict(), "None fields should be omitted"
+    assert "한글 메시지".encode("utf-8") in encoded, "payload should be UTF-8, not escaped"
+    assert JarvisEvent(**json.loads(encoded)) == event, "round trip mismatch"
+
+    # outbox 백엔드는 캐시된 bytes를 그대로 저장
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in ("file", "segment", "sqlite"):
+            client = JarvisClient(_offline_config(tmp, outbox_backend=backend))
+            client._save_to_outbox(event, "offline")
+            entries = client.outbox.pending()
+            assert [JarvisEvent(**e.event) for e in entries] == [event], backend
+            client.outbox.close()
+
+    # payload 안의 dataclass는 기존 dataclasses.asdict와 같은 JSON으로 (orjson / json 동일)
+    nested = _make_event("serialize_nested")
+    nested.payload["result"] = TaskResult("success", "완료", data={"steps": [TaskResult("partial", "1단계")]})
+    LegacyEvent = dataclasses.make_dataclass("LegacyEvent", JarvisEvent.FIELDS)
+    legacy_event = LegacyEvent(*(getattr(nested, name) for name in JarvisEvent.FIELDS))
+    legacy = {k: v for k, v in dataclasses.asdict(legacy_event).items() if v is not None}
+    expected = json.dumps(legacy, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    backends = {}
+    for backend in ("orjson", "json"):
+        saved = serialization.orjson
+        if backend == "json":
+            serialization.orjson = None
+        try:
+            backends[backend] = serialization.dumps(nested.to_dict())
+        finally:
+            serialization.orjson = saved
+    assert set(backends.values()) == {expected}, backends
+    assert json.loads(nested.encode())["payload"]["result"]["data"]["steps"][0]["status"] == "partial"
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = JarvisClient(_offline_config(tmp)).outbox
+        outbox.add(nested.to_dict(), "offline")
+        assert outbox.pending()[0].event == json.loads(expected), "file outbox lost nested dataclass"
+
+    print(f"  Encoded size: {len(encoded)} bytes")
+    print("  ✅ Serialized once, reused by send and outbox")
+    return True
+
+
+def test_payload_size_limit():
+    """payload 크기 제한 테스트 (gzip + traceback 앞/뒤 보존 축약 + 압축본 캐시)"""
+    print("\n" + "=" * 50)
+    print("18. Payload Size Limit Test")
+    print("=" * 50)
+
+    frames = "".join(f'  File "worker.py", line {i}, in step_{i}\n    run()\n' for i in range(2000))
+    traceback_text = "Traceback (most recent call last):\n" + frames + "ValueError: boom\n"
+
+    # 결정적 축약: 같은 입력 → 같은 결과, 앞/뒤 보존, 마커 포함
+    def measure(payload):
+        return len(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+    payload = {"reason": "boom", "error_details": traceback_text}
+    first = fit_payload(payload, 4096, measure)
+    assert first == fit_payload(payload, 4096, measure), "truncation not deterministic"
+    assert measure(first) <= 4096, measure(first)
+    assert first["error_details"].startswith("Traceback (most recent call last):\n")
+    assert first["error_details"].endswith("ValueError: boom\n"), first["error_details"][-80:]
+    assert first["truncated"]["original_bytes"] == measure(payload)
+    assert payload["error_details"] == traceback_text, "original payload mutated"
+
+    # 리스트가 너무 커서 문자열 축약만으로 부족한 경우
+    many = fit_payload({"result": {"items": list(range(100000))}}, 4096, measure)
+    assert measure(many) <= 4096 and "truncated" in many, many.keys()
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            # 1) gzip으로 상한 이내 → 축약 없이 압축 전송
+            config = _offline_config(
+                tmp, api_base_url=server.api_url, payload_max_size_kb=10, gzip_threshold_kb=1
+            )
+            client = JarvisClient(config)
+            repetitive = _make_event("size", "task_completed")
+            repetitive.payload["data"] = "x" * 50000
+            assert client.send_event(repetitive)["status"] == "created"
+            body = server.requests[-1][1]
+            assert "truncated" not in body["payload"], "compressible payload truncated"
+            assert server.body_sizes[-1] <= 10 * 1024, server.body_sizes[-1]
+
+            # 2) 압축해도 큼 → 축약 후 전송 (4xx 없이 created)
+            blocked = _make_event("size", "task_blocked")
+            blocked.payload["error_details"] = traceback_text + os.urandom(20000).hex()
+            assert client.send_event(blocked)["status"] == "created"
+            body = server.requests[-1][1]
+            assert body["payload"]["truncated"]["max_bytes"] == 10 * 1024, body["payload"]
+            assert len(json.dumps(body, ensure_ascii=False).encode("utf-8")) <= 10 * 1024
+
+            # 3) 서버가 gzip 미지원(415) → 압축 없이 재전송
+            server.accept_gzip = False
+            client = JarvisClient(config)
+            small = _make_event("size", "task_log", seq=2)
+            small.payload["message"] = "y" * 2000
+            assert client.send_event(small)["status"] == "created"
+            assert client._gzip_supported is False
+
+            # 4) 415 전에 압축 전제로 남겨둔 큰 payload도 재전송 시 축약 (sync / async)
+            client = JarvisClient(config)
+            large = _make_event("size", "task_completed", seq=4)
+            large.payload["data"] = "x" * 50000
+            assert client.send_event(large)["status"] == "created"
+            assert "truncated" in server.requests[-1][1]["payload"]
+            assert server.body_sizes[-1] <= 10 * 1024, server.body_sizes[-1]
+
+            async def send_async(event):
+                async with AsyncJarvisClient(_offline_config(
+                    tmp, api_base_url=server.api_url, payload_max_size_kb=10, gzip_threshold_kb=1,
+                    log_path=Path(tmp) / "async_logs",
+                )) as async_client:
+                    async_client._sync._gzip_supported = True
+                    return await async_client.send_event(event)
+
+            large = _make_event("size", "task_completed", seq=5)
+            large.payload["data"] = "x" * 50000
+            assert asyncio.run(send_async(large))["status"] == "created"
+            assert server.body_sizes[-1] <= 10 * 1024, server.body_sizes[-1]
+
+            # 5) gzip_threshold_kb > payload_max_size_kb → 압축되지 않을 크기는 축약
+            server.accept_gzip = True
+            client = JarvisClient(_offline_config(
+                tmp, api_base_url=server.api_url, payload_max_size_kb=10, gzip_threshold_kb=20
+            ))
+            middle = _make_event("size", "task_completed", seq=6)
+            middle.payload["data"] = "z" * 15000
+            assert client.send_event(middle)["status"] == "created"
+            assert "truncated" in server.requests[-1][1]["payload"]
+            assert server.body_sizes[-1] <= 10 * 1024, server.body_sizes[-1]
+
+            # 6) 압축해야 상한 이내인 이벤트는 크기 확인 / 배치 크기 계산 / 재시도에서 한 번만 압축
+            client = JarvisClient(config)
+            cached = _make_event("size", "task_completed", seq=7)
+            cached.payload["data"] = "x" * 50000
+            compress, compressed = gzip.compress, []
+
+            def counting_compress(data, *args, **kwargs):
+                compressed.append(len(data))
+                return compress(data, *args, **kwargs)
+
+            gzip.compress = counting_compress
+            try:
+                for _ in range(3):
+                    client._encode_event(cached)
+                server.fail_next(1, 503)
+                assert client.send_event(cached)["status"] == "created"
+            finally:
+                gzip.compress = compress
+            assert len(compressed) == 1, compressed
+            assert "truncated" not in server.requests[-1][1]["payload"]
+
+            print(f"  Traceback: {len(traceback_text)} → {len(first['error_details'])} chars")
+            print(f"  Compressed body: {server.body_sizes[0]} bytes for 50KB payload")
+            print("  ✅ Compressed, truncated deterministically and fell back on 415")
+    finally:
+        server.stop()
+    return True
+
+
+def test_artifact_spillover():
+    """artifact 저장 테스트 (큰 결과 → digest 참조, content-addressed dedupe)"""
+    print("\n" + "=" * 50)
+    print("19. Artifact Spillover Test")
+    print("=" * 50)
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            config = _offline_config(
+                tmp,
+                api_base_url=server.api_url,
+                artifact_path=Path(tmp) / "artifacts",
+                artifact_threshold_kb=1,
+            )
+            rows = [{"id": i, "name": f"row {i}"} for i in range(500)]
+            report = Path(tmp) / "report.txt"
+            report.write_text("report body")
+
+            for task_id in ("artifact_a", "artifact_b"):
+                with JarvisTask(task_id, worker_id="test_worker", config=config) as task:
+                    task.start("큰 결과")
+                    task.complete(TaskResult(
+                        status="partial",
+                        summary="500 rows",
+                        data={"rows": rows, "count": len(rows)},
+                        artifacts=[b"raw bytes", report],
+                    ))
+
+            bodies = [body for _, body in server.requests if body["event_type"] == "task_completed"]
+            assert len(bodies) == 2, len(bodies)
+            payload = bodies[0]["payload"]
+            data = payload["result"]["data"]
+            assert payload["result"]["status"] == "partial" and bodies[0]["summary"] == "500 rows"
+            assert data["count"] == 500, "small values should stay inline"
+            assert set(data["rows"]) == {"artifact", "size"}, data["rows"]
+            assert len(json.dumps(bodies[0]).encode("utf-8")) < 2048, "event not kept small"
+
+            refs = {ref.get("name"): ref for ref in payload["artifacts"]}
+            assert set(refs) == {None, "report.txt", "rows"}, refs
+            store = JarvisTask("reader", config=config).artifacts
+            assert json.loads(store.get(data["rows"]["artifact"])) == rows
+            assert store.get(refs["report.txt"]["digest"]) == b"report body"
+
+            # 같은 내용은 두 태스크에서 저장해도 파일 하나
+            stored = [p for p in (Path(tmp) / "artifacts").rglob("*") if p.is_file()]
+            assert len(stored) == 3, stored
+            assert bodies[1]["payload"]["artifacts"] == payload["artifacts"]
+
+            print(f"  Completed event: {len(json.dumps(bodies[0]))} bytes (rows: {data['rows']['size']} bytes)")
+            print(f"  Stored artifacts: {len(stored)} for 2 tasks")
+            print("  ✅ Large results spilled to content-addressed store")
+    finally:
+        server.stop()
+    return True
+
+
+def test_relay():
+    """로컬 relay 테스트 (UNIX 소켓 전달 + dedupe + 배치 + relay 없을 때 직접 전송)"""
+    print("\n" + "=" * 50)
+    print("20. Local Relay Test")
+    print("=" * 50)
+
+    import socket
+    if not hasattr(socket, "AF_UNIX"):
+        print("  ⏭️  UNIX sockets not supported, skipped")
+        return True
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            socket_path = str(Path(tmp) / "relay.sock")
+            relay_config = _offline_config(
+                tmp, api_base_url=server.api_url, async_delivery=True,
+                batch_max_events=50, batch_linger_ms=20,
+            )
+            relay = JarvisRelay(socket_path, JarvisClient(relay_config), drain=False).start()
+
+            config = _offline_config(tmp, api_base_url=server.api_url, relay_socket=socket_path)
+            client = JarvisClient(config)
+
+            started = time.monotonic()
+            results = [client.send_event(_make_event("relay", seq=i)) for i in range(100)]
+            elapsed = time.monotonic() - started
+            results.append(client.send_event(_make_event("relay", seq=0)))  # 중복
+            assert all(r["status"] == "relayed" for r in results), results[:3]
+
+            relay.stop(timeout=10)
+            keys = [e["idempotency_key"] for path, body in server.requests
+                    for e in (body["events"] if path.endswith("/batch") else [body])]
+            assert len(keys) == 100 and len(set(keys)) == 100, len(keys)
+            assert relay.stats == {"accepted": 100, "duplicates": 1}, relay.stats
+            batches = sum(1 for path, _ in server.requests if path.endswith("/batch"))
+            assert batches < 100, "relay did not batch"
+
+            # relay 종료 후 → 직접 전송 fallback
+            fallback = client.send_event(_make_event("relay", seq=200))
+            assert fallback["status"] == "created", fallback
+            client.close()
+
+            print(f"  Handoff: {elapsed / 100 * 1e6:.0f}µs/event, {batches} batch requests")
+            print(f"  Relay stats: {relay.stats}")
+            print("  ✅ Relayed, deduped, batched and fell back to direct send")
+    finally:
+        server.stop()
+    return True
+
+
+def test_stub_server():
+    """stub 서버 장애 주입 테스트 (5xx 재시도 / 4xx → outbox / 연결 끊김 / 독립 프로세스)"""
+    print("\n" + "=" * 50)
+    print("21. Stub Server Test")
+    print("=" * 50)
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            client = JarvisClient(_offline_config(tmp, api_base_url=server.api_url, max_retries=3))
+
+            # 5xx 한 번 → 재시도 후 성공
+            server.fail_next(1, 503)
+            assert client.send_event(_make_event(seq=1))["status"] == "created"
+
+            # 응답 없이 연결 끊김 → 재연결 후 성공
+            server.fail_next(1, "drop")
+            assert client.send_event(_make_event(seq=2))["status"] == "created"
+
+            # 4xx는 재시도하지 않고 outbox
+            server.fail_next(1, 400)
+            assert client.send_event(_make_event(seq=3))["status"] == "outboxed"
+
+            # 같은 이벤트 재전송 → 클라이언트가 POST 없이 duplicate, 캐시가 없으면 서버가 duplicate
+            assert client.send_event(_make_event(seq=1))["status"] == "duplicate"
+            uncached = JarvisClient(_offline_config(tmp, api_base_url=server.api_url, ack_cache_size=0))
+            assert uncached.send_event(_make_event(seq=1))["status"] == "duplicate"
+            client.close()
+
+            stats = server.stats()
+            assert stats["5xx"] == 1 and stats["4xx"] == 1 and stats["drops"] == 1, stats
+            assert stats["created"] == 2 and stats["duplicate"] == 1, stats
+
+        # 독립 프로세스 실행
+        process, api_url = start_subprocess(error_rate=0.0)
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                client = JarvisClient(_offline_config(tmp, api_base_url=api_url))
+                assert client.send_event(_make_event(seq=1))["status"] == "created"
+                client.close()
+        finally:
+            process.terminate()
+            _, stderr = process.communicate(timeout=10)
+        assert json.loads(stderr)["created"] == 1, stderr
+
+        print(f"  In-process stats: {stats}")
+        print(f"  Subprocess: {api_url}")
+        print("  ✅ Injected faults handled, subprocess stub reachable")
+    finally:
+        server.stop()
+    return True
+
+
+def test_benchmark_suite():
+    """벤치마크 suite 테스트 (JSON 결과 + baseline 비교)"""
+    print("\n" + "=" * 50)
+    print("22. Benchmark Suite Test")
+    print("=" * 50)
+
+    from benchmarks.suite import compare, run_suite
+
+    report = run_suite(only=["event", "idempotency"], quick=True)
+    assert set(report["results"]) == {"event.to_dict", "event.encode", "idempotency_key"}, report
+    assert report["meta"]["quick"] is True
+    json.dumps(report)  # 그대로 저장 가능
+
+    baseline = json.loads(json.dumps(report))
+    baseline["results"]["event.encode"]["median"] /= 2        # 현재가 2배 느림
+    baseline["results"]["idempotency_key"]["median"] *= 2     # 현재가 2배 빠름
+    del baseline["results"]["event.to_dict"]                  # baseline에 없는 항목
+    rows = {row["name"]: row for row in compare(baseline, report, threshold=0.2)}
+    assert set(rows) == {"event.encode", "idempotency_key"}, rows
+    assert rows["event.encode"]["regression"] and not rows["idempotency_key"]["regression"], rows
+
+    print(f"  Cases: {list(report['results'])}")
+    print(f"  event.encode vs slower baseline: {rows['event.encode']['change']:+.0%}")
+    print("  ✅ Results serialized and regressions flagged")
+    return True
+
+
+def test_metrics():
+    """클라이언트 메트릭 테스트 (지연 시간 / 재시도 / outbox / 서킷 / Prometheus 출력)"""
+    print("\n" + "=" * 50)
+    print("23. Metrics Test")
+    print("=" * 50)
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            client = JarvisClient(_offline_config(tmp, api_base_url=server.api_url))
+
+            server.fail_next(1, 503)
+            assert client.send_event(_make_event(seq=1))["status"] == "created"
+            server.fail_next(1, 400)
+            assert client.send_event(_make_event(event_type="task_completed", seq=2))["status"] == "outboxed"
+
+            snapshot = client.metrics.snapshot()
+
+            def values(name):
+                return {tuple(v["labels"].values()): v.get("value", v.get("count"))
+                        for v in snapshot[name]["values"]}
+
+            assert values("jarvis_events_total") == {
+                ("task_log", "created"): 1, ("task_completed", "outboxed"): 1}, snapshot["jarvis_events_total"]
+            assert values("jarvis_retries_total") == {("task_log",): 1}
+            assert values("jarvis_requests_total") == {("200",): 1, ("400",): 1, ("503",): 1}
+            assert values("jarvis_send_duration_seconds") == {("task_completed",): 1, ("task_log",): 1}
+            assert values("jarvis_caller_blocked_seconds") == {("sync",): 2}
+            expected_bytes = (2 * len(_make_event(seq=1).encode())
+                              + len(_make_event(event_type="task_completed", seq=2).encode()))
+            assert values("jarvis_bytes_sent_total") == {(): expected_bytes}
+            assert values("jarvis_outbox_depth") == {(): 1}
+            assert 0 <= values("jarvis_outbox_oldest_age_seconds")[()] < 60
+            assert values("jarvis_circuit_state")[("closed",)] == 1
+
+            text = client.metrics.to_prometheus()
+            assert "# TYPE jarvis_send_duration_seconds histogram" in text
+            assert 'jarvis_send_duration_seconds_bucket{event_type="task_log",le="+Inf"} 1' in text
+            assert 'jarvis_requests_total{code="503"} 1' in text
+            json.dumps(snapshot)
+
+            # 백엔드별 가장 오래된 이벤트 시각
+            for backend in ("segment", "sqlite"):
+                other = JarvisClient(_offline_config(tmp, outbox_path=Path(tmp) / backend, outbox_backend=backend))
+                assert other.outbox.oldest_created_at() is None
+                other._save_to_outbox(_make_event(seq=3), "test")
+                assert other.outbox.oldest_created_at() is not None
+                other.outbox.close()
+            client.close()
+
+            print(f"  Requests: {values('jarvis_requests_total')}")
+            print(f"  Outbox depth / oldest age: {values('jarvis_outbox_depth')[()]} / "
+                  f"{values('jarvis_outbox_oldest_age_seconds')[()]:.2f}s")
+            print("  ✅ Metrics recorded and exported (JSON + Prometheus)")
+    finally:
+        server.stop()
+    return True
+
+
+def test_exactly_once_replay():
+    """outbox 선점(lease) + 전송 완료 key LRU 테스트 (동시 drainer / crash 후 재전송)"""
+    print("\n" + "=" * 50)
+    print("24. Exactly-once Replay Test")
+    print("=" * 50)
+
+    server = _StubServer(latency=0.002)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            offline = JarvisClient(_offline_config(tmp, max_retries=1))
+            for i in range(40):
+                offline.send_event(_make_event(f"once_{i % 8}", seq=i))
+
+            # 같은 outbox 디렉토리를 공유하는 두 프로세스 (LRU는 공유하지 않음)
+            drainers = [
+                JarvisClient(_offline_config(tmp, api_base_url=server.api_url, ack_cache_size=0))
+                for _ in range(2)
+            ]
+            results = []
+            threads = [
+                threading.Thread(target=lambda c=c: results.append(c.retry_outbox(workers=4)))
+                for c in drainers
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            stats = server.stats()
+            assert stats["requests"] == 40 and stats["duplicate"] == 0, stats
+            assert sum(r["success"] for r in results) == 40, results
+            assert offline.outbox.count() == 0
+
+            # 전송 직후 crash: inflight에 남은 이벤트는 lease 만료 후 다시 pending
+            store = offline.outbox
+            offline.send_event(_make_event("crash", seq=1))
+            entry = store.pending()[0]
+            assert store.claim(entry, lease_seconds=0.05)
+            assert not store.claim(entry, lease_seconds=0.05), "claimed twice"
+            assert store.pending() == [] and store.count() == 1
+            time.sleep(0.1)
+            assert [e.entry_id for e in store.pending()] == [entry.entry_id]
+
+            # 이미 전송 완료된 key → POST 없이 outbox에서 제거
+            client = JarvisClient(_offline_config(tmp, api_base_url=server.api_url))
+            assert client.send_event(_make_event("crash", seq=1))["status"] == "created"
+            requests = server.stats()["requests"]
+            stats = client.retry_outbox()
+            assert stats["success"] == 1 and server.stats()["requests"] == requests, stats
+            assert store.count() == 0
+
+            # 재시도 소진 이벤트를 두 drainer가 같이 봐도 failed 이동은 한 번, 늦은 쪽은 예외 없이 deferred
+            store.add(_make_event("exhausted").to_dict(), "offline", retry_count=99)
+            stale = store.pending()[0]
+            assert client.retry_outbox()["skipped"] == 1
+            assert client._replay_outbox_entry(stale, None) == "deferred"
+            assert len(list((Path(tmp) / "outbox" / "failed").glob("*exhausted*"))) == 1
+            store.dead_letter(stale)
+            store.record_failure(stale, "late")  # 이미 처리된 이벤트를 pending에 되살리지 않음
+            assert store.count() == 0
+
+            # segment / sqlite 선점
+            for backend in ("segment", "sqlite"):
+                config = _offline_config(tmp, outbox_path=Path(tmp) / backend, outbox_backend=backend)
+                first = JarvisClient(config).outbox
+                first.add(_make_event(backend).to_dict(), "offline")
+                entry = first.pending()[0]
+                other = SQLiteOutbox(config.outbox_path) if backend == "sqlite" else first
+                assert first.claim(entry, 60) and not other.claim(entry, 60), backend
+                assert first.pending() == [] and first.count() == 1
+                first.release(entry)
+                assert len(first.pending()) == 1 and other.claim(entry, 60), backend
+
+            # 앞 이벤트를 다른 drainer가 전송 중이면 같은 태스크의 뒤 이벤트도 보내지 않음 (모든 백엔드)
+            for backend in ("file", "segment", "sqlite"):
+                config = _offline_config(
+                    tmp, api_base_url=server.api_url, outbox_path=Path(tmp) / f"ordered_{backend}",
+                    outbox_backend=backend, ack_cache_size=0,
+                )
+                first, second = JarvisClient(config), JarvisClient(config)
+                task_ids = [f"ordered_{backend}_{t}" for t in range(3)]
+                for task_id in task_ids:
+                    for event_type in ("task_started", "task_completed"):
+                        first.outbox.add(_make_event(task_id, event_type).to_dict(), "offline")
+
+                # 첫 번째 drainer가 task_started 전송 도중 멈춘 사이 두 번째 drainer가 재전송
+                in_flight, resume = threading.Event(), threading.Event()
+                send = first._send_request
+
+                def slow_send(event, send=send):
+                    if not in_flight.is_set():
+                        in_flight.set()
+                        resume.wait(5)
+                    return send(event)
+
+                first._send_request = slow_send
+                thread = threading.Thread(target=first.retry_outbox, kwargs={"force": True})
+                thread.start()
+                try:
+                    assert in_flight.wait(5)
+                    assert {e.task_id for e in second.outbox.pending()} == set(task_ids[1:]), backend
+                    second.retry_outbox(force=True)
+                finally:
+                    resume.set()
+                    thread.join()
+                assert first.outbox.count() == 0, backend
+
+                sent = [body for _, body in server.requests if body.get("task_id") in task_ids]
+                for task_id in task_ids:
+                    order = [body["event_type"] for body in sent if body["task_id"] == task_id]
+                    assert order == ["task_started", "task_completed"], (backend, task_id, order)
+
+            print(f"  Concurrent drainers: {[r['success'] for r in results]} (40 events, 0 duplicates)")
+            print("  ✅ Outbox entries claimed once, leases recovered, acked keys skipped")
+    finally:
+        server.stop()
+    return True
+
+
+def test_subscriber():
+    """PM 측 구독 테스트 (long-poll stream → inbox.jsonl, cursor 이어받기)"""
+    print("\n" + "=" * 50)
+    print("25. Subscriber Test")
+    print("=" * 50)
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            config = _offline_config(tmp, api_base_url=server.api_url, inbox_path=Path(tmp) / "inbox.jsonl")
+            client = JarvisClient(config)
+            for i in range(7):
+                client.send_event(_make_event("sub", seq=i))
+
+            # 요청당 batch_size건씩 inbox에 append + cursor 저장
+            subscriber = JarvisSubscriber(config, batch_size=3)
+            assert [len(subscriber.poll(timeout=0)) for _ in range(4)] == [3, 3, 1, 0]
+            lines = config.inbox_path.read_text().splitlines()
+            assert [json.loads(line)["idempotency_key"] for line in lines] == [
+                f"test:sub:task_log:{i}" for i in range(7)
+            ]
+            assert subscriber.cursor == "7"
+            assert Path(f"{config.inbox_path}.cursor").read_text() == "7"
+
+            # 재시작: 저장된 cursor 이후만 수신
+            restarted = JarvisSubscriber(config, poll_timeout=2.0)
+            assert restarted.cursor == "7" and restarted.poll(timeout=0) == []
+
+            # long-poll: 새 이벤트가 들어오면 timeout을 기다리지 않고 바로 전달
+            received = []
+            arrived = threading.Event()
+
+            def handler(event):
+                received.append((time.perf_counter(), event))
+                arrived.set()
+
+            restarted.start(handler=handler)
+            time.sleep(0.1)  # long-poll 대기 중
+            sent_at = time.perf_counter()
+            client.send_event(_make_event("sub", seq=100))
+            assert arrived.wait(2.0), "event not delivered"
+            latency_ms = (received[0][0] - sent_at) * 1000
+            assert received[0][1]["idempotency_key"] == "test:sub:task_log:100"
+            assert latency_ms < 1000, latency_ms
+            restarted.stop(timeout=3.0)
+            assert restarted.cursor == "8" and len(config.inbox_path.read_text().splitlines()) == 8
+
+            # 서버 불가 → 에러 카운트 후 재시도 (cursor 유지)
+            offline = JarvisSubscriber(_offline_config(tmp, inbox_path=config.inbox_path), poll_timeout=0)
+            try:
+                offline.poll()
+                assert False, "expected connection error"
+            except OSError:
+                pass
+            assert offline.cursor == "8"
+
+            print(f"  Batches: [3, 3, 1, 0], resumed at cursor {subscriber.cursor}")
+            print(f"  Long-poll delivery latency: {latency_ms:.1f}ms")
+            print("  ✅ Events streamed to inbox with a persisted cursor")
+    finally:
+        server.stop()
+    return True
+
+
+def test_shared_client():
+    """설정별 공유 클라이언트 + 지연 import 테스트"""
+    print("\n" + "=" * 50)
+    print("26. Shared Client Test")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = _offline_config(tmp, async_delivery=True, max_retries=1)
+        tasks = [JarvisTask(f"shared_{i}", worker_id="w", config=config) for i in range(100)]
+        assert all(task.client is tasks[0].client for task in tasks)
+        # 값이 같은 다른 config 객체도 같은 클라이언트, 값이나 strict가 다르면 별도
+        assert get_client(_offline_config(tmp, async_delivery=True, max_retries=1)) is tasks[0].client
+        assert get_client(config, strict=True) is not tasks[0].client
+        assert get_client(_offline_config(tmp, async_delivery=True, max_retries=2)) is not tasks[0].client
+
+        # 요청마다 config를 새로 만들어도 최근 MAX_SHARED_CLIENTS개만 보관 (자주 쓰는 설정은 유지)
+        registry = sys.modules[get_client.__module__]._clients
+        oldest = get_client(_offline_config(tmp, timeout_seconds=100))
+        for i in range(1, MAX_SHARED_CLIENTS * 2):
+            get_client(_offline_config(tmp, timeout_seconds=100 + i))
+            assert get_client(config) is tasks[0].client
+        assert len(registry) == MAX_SHARED_CLIENTS, len(registry)
+        assert get_client(_offline_config(tmp, timeout_seconds=100)) is not oldest, "evicted client reused"
+
+        # 닫은 뒤에도 공유 클라이언트 계속 사용 가능 (sender 재생성)
+        client = tasks[0].client
+        assert client.send_event(_make_event("shared", seq=1))["status"] == "queued"
+        client.close(timeout=5)
+        assert client.send_event(_make_event("shared", seq=2))["status"] == "queued"
+        client.close(timeout=5)
+        assert client.outbox.count() == 2
+
+    # import jarvis_sdk / JarvisTask는 urllib / hashlib / http.client 등을 불러오지 않음
+    heavy = ["urllib.request", "urllib.error", "hashlib", "http.client", "sqlite3", "asyncio", "concurrent.futures"]
+    code = (
+        "import json, sys; before = set(sys.modules)\n"
+        "import jarvis_sdk; bare = sorted(m for m in set(sys.modules) - before if m.startswith('jarvis_sdk.'))\n"
+        "from jarvis_sdk import JarvisTask\n"
+        f"print(json.dumps([bare, [m for m in {heavy!r} if m in set(sys.modules) - before]]))"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            os.symlink(Path(__file__).resolve().parent, Path(tmp) / "jarvis_sdk")
+        except OSError:
+            print("  (symlink not supported, lazy import check skipped)")
+        else:
+            output = subprocess.run(
+                [sys.executable, "-c", code], cwd=tmp, capture_output=True, text=True, check=True
+            ).stdout
+            bare, loaded = json.loads(output)
+            assert bare == [], bare
+            assert loaded == [], loaded
+            print("  import jarvis_sdk: no submodules; JarvisTask: no urllib / hashlib / http.client")
+
+    print("  100 tasks → 1 client")
+    print("  ✅ Client shared per config, directories and heavy imports deferred")
+    return True
+
+
+def test_spans():
+    """task.span() 중첩 시간 측정 + trace_id 테스트"""
+    print("\n" + "=" * 50)
+    print("27. Spans Test")
+    print("=" * 50)
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            config = _offline_config(tmp, api_base_url=server.api_url, span_max_records=3)
+            with JarvisTask("spans", worker_id="w", config=config, trace_id="t" * 32) as task:
+                task.start("spans")
+                with task.span("download") as download:
+                    time.sleep(0.02)
+                    with task.span("parse") as parse:
+                        time.sleep(0.01)
+                for _ in range(5):
+                    with task.span("step"):
+                        pass
+                try:
+                    with task.span("upload"):
+                        raise ValueError("boom")
+                except ValueError:
+                    pass
+                task.complete({"ok": True})
+
+            events = [body for path, body in server.requests]
+            assert {event["trace_id"] for event in events} == {"t" * 32}
+            spans = events[-1]["payload"]["spans"]
+            assert parse.parent_span_id == download.span_id and download.parent_span_id is None
+            assert spans["trace_id"] == "t" * 32 and spans["count"] == 8
+            paths = spans["paths"]
+            assert set(paths) == {"download", "download/parse", "step", "upload"}
+            assert paths["step"]["count"] == 5 and paths["upload"]["errors"] == 1
+            assert paths["download"]["total_ms"] >= paths["download/parse"]["total_ms"] >= 10
+            # 개별 기록은 가장 오래 걸린 3개만 (시작 순서)
+            assert [r["name"] for r in spans["slowest"]][:2] == ["download", "parse"]
+            assert len(spans["slowest"]) == 3
+            assert spans["slowest"][1]["parent_span_id"] == spans["slowest"][0]["span_id"]
+            assert events[-1]["payload"]["duration_seconds"] >= 0.03
+
+            # span이 없으면 payload에 spans 없음, trace_id는 태스크마다 새로 생성
+            other = JarvisTask("plain", worker_id="w", config=config)
+            other.start("plain")
+            other.complete({})
+            assert "spans" not in server.requests[-1][1]["payload"]
+            assert other.trace_id != task.trace_id and len(other.trace_id) == 32
+
+            timings = ", ".join(f"{path}={stats['total_ms']}ms" for path, stats in paths.items())
+            print(f"  Paths: {timings}")
+            print("  ✅ Nested spans summarized in task_completed with trace_id")
+    finally:
+        server.stop()
+    return True
+
+
+def test_resource_profile():
+    """태스크 자원 사용량 (payload.resources) 테스트"""
+    print("\n" + "=" * 50)
+    print("28. Resource Profile Test")
+    print("=" * 50)
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            config = _offline_config(
+                tmp, api_base_url=server.api_url,
+                resource_profile=True, resource_sample_interval=0.01,
+            )
+            with JarvisTask("resources", worker_id="w", config=config) as task:
+                task.start("resources")
+                sum(i * i for i in range(300000))           # CPU
+                (Path(tmp) / "out.bin").write_bytes(b"x" * 200000)  # I/O
+                time.sleep(0.05)                             # 대기
+                task.complete({})
+
+            resources = server.requests[-1][1]["payload"]["resources"]
+            assert resources["wall_seconds"] >= 0.05
+            assert resources["cpu_user_seconds"] + resources["cpu_system_seconds"] > 0
+            assert 0 < resources["cpu_percent"] < 100
+            if sys.platform.startswith("linux"):
+                assert resources["io"]["write_chars"] >= 200000, resources
+                assert resources["ctx_switches"]["voluntary"] >= 1
+                assert resources["rss_peak_bytes"] > 0 and resources["rss_samples"] >= 2
+
+            # sampler 스레드는 측정 중인 태스크가 없으면 종료
+            time.sleep(0.05)
+            assert not any(t.name == "jarvis-resources" for t in threading.enumerate())
+
+            # blocked에도 첨부, 기본 설정에서는 측정 안 함
+            try:
+                with JarvisTask("resources_blocked", worker_id="w", config=config) as task:
+                    task.start("resources")
+                    raise RuntimeError("stop")
+            except RuntimeError:
+                pass
+            assert "resources" in server.requests[-1][1]["payload"]
+            plain = JarvisTask("plain", worker_id="w", config=_offline_config(tmp, api_base_url=server.api_url))
+            plain.start("plain")
+            plain.complete({})
+            assert "resources" not in server.requests[-1][1]["payload"]
+
+            print(f"  {json.dumps(resources)}")
+            print("  ✅ CPU / RSS / context switch / I/O attached to task_completed")
+    finally:
+        server.stop()
+    return True
+
+
+def test_heartbeat():
+    """장시간 태스크 heartbeat (task_heartbeat) 테스트"""
+    print("\n" + "=" * 50)
+    print("29. Heartbeat Test")
+    print("=" * 50)
+
+    server = _StubServer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            def heartbeats():
+                return [body["payload"] for _, body in server.requests if body["event_type"] == "task_heartbeat"]
+
+            # progress 없는 태스크: alive, 주기는 max까지 증가
+            config = _offline_config(
+                tmp, api_base_url=server.api_url, heartbeat_interval=0.01, heartbeat_max_interval=0.04,
+            )
+            with JarvisTask("hb_alive", worker_id="w", config=config) as task:
+                task.start("heartbeat")
+                time.sleep(0.2)
+                task.complete({})
+            beats = heartbeats()
+            assert len(beats) >= 3, beats
+            assert all(beat["state"] == "alive" for beat in beats)
+            assert [beat["next_heartbeat_seconds"] for beat in beats[:3]] == [0.02, 0.04, 0.04]
+            assert server.requests[-1][1]["event_type"] == "task_completed"
+            task._heartbeat.stop(timeout=1.0)
+            assert not task._heartbeat.running
+
+            # 보류 progress 병합 + steady면 주기 증가 / stalled면 기본 주기로 복귀 (스레드 없이 beat 직접 호출)
+            server.requests.clear()
+            plain = _offline_config(tmp, api_base_url=server.api_url)
+            task = JarvisTask("hb_adaptive", worker_id="w", config=plain)
+            task.start("heartbeat")
+            heartbeat = TaskHeartbeat(task, interval=1.0, max_interval=4.0)
+            task.progress(1, 10)
+            task.progress(2, 10)                     # 빈도 제한 → 보류
+            assert heartbeat.beat()
+            first = heartbeats()[-1]
+            assert first["state"] == "steady" and first["next_heartbeat_seconds"] == 2.0
+            assert first["progress"] == {"current": 2, "total": 10, "percent": 20.0}
+            assert task._pending_progress is None and task.flush() == []
+            states = []
+            for value in (2, 2, 3, 4, 5, 6):        # 값이 그대로면 stalled
+                task._pending_progress = None
+                task._coalesce_progress(value, 10, None)
+                heartbeat.beat()
+                states.append((heartbeats()[-1]["state"], heartbeat.interval))
+            assert states == [
+                ("stalled", 1.0), ("stalled", 1.0), ("steady", 2.0),
+                ("steady", 4.0), ("steady", 4.0), ("steady", 4.0),
+            ], states
+            keys = [body["idempotency_key"] for _, body in server.requests if body["event_type"] == "task_heartbeat"]
+            assert len(set(keys)) == len(keys) == 7
+            task.complete({})
+            assert not heartbeat.beat()              # 종료 후에는 보내지 않음
+
+            # heartbeat 전송이 느려도 progress() / log() / __exit__는 기다리지 않고,
+            # complete()는 전송 중인 heartbeat 1건만 기다려 task_completed가 항상 마지막
+            server.requests.clear()
+            config = _offline_config(tmp, api_base_url=server.api_url, heartbeat_interval=0.01)
+            task = JarvisTask("hb_slow", worker_id="w", config=config)
+            send_best_effort = task.client.send_best_effort
+
+            def slow_send(event, timeout=None):
+                time.sleep(0.3)
+                return send_best_effort(event, timeout)
+
+            task.client.send_best_effort = slow_send
+            try:
+                with task:
+                    task.start("heartbeat")
+                    time.sleep(0.05)                 # 첫 heartbeat 전송 중
+                    started = time.perf_counter()
+                    task.progress(1, 2)
+                    task.log("busy")
+                    worker_elapsed = time.perf_counter() - started
+                    task.complete({})
+                    elapsed = time.perf_counter() - started
+
+                with JarvisTask("hb_slow_exit", worker_id="w", config=config) as exited:
+                    exited.start("heartbeat")
+                    time.sleep(0.05)
+                    started = time.perf_counter()
+                exit_elapsed = time.perf_counter() - started
+            finally:
+                del task.client.send_best_effort
+            assert worker_elapsed < 0.1 and exit_elapsed < 0.1, (worker_elapsed, exit_elapsed)
+            assert 0.1 < elapsed < 1.0, elapsed
+            order = [body["event_type"] for _, body in server.requests if body["task_id"] == "hb_slow"]
+            assert order[-1] == "task_completed" and order.count("task_heartbeat") == 1, order
+            task._heartbeat.stop(timeout=2.0)
+            exited._heartbeat.stop(timeout=2.0)
+            assert not task._heartbeat.running and not exited._heartbeat.running
+
+            # 서버가 heartbeat에 응답하지 않아도 complete()는 재시도 정책(max_retries x timeout_seconds)이 아니라
+            # heartbeat_timeout 1회만 기다림 (heartbeat는 재시도 / outbox 없이 버림)
+            server.requests.clear()
+            config = _offline_config(
+                tmp, api_base_url=server.api_url, heartbeat_interval=0.01, heartbeat_timeout=0.2,
+                timeout_seconds=1, max_retries=3,
+            )
+            task = JarvisTask("hb_hang", worker_id="w", config=config)
+            post_body_request = task.client._post_body_request
+            hanging = threading.Event()
+
+            def hanging_request(url, data, headers, timeout=None):
+                if b"task_heartbeat" in data:
+                    hanging.set()
+                    time.sleep(timeout or config.timeout_seconds)
+                    raise TimeoutError("timed out")
+                return post_body_request(url, data, headers, timeout)
+
+            task.client._post_body_request = hanging_request
+            try:
+                task.start("heartbeat")
+                assert hanging.wait(2)
+                started = time.perf_counter()
+                task.complete({})
+                hang_elapsed = time.perf_counter() - started
+                task._heartbeat.stop(timeout=2.0)
+            finally:
+                del task.client._post_body_request
+            assert hang_elapsed < 0.5, hang_elapsed
+            assert task._heartbeat.stats["errors"] >= 1 and task.client.outbox.count() == 0
+            order = [body["event_type"] for _, body in server.requests if body["task_id"] == "hb_hang"]
+            assert order == ["task_started", "task_completed"], order
 
-    assert config.outbox_path.exists(), "Outbox path should be created"
-    assert (config.outbox_path / "pending").exists(), "Pending dir should exist"
-    assert (config.outbox_path / "failed").exists(), "Failed dir should exist"
-    assert config.log_path.exists(), "Log path should be created"
+            # 예외 / complete 없이 종료해도 스레드 종료
+            try:
+                with JarvisTask("hb_error", worker_id="w", config=config) as task:
+                    task.start("heartbeat")
+                    raise RuntimeError("stop")
+            except RuntimeError:
+                pass
+            task._heartbeat.stop(timeout=1.0)
+            with JarvisTask("hb_exit", worker_id="w", config=config) as exited:
+                exited.start("heartbeat")
+            exited._heartbeat.stop(timeout=1.0)
+            assert not task._heartbeat.running and not exited._heartbeat.running
+            assert not any(t.name == "jarvis-heartbeat" for t in threading.enumerate())
 
-    print(f"  Outbox: {config.outbox_path}")
-    print(f"  Pending: {config.outbox_path / 'pending'}")
-    print(f"  Failed: {config.outbox_path / 'failed'}")
-    print(f"  Logs: {config.log_path}")
-    print("  ✅ All directories created successfully")
+            print(f"  states: {states}")
+            print("  ✅ Heartbeats adapt to progress, merge pending progress, never outlive task_completed")
+    finally:
+        server.stop()
     return True
 
 
@@ -142,6 +1758,30 @@ def run_all_tests():
         ("Idempotency Key", test_idempotency_key),
         ("Task Context Manager", test_task_context_manager),
         ("Outbox Directory", test_outbox_directory),
+        ("Async Delivery", test_async_delivery),
+        ("Batch Delivery", test_batch_delivery),
+        ("Connection Pool", test_connection_pool),
+        ("Async Task", test_async_task),
+        ("Concurrent Outbox Replay", test_concurrent_outbox_replay),
+        ("Segment Log Outbox", test_segment_outbox),
+        ("SQLite Outbox", test_sqlite_outbox),
+        ("Outbox Drainer", test_outbox_drainer),
+        ("Circuit Breaker", test_circuit_breaker),
+        ("Log Sink", test_log_sink),
+        ("Progress Coalescing", test_progress_coalescing),
+        ("Event Serialization", test_event_serialization),
+        ("Payload Size Limit", test_payload_size_limit),
+        ("Artifact Spillover", test_artifact_spillover),
+        ("Local Relay", test_relay),
+        ("Stub Server", test_stub_server),
+        ("Benchmark Suite", test_benchmark_suite),
+        ("Metrics", test_metrics),
+        ("Exactly-once Replay", test_exactly_once_replay),
+        ("Subscriber", test_subscriber),
+        ("Shared Client", test_shared_client),
+        ("Spans", test_spans),
+        ("Resource Profile", test_resource_profile),
+        ("Heartbeat", test_heartbeat),
     ]
 
     passed = 0